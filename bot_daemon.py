@@ -0,0 +1,390 @@
+#!/home/ubuntu/venvs/bots/bin/python3
+"""
+Resident Bot Daemon
+Keeps the interpreter, the runner modules and the warm browser pool alive
+between rounds and plays a scheduler round on an internal timer, instead of
+cron paying the cold start every tick
+
+    SIGHUP          reload accounts.json (applied between rounds)
+    SIGTERM/SIGINT  finish running games and exit
+    status socket   one command per connection: status, reload, run, stop
+
+Usage:
+    python bot_daemon.py                        # run in the foreground
+    python bot_daemon.py --status               # JSON status, exit 1 if down, 2 if unhealthy
+    python bot_daemon.py --reload               # same as kill -HUP
+    python bot_daemon.py --run-now              # start the next round immediately
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import argparse
+import threading
+import logging
+from datetime import datetime
+
+from log_pipeline import setup_logging, configure_logging, dropped_counts
+from metrics_server import start_metrics_server
+from virtual_clock import configure_clock
+from scheduler import (LOG_DIR, GAME_ORDER, GAME_RUNNERS, Scheduler, expand_jobs, load_runner,
+                       log_summary)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = "/tmp/gameon_bot_daemon.sock"
+DEFAULT_INTERVAL_MINUTES = 30
+DEFAULT_MAX_ROUND_MINUTES = 120
+
+# Settings sections the browser pool / controller / session store are built from
+RUNTIME_SECTIONS = ('browser', 'concurrency', 'session_cache', 'headless', 'max_parallel_accounts',
+                    'stagger_start_delay', 'dashboard_url')
+
+
+def load_config(path):
+    with open(path) as f:
+        config = json.load(f)
+    if not isinstance(config.get('accounts'), list):
+        raise ValueError("no accounts list")
+    return config
+
+
+# ============================================================================
+# STATUS SOCKET
+# ============================================================================
+
+class StatusServer:
+    """Unix socket answering one JSON line per connection"""
+
+    def __init__(self, path, daemon):
+        self.path = path
+        self.daemon = daemon
+        self.sock = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            if query(self.path, 'status', timeout=2) is not None:
+                raise RuntimeError(f"Another daemon is answering on {self.path}")
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self.sock.listen(4)
+        threading.Thread(target=self._serve, name="status", daemon=True).start()
+
+    def stop(self):
+        if self.sock:
+            self.sock.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(5)
+                    command = conn.recv(256).decode().strip() or 'status'
+                    reply = self.daemon.handle_command(command)
+                    conn.sendall((json.dumps(reply, default=str) + '\n').encode())
+                except OSError as e:
+                    logger.debug(f"Status connection failed: {e}")
+
+
+def query(path, command='status', timeout=10):
+    """Send a command to a running daemon; None when nothing answers"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(command.encode() + b'\n')
+            data = b''
+            while not data.endswith(b'\n'):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+
+# ============================================================================
+# DAEMON
+# ============================================================================
+
+class BotDaemon:
+    """
+    Timer loop around scheduler rounds.
+
+    The runner modules, session store, concurrency controller and browser
+    pool are created once and reused by every round; a reload only rebuilds
+    them when one of their settings changed.
+    """
+
+    def __init__(self, config_path, socket_path=None, games=None):
+        self.config_path = config_path
+        self.games = games or GAME_ORDER
+        self.config = load_config(config_path)
+        self.config_loaded = time.time()
+        configure_logging(self.config.get('settings', {}).get('logging'))
+        start_metrics_server(self.config.get('settings', {}))
+        configure_clock(self.config.get('settings', {}))
+        daemon_settings = self.config.get('settings', {}).get('daemon', {})
+        self.socket_path = socket_path or daemon_settings.get('socket', DEFAULT_SOCKET)
+
+        self.wake = threading.Event()
+        self.reload_requested = False
+        self.stopping = False
+        self.started = time.time()
+        self.next_run = time.time()
+        self.rounds = 0
+        self.last_round = None
+        self.round_started = None
+        self.scheduler = None
+
+        self.runners = {}
+        self.settings = None
+        self.controller = None
+        self.browser_pool = None
+        self.ceiling = 1
+        self.server = StatusServer(self.socket_path, self)
+
+    # ------------------------------------------------------------------
+    # Settings & runtime
+    # ------------------------------------------------------------------
+
+    @property
+    def daemon_settings(self):
+        return self.config.get('settings', {}).get('daemon', {})
+
+    def _interval(self):
+        return self.daemon_settings.get('interval_minutes', DEFAULT_INTERVAL_MINUTES) * 60
+
+    def _build_runtime(self):
+        from browser_pool import create_browser_pool
+        from concurrency_controller import create_concurrency_controller
+        from session_store import SessionStore
+
+        settings = dict(self.config.get('settings', {}))
+        session_settings = settings.get('session_cache', {})
+        if session_settings.get('enabled', True):
+            settings['_session_store'] = SessionStore(
+                directory=session_settings.get('directory'),
+                max_age_hours=session_settings.get('max_age_hours', 72)
+            )
+        workers = settings.get('max_parallel_accounts', 3)
+        self.controller = create_concurrency_controller(settings, workers)
+        self.ceiling = self.controller.max_sessions if self.controller else workers
+        self.browser_pool = create_browser_pool(settings, self.ceiling)
+        settings['_browser_pool'] = self.browser_pool
+        self.settings = settings
+
+    def _teardown_runtime(self):
+        if self.controller:
+            self.controller.stop()
+            self.controller = None
+        if self.browser_pool:
+            self.browser_pool.shutdown()
+            self.browser_pool = None
+
+    def _load_runners(self):
+        for game in self.games:
+            if game not in self.runners:
+                logger.info(f"Loading {GAME_RUNNERS[game]}")
+                self.runners[game] = load_runner(game)
+
+    def _reload(self):
+        self.reload_requested = False
+        try:
+            config = load_config(self.config_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Reload failed, keeping the current config: {e}")
+            return
+        old_settings = self.config.get('settings', {})
+        new_settings = config.get('settings', {})
+        self.config = config
+        self.config_loaded = time.time()
+        configure_logging(new_settings.get('logging'))
+        if old_settings.get('clock') != new_settings.get('clock'):
+            # Swapping clocks under running sessions would shift their deadlines
+            logger.warning("Clock settings changed - restart the daemon to apply them")
+
+        if any(old_settings.get(key) != new_settings.get(key) for key in RUNTIME_SECTIONS):
+            logger.info("Browser/concurrency settings changed - rebuilding the browser pool")
+            self._teardown_runtime()
+            self._build_runtime()
+        else:
+            # Keep the live pool/controller/store, take everything else
+            runtime = {k: v for k, v in self.settings.items() if k.startswith('_')}
+            self.settings = {**new_settings, **runtime}
+        self.next_run = min(self.next_run, time.time() + self._interval())
+        logger.info(f"Reloaded {self.config_path}: "
+                    f"{len(expand_jobs(self.config, self.games))} games per round")
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def request_reload(self, *_):
+        self.reload_requested = True
+        self.wake.set()
+
+    def request_stop(self, *_):
+        if not self.stopping:
+            logger.warning("Stop requested - finishing running games")
+        self.stopping = True
+        if self.scheduler:
+            self.scheduler.stop()
+        self.wake.set()
+
+    def run_now(self):
+        self.next_run = time.time()
+        self.wake.set()
+
+    def handle_command(self, command):
+        if command == 'reload':
+            self.request_reload()
+            return {'ok': True, 'message': 'reload scheduled'}
+        if command == 'run':
+            self.run_now()
+            return {'ok': True, 'message': 'round scheduled' if not self.round_started else 'round already running'}
+        if command == 'stop':
+            self.request_stop()
+            return {'ok': True, 'message': 'stopping'}
+        if command == 'status':
+            return self.status()
+        return {'ok': False, 'message': f"unknown command {command!r}"}
+
+    def status(self):
+        now = time.time()
+        running_for = now - self.round_started if self.round_started else 0
+        max_round = self.daemon_settings.get('max_round_minutes', DEFAULT_MAX_ROUND_MINUTES) * 60
+        return {
+            'ok': True,
+            'pid': os.getpid(),
+            'healthy': running_for < max_round,
+            'state': 'stopping' if self.stopping else 'running_round' if self.round_started else 'idle',
+            'uptime_s': round(now - self.started),
+            'config': self.config_path,
+            'config_loaded': datetime.fromtimestamp(self.config_loaded).isoformat(timespec='seconds'),
+            'rounds': self.rounds,
+            'round_running_s': round(running_for) if self.round_started else None,
+            'round_progress': self.scheduler.progress() if self.scheduler else None,
+            'next_run_in_s': None if self.round_started else max(0, round(self.next_run - now)),
+            'last_round': self.last_round,
+            'concurrency': self.controller.snapshot() if self.controller else None,
+            'log_dropped': dropped_counts(),
+        }
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def _run_round(self):
+        jobs = expand_jobs(self.config, self.games)
+        if not jobs:
+            logger.info("No enabled games - nothing to play this round")
+            return
+        self.rounds += 1
+        logger.info(f"Round {self.rounds}: {len(jobs)} games")
+        self.round_started = time.time()
+        self.scheduler = Scheduler(jobs, self.runners, self.settings, self.ceiling, self.controller)
+        try:
+            results = self.scheduler.run()
+        finally:
+            started, self.round_started, self.scheduler = self.round_started, None, None
+        log_summary(results, started)
+        self.last_round = {
+            'number': self.rounds,
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'duration_s': round(time.time() - started),
+            'games': len(results),
+            'succeeded': sum(1 for r in results if r['succeeded']),
+        }
+
+    def run(self):
+        signal.signal(signal.SIGHUP, self.request_reload)
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        self.server.start()
+        logger.info(f"Daemon started (pid {os.getpid()}), status socket {self.socket_path}")
+        try:
+            self._load_runners()
+            self._build_runtime()
+            while not self.stopping:
+                if self.reload_requested:
+                    self._reload()
+                if time.time() >= self.next_run:
+                    self._run_round()
+                    self.next_run = time.time() + self._interval()
+                    logger.info(f"Next round at {datetime.fromtimestamp(self.next_run).strftime('%H:%M:%S')}")
+                self.wake.wait(timeout=max(0, min(60, self.next_run - time.time())))
+                self.wake.clear()
+        finally:
+            self._teardown_runtime()
+            self.server.stop()
+            logger.info("Daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident game bot daemon")
+    parser.add_argument('--config', default=os.getenv('CONFIG_PATH', 'accounts.json'))
+    parser.add_argument('--games', help='Comma-separated game types (default: all)')
+    parser.add_argument('--socket', help=f'Status socket path (default: settings.daemon.socket or {DEFAULT_SOCKET})')
+    control = parser.add_mutually_exclusive_group()
+    control.add_argument('--status', action='store_true', help='Print the running daemon status')
+    control.add_argument('--reload', action='store_true', help='Ask the running daemon to reload its config')
+    control.add_argument('--run-now', action='store_true', help='Ask the running daemon to start a round')
+    control.add_argument('--stop', action='store_true', help='Ask the running daemon to exit')
+    args = parser.parse_args()
+
+    command = 'status' if args.status else 'reload' if args.reload else 'run' if args.run_now \
+        else 'stop' if args.stop else None
+    if command:
+        socket_path = args.socket
+        if not socket_path:
+            try:
+                socket_path = load_config(args.config).get('settings', {}).get('daemon', {}).get('socket')
+            except (OSError, ValueError):
+                pass
+        reply = query(socket_path or DEFAULT_SOCKET, command)
+        if reply is None:
+            print("Daemon not running")
+            sys.exit(1)
+        print(json.dumps(reply, indent=2))
+        sys.exit(0 if reply.get('ok') and reply.get('healthy', True) else 2)
+
+    games = args.games.split(',') if args.games else GAME_ORDER
+    unknown = [g for g in games if g not in GAME_RUNNERS]
+    if unknown:
+        print(f"Unknown game types: {', '.join(unknown)}")
+        sys.exit(1)
+
+    # Configure logging before the runners import, their setup_logging then becomes a no-op
+    LOG_DIR.mkdir(exist_ok=True)
+    setup_logging(LOG_DIR / f'daemon_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+
+    try:
+        daemon = BotDaemon(args.config, args.socket, games)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load {args.config}: {e}")
+        sys.exit(1)
+    try:
+        daemon.run()
+    except RuntimeError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
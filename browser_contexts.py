@@ -0,0 +1,269 @@
+"""
+Shared-Chrome Browser Contexts
+Runs several accounts inside one Chrome process, each in its own CDP browser
+context (separate cookie jar and storage) driven by its own WebDriver session
+
+Usage:
+    python browser_contexts.py --accounts 4            # compare RSS of both modes
+    python browser_contexts.py --accounts 8 --mode contexts
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+import logging
+
+from selenium import webdriver
+
+from browser_pool import launch_chrome, remove_profile, apply_lean_profile
+
+logger = logging.getLogger(__name__)
+
+MEASURE_URL = "https://app.gameonworld.ai/auth/login"
+
+
+# ============================================================================
+# MEMORY MEASUREMENT
+# ============================================================================
+
+def _children_map():
+    """ppid -> [pid] for every process visible in /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm may contain spaces, fields after ')' are fixed
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss_mb(root_pids):
+    """Summed RSS of the given processes and all their descendants (Linux only)"""
+    children = _children_map()
+    seen = set()
+    stack = list(root_pids)
+    total_kb = 0
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total_kb += _rss_kb(pid)
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+def driver_rss_mb(drivers):
+    """RSS of the chromedriver + Chrome trees behind the given locally launched drivers"""
+    return process_tree_rss_mb([d.service.process.pid for d in drivers
+                                if getattr(d, 'service', None) and d.service.process])
+
+
+# ============================================================================
+# CONTEXT POOL
+# ============================================================================
+
+class ContextPool:
+    """
+    Drop-in alternative to BrowserPool: one host Chrome, one browser context per account.
+
+    acquire() creates a fresh context + page and attaches a new chromedriver
+    session to it through the host's debugger address, so every account
+    thread has its own WebDriver that is switched to its own window handle.
+    release() disposes the context, which throws away its cookies and storage;
+    the HTTP disk cache is shared by all contexts and stays warm.
+    """
+
+    def __init__(self, size, headless=True, lean=None):
+        self.size = max(1, size)
+        self.headless = headless
+        self.lean = lean
+        self.slots = threading.Semaphore(self.size)
+        self.lock = threading.Lock()
+        self.host = None
+        self.host_profile = None
+        self.debugger_address = None
+        self.contexts = {}
+        self.launched = 0
+        self.closed = False
+
+    def warm(self):
+        """Start the host Chrome; contexts themselves take milliseconds to create"""
+        with self.lock:
+            if self.host:
+                return
+            self.host, self.host_profile = launch_chrome("context-host", self.headless, self.lean)
+            self.debugger_address = self.host.capabilities['goog:chromeOptions']['debuggerAddress']
+        logger.info(f"Context host ready at {self.debugger_address} for up to {self.size} accounts")
+
+    def _create_context(self):
+        with self.lock:
+            context_id = self.host.execute_cdp_cmd('Target.createBrowserContext', {
+                'disposeOnDetach': False
+            })['browserContextId']
+            target_id = self.host.execute_cdp_cmd('Target.createTarget', {
+                'url': 'about:blank',
+                'browserContextId': context_id,
+                'width': 1920 + random.randint(-100, 100),
+                'height': 1080 + random.randint(-100, 100),
+            })['targetId']
+        return context_id, target_id
+
+    def _dispose_context(self, context_id, target_id):
+        with self.lock:
+            if not self.host:
+                return
+            try:
+                self.host.execute_cdp_cmd('Target.closeTarget', {'targetId': target_id})
+            except Exception:
+                pass
+            try:
+                self.host.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context_id})
+            except Exception as e:
+                logger.debug(f"Could not dispose browser context {context_id}: {e}")
+
+    def acquire(self, timeout=120):
+        """Get a WebDriver bound to a brand-new browser context"""
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser context available within {timeout}s")
+        try:
+            self.warm()
+            context_id, target_id = self._create_context()
+
+            options = webdriver.ChromeOptions()
+            options.debugger_address = self.debugger_address
+            driver = webdriver.Chrome(options=options)
+            # chromedriver window handles are CDP target ids
+            driver.switch_to.window(target_id)
+            # Request blocking is per target, the host's own list does not carry over
+            apply_lean_profile(driver, self.lean)
+        except Exception:
+            self.slots.release()
+            raise
+
+        with self.lock:
+            self.contexts[driver.session_id] = (context_id, target_id)
+            self.launched += 1
+        return driver
+
+    def release(self, driver):
+        """Detach the account's driver and dispose its context"""
+        with self.lock:
+            context_id, target_id = self.contexts.pop(driver.session_id, (None, None))
+        try:
+            # Attached sessions do not own the browser, quit() only ends the chromedriver
+            driver.quit()
+        except Exception:
+            pass
+        if context_id:
+            self._dispose_context(context_id, target_id)
+        self.slots.release()
+
+    def shutdown(self):
+        self.closed = True
+        with self.lock:
+            host, self.host = self.host, None
+        if host:
+            try:
+                host.quit()
+            except Exception:
+                pass
+        remove_profile(self.host_profile)
+        logger.info(f"Context pool closed - {self.launched} account contexts served")
+
+
+# ============================================================================
+# RSS COMPARISON
+# ============================================================================
+
+def _load_pages(drivers, url):
+    for driver in drivers:
+        driver.get(url)
+    time.sleep(3)
+
+
+def measure_process_mode(accounts, headless, url):
+    """One Chrome per account, like the default runners"""
+    drivers, profiles = [], []
+    try:
+        for i in range(accounts):
+            driver, profile = launch_chrome(f"measure-{i}", headless)
+            drivers.append(driver)
+            profiles.append(profile)
+        _load_pages(drivers, url)
+        return driver_rss_mb(drivers)
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        for profile in profiles:
+            remove_profile(profile)
+
+
+def measure_context_mode(accounts, headless, url):
+    """One host Chrome, one browser context per account"""
+    pool = ContextPool(accounts, headless)
+    drivers = []
+    try:
+        pool.warm()
+        drivers = [pool.acquire() for _ in range(accounts)]
+        _load_pages(drivers, url)
+        # Attached chromedrivers are separate processes, count them too
+        return driver_rss_mb([pool.host] + drivers)
+    finally:
+        for driver in drivers:
+            pool.release(driver)
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Chrome RSS: process-per-account vs browser contexts")
+    parser.add_argument('--accounts', type=int, default=4, help='Concurrent sessions to open')
+    parser.add_argument('--mode', choices=['both', 'process', 'contexts'], default='both')
+    parser.add_argument('--url', default=MEASURE_URL, help='Page every session loads before measuring')
+    parser.add_argument('--headed', action='store_true', help='Show browser windows')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not os.path.isdir('/proc'):
+        logger.error("RSS measurement needs /proc (Linux)")
+        sys.exit(1)
+
+    results = {}
+    if args.mode in ('both', 'process'):
+        results['process'] = measure_process_mode(args.accounts, not args.headed, args.url)
+    if args.mode in ('both', 'contexts'):
+        results['contexts'] = measure_context_mode(args.accounts, not args.headed, args.url)
+
+    print(f"\n{'MODE':<10} {'ACCOUNTS':>8} {'TOTAL RSS':>11} {'PER ACCOUNT':>12}")
+    for mode, total in results.items():
+        print(f"{mode:<10} {args.accounts:>8} {total:>9.0f}MB {total / args.accounts:>10.0f}MB")
+    if len(results) == 2 and results['contexts']:
+        print(f"\nContexts use {results['process'] / results['contexts']:.1f}x less memory "
+              f"({results['process'] - results['contexts']:.0f}MB saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Chrome Launcher & Warm Browser Pool
+Single place for the bots' Chrome options, plus a pool of pre-launched,
+health-checked drivers that are reset and reused between account sessions
+
+Usage:
+    python browser_pool.py --benchmark              # page load + RSS, lean profile off vs on
+    python browser_pool.py --benchmark --runs 5 --url https://app.gameonworld.ai/dashboard
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import hashlib
+import threading
+import logging
+from queue import Queue, Empty
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_ORIGIN = "https://app.gameonworld.ai"
+
+# Everything an account leaves behind except the HTTP cache, which stays warm
+RESET_STORAGE_TYPES = "cookies,local_storage,session_storage,indexeddb,websql,service_workers,cache_storage"
+
+# Background work Chrome does that the bots never need
+LEAN_FLAGS = [
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-domain-reliability',
+    '--disable-client-side-phishing-detection',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--mute-audio',
+    # Keep hidden game tabs ticking at full speed
+    '--disable-renderer-backgrounding',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+]
+
+# Network.setBlockedURLs patterns ('*' wildcard)
+LEAN_BLOCKED_URLS = [
+    # Analytics / tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*segment.io*", "*mixpanel.com*", "*clarity.ms*",
+    # Web fonts
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # Media
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+]
+
+# Opt-in only: the bots detect pieces and cards through rendered <img> elements
+LEAN_BLOCKED_IMAGES = ["*.jpg", "*.jpeg", "*.webp", "*.gif"]
+
+
+def lean_blocked_urls(lean):
+    """Patterns to block for a lean settings dict, e.g. settings['browser']['lean']"""
+    patterns = list(LEAN_BLOCKED_URLS)
+    if lean.get('block_images', False):
+        patterns += LEAN_BLOCKED_IMAGES
+    patterns += lean.get('blocked_urls', [])
+    return patterns
+
+
+def apply_lean_profile(driver, lean):
+    """
+    Start blocking unneeded requests on the driver's current target
+
+    Args:
+        driver: WebDriver (the block list survives navigations of its page)
+        lean: Lean settings dict, or None/{} to do nothing
+    """
+    if not lean or not lean.get('enabled', True):
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': lean_blocked_urls(lean)})
+    except WebDriverException as e:
+        logger.warning(f"Could not apply lean request blocking: {e}")
+
+
+def build_chrome_options(user_data_dir, headless=True, lean=None):
+    """Chrome options shared by every bot, plus the lean flags when enabled"""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+
+    # Each instance gets its own profile to prevent conflicts
+    options.add_argument(f'--user-data-dir={user_data_dir}')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-infobars')
+
+    # Lets the bots read the game iframe from the top document
+    options.add_argument('--remote-debugging-port=0')
+    options.add_argument('--disable-web-security')
+    options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+
+    if headless:
+        options.add_argument('--headless=new')
+
+    # Random window size for better isolation
+    window_width = 1920 + random.randint(-100, 100)
+    window_height = 1080 + random.randint(-100, 100)
+    options.add_argument(f'--window-size={window_width},{window_height}')
+
+    if lean and lean.get('enabled', True):
+        for flag in LEAN_FLAGS:
+            options.add_argument(flag)
+        options.add_argument(f"--disk-cache-size={lean.get('disk_cache_mb', 64) * 1024 * 1024}")
+    return options
+
+
+def launch_chrome(profile_key, headless=True, lean=None):
+    """
+    Start Chrome with a fresh temporary profile
+
+    Args:
+        profile_key: Account email or pool slot name, hashed into the profile path
+        headless: Run without a window
+        lean: Lean profile settings dict (flags, cache cap, request blocking), None to disable
+
+    Returns:
+        Tuple (driver, user_data_dir)
+    """
+    key_hash = hashlib.md5(profile_key.encode()).hexdigest()[:8]
+    user_data_dir = f"/tmp/chrome_profile_{key_hash}_{int(time.time())}_{random.randint(1000, 9999)}"
+    driver = webdriver.Chrome(options=build_chrome_options(user_data_dir, headless, lean))
+    apply_lean_profile(driver, lean)
+    return driver, user_data_dir
+
+
+def remove_profile(user_data_dir):
+    if user_data_dir and os.path.exists(user_data_dir):
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    """
+    Keeps up to `size` Chrome instances alive across account sessions.
+
+    acquire() hands out a healthy idle driver (launching one if the pool is
+    not full yet), release() wipes cookies/storage for the platform origins
+    and puts it back. Broken drivers are discarded and replaced lazily.
+    """
+
+    def __init__(self, size, headless=True, origins=(PLATFORM_ORIGIN,), lean=None):
+        self.size = max(1, size)
+        self.headless = headless
+        self.lean = lean
+        self.origins = list(origins)
+        self.idle = Queue()
+        self.lock = threading.Lock()
+        self.profiles = {}
+        self.used = set()
+        self.live = 0
+        self.launched = 0
+        self.reused = 0
+        self.closed = False
+
+    def warm(self):
+        """Launch every slot in parallel so the first sessions start hot"""
+        threads = [threading.Thread(target=self._launch_into_idle, daemon=True)
+                   for _ in range(self.size - self.live)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        logger.info(f"Browser pool warm: {self.idle.qsize()}/{self.size} Chrome instances ready")
+
+    def _launch(self):
+        with self.lock:
+            if self.live >= self.size:
+                return None
+            self.live += 1
+            slot = self.launched
+            self.launched += 1
+        try:
+            driver, user_data_dir = launch_chrome(f"pool-{slot}", self.headless, self.lean)
+        except Exception as e:
+            with self.lock:
+                self.live -= 1
+            logger.error(f"Browser pool could not launch Chrome: {e}")
+            return None
+        with self.lock:
+            self.profiles[driver.session_id] = user_data_dir
+        return driver
+
+    def _launch_into_idle(self):
+        driver = self._launch()
+        if driver:
+            self.idle.put(driver)
+
+    def _healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1 and len(driver.window_handles) > 0
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self.lock:
+            self.live -= 1
+            user_data_dir = self.profiles.pop(driver.session_id, None)
+            self.used.discard(driver.session_id)
+        remove_profile(user_data_dir)
+
+    def acquire(self, timeout=120):
+        """Get a ready driver; blocks while every slot is in use"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                driver = self.idle.get_nowait()
+            except Empty:
+                driver = self._launch()
+                if driver is None:
+                    try:
+                        driver = self.idle.get(timeout=min(5, max(0.1, deadline - time.time())))
+                    except Empty:
+                        continue
+
+            if self._healthy(driver):
+                with self.lock:
+                    if driver.session_id in self.used:
+                        self.reused += 1
+                return driver
+            logger.warning("Browser pool dropped an unhealthy Chrome instance")
+            self._discard(driver)
+
+        raise TimeoutError(f"No browser available from pool within {timeout}s")
+
+    def reset(self, driver):
+        """Make a used driver look fresh to the next account, keeping the disk cache"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+        driver.get("about:blank")
+        driver.delete_all_cookies()
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        for origin in self.origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': origin, 'storageTypes': RESET_STORAGE_TYPES
+            })
+
+    def release(self, driver):
+        """Return a driver to the pool, or throw it away if it cannot be reset"""
+        if self.closed:
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except Exception as e:
+            logger.warning(f"Browser pool reset failed, discarding instance: {e}")
+            self._discard(driver)
+            return
+        with self.lock:
+            self.used.add(driver.session_id)
+        self.idle.put(driver)
+
+    def shutdown(self):
+        """Quit every idle Chrome; drivers still checked out are quit on release"""
+        self.closed = True
+        while True:
+            try:
+                self._discard(self.idle.get_nowait())
+            except Empty:
+                break
+        logger.info(f"Browser pool closed - {self.launched} launched, {self.reused} reused")
+
+
+def create_browser_pool(settings, max_parallel):
+    """
+    Build the pool the runners share, from settings['browser']
+
+    mode "process" (default) keeps one warm Chrome per slot, "contexts" hosts
+    every account in a single Chrome via isolated browser contexts.
+    pool_size 0 disables pooling (one fresh Chrome per session).
+
+    Returns:
+        A warmed pool, or None
+    """
+    browser_settings = settings.get('browser', {})
+    pool_size = min(browser_settings.get('pool_size', max_parallel), max_parallel)
+    if pool_size <= 0:
+        return None
+
+    headless = settings.get('headless', True)
+    lean = browser_settings.get('lean')
+    if browser_settings.get('mode', 'process') == 'contexts':
+        from browser_contexts import ContextPool
+        pool = ContextPool(pool_size, headless=headless, lean=lean)
+    else:
+        # Also reset storage for a non-default platform (e.g. the offline mock)
+        origins = [PLATFORM_ORIGIN]
+        dashboard = urlparse(settings.get('dashboard_url', PLATFORM_ORIGIN))
+        if f"{dashboard.scheme}://{dashboard.netloc}" not in origins:
+            origins.append(f"{dashboard.scheme}://{dashboard.netloc}")
+        pool = BrowserPool(pool_size, headless=headless, origins=origins, lean=lean)
+    pool.warm()
+    return pool
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _page_load_ms(driver):
+    """Navigation Timing for the last load: navigationStart -> loadEventEnd"""
+    return driver.execute_script("""
+        const t = performance.timing;
+        return t.loadEventEnd > 0 ? t.loadEventEnd - t.navigationStart : null;
+    """)
+
+
+def benchmark(url, runs=3, headless=True, lean=None):
+    """
+    Load `url` `runs` times in one fresh Chrome (cold first, then warm cache)
+
+    Returns:
+        Dict with per-run load times (ms), transferred request count and final RSS (MB)
+    """
+    from browser_contexts import driver_rss_mb
+
+    driver, user_data_dir = launch_chrome("benchmark", headless, lean)
+    try:
+        loads = []
+        for _ in range(runs):
+            start = time.time()
+            driver.get(url)
+            load_ms = _page_load_ms(driver)
+            loads.append(load_ms if load_ms is not None else (time.time() - start) * 1000)
+        requests = driver.execute_script("return performance.getEntriesByType('resource').length")
+        return {'loads': loads, 'requests': requests, 'rss': driver_rss_mb([driver])}
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        remove_profile(user_data_dir)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chrome launcher utilities")
+    parser.add_argument('--benchmark', action='store_true', help='Compare page load and RSS, lean profile off vs on')
+    parser.add_argument('--url', default=f"{PLATFORM_ORIGIN}/auth/login")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--block-images', action='store_true', help='Also block images in the lean run')
+    parser.add_argument('--headed', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not args.benchmark:
+        parser.print_help()
+        sys.exit(1)
+
+    profiles = {
+        'default': None,
+        'lean': {'enabled': True, 'block_images': args.block_images},
+    }
+    print(f"\n{'PROFILE':<8} {'COLD LOAD':>10} {'WARM AVG':>9} {'REQUESTS':>9} {'RSS':>8}")
+    for name, lean in profiles.items():
+        result = benchmark(args.url, args.runs, not args.headed, lean)
+        loads = result['loads']
+        warm = sum(loads[1:]) / len(loads[1:]) if len(loads) > 1 else loads[0]
+        print(f"{name:<8} {loads[0]:>8.0f}ms {warm:>7.0f}ms {result['requests']:>9} {result['rss']:>6.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
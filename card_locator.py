@@ -0,0 +1,156 @@
+"""
+Game Card Locator
+Finds a game's dashboard card (create) or lobby challenge card (join) by
+running every fallback strategy inside the browser in one script call, and
+tries the strategy that matched last time for that game first
+"""
+
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# What identifies each game's card; each field lists lowercase alternatives,
+# matched case-insensitively as substrings, or as whole values with exact=True.
+# Strategies whose field a spec leaves out are skipped.
+GAME_CARDS = {
+    'connect4': {'text': ['connect 4'], 'alt': ['connect 4'], 'src': ['c1.jpg']},
+    'checkers': {'text': ['checker'], 'alt': ['checker'], 'src': ['checker']},
+    # The dashboard create card, with the runner's old broad match
+    'tictactoe': {'text': ['tic', 'tac'], 'alt': ['tic', 'tac'], 'src': ['tictac', 'tic-tac']},
+    'supertictactoe': {'alt': ['super tic tac toe'], 'exact': True},
+}
+
+# Lobby challenge overrides: plain and super tic-tac-toe challenges share the
+# lobby, so they are told apart by their exact image alt only
+CHALLENGE_CARDS = {
+    'tictactoe': {'alt': ['tic tac toe'], 'exact': True},
+}
+
+# Clickable card element per kind: game cards to create a game, lobby cards to join one
+CARD_SELECTORS = {
+    'create': "[data-card='true']",
+    'challenge': ".cursor-pointer",
+}
+
+STRATEGIES = ['card_text', 'image_alt', 'heading', 'image_src', 'text_nodes']
+
+_JS_LOCATE = r"""
+const spec = arguments[0];
+const order = arguments[1];
+
+function visible(el) {
+    if (!el || !el.getClientRects().length) return false;
+    const s = getComputedStyle(el);
+    return s.visibility !== 'hidden' && s.display !== 'none' && s.opacity !== '0';
+}
+
+// Lobby strips under an "AI ..." header never hold joinable challenges
+const excluded = [];
+if (spec.kind === 'challenge') {
+    for (const header of document.querySelectorAll('div')) {
+        if (header.children.length || !/^AI\b/.test((header.textContent || '').trim())) continue;
+        for (let node = header, depth = 0; node && depth < 5; node = node.parentElement, depth++) {
+            const sib = node.nextElementSibling;
+            const strip = sib && (sib.matches('[class*=overflow-x]') ? sib : sib.querySelector('[class*=overflow-x]'));
+            if (strip) { excluded.push(strip); break; }
+        }
+    }
+}
+
+function cardOf(el) {
+    const card = el && el.closest(spec.card);
+    if (!card || !visible(card)) return null;
+    if (excluded.some(strip => strip.contains(card))) return null;
+    return card;
+}
+
+function first(elements, test) {
+    for (const el of elements) {
+        if (test(el)) {
+            const card = cardOf(el);
+            if (card) return card;
+        }
+    }
+    return null;
+}
+
+const lower = s => (s || '').toLowerCase();
+const has = (s, needles) => {
+    const l = lower(s).trim();
+    return spec.exact ? needles.includes(l) : needles.some(n => l.includes(n));
+};
+const FIELDS = {card_text: 'text', image_alt: 'alt', heading: 'text', image_src: 'src', text_nodes: 'text'};
+const strategies = {
+    card_text: () => first(document.querySelectorAll(spec.card), el => has(el.innerText, spec.text)),
+    image_alt: () => first(document.querySelectorAll('img[alt]'), el => has(el.alt, spec.alt)),
+    heading: () => first(document.querySelectorAll('h1, h2, h3, h4, h5'), el => has(el.textContent, spec.text)),
+    image_src: () => first(document.images, el => has(el.getAttribute('src'), spec.src)),
+    text_nodes: () => {
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        const parents = [];
+        while (walker.nextNode()) {
+            if (has(walker.currentNode.nodeValue, spec.text)) parents.push(walker.currentNode.parentElement);
+        }
+        return first(parents, () => true);
+    },
+};
+
+for (const name of order) {
+    if (!spec[FIELDS[name]]) continue;
+    const card = strategies[name]();
+    if (card) return [card, name];
+}
+return null;
+"""
+
+
+class CardLocator:
+    """
+    Process-wide locator; remembers the winning strategy per (game, kind).
+
+    A strategy that matched last time is tried first, so after the first
+    lookup the usual case is the cheapest check.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.preferred = {}
+        self.hits = {}
+
+    def order(self, game, kind):
+        with self.lock:
+            winner = self.preferred.get((game, kind))
+        return [winner] + [s for s in STRATEGIES if s != winner] if winner else list(STRATEGIES)
+
+    def locate(self, driver, game, kind='create'):
+        """
+        Find the card in one round trip
+
+        Args:
+            game: Key of GAME_CARDS ('supertictactoe' for super tic-tac-toe challenges)
+            kind: 'create' for the dashboard game card, 'challenge' for a lobby challenge
+
+        Returns:
+            (element, strategy name), or (None, None) when no strategy matched
+        """
+        cards = CHALLENGE_CARDS.get(game, GAME_CARDS[game]) if kind == 'challenge' else GAME_CARDS[game]
+        spec = dict(cards, kind=kind, card=CARD_SELECTORS[kind])
+        found = driver.execute_script(_JS_LOCATE, spec, self.order(game, kind))
+        if not found:
+            return None, None
+        element, strategy = found
+        with self.lock:
+            if self.preferred.get((game, kind)) != strategy:
+                logger.debug(f"Card locator: {game}/{kind} now matched by {strategy}")
+            self.preferred[(game, kind)] = strategy
+            self.hits[strategy] = self.hits.get(strategy, 0) + 1
+        return element, strategy
+
+
+CARD_LOCATOR = CardLocator()
+
+
+def locate_card(driver, game, kind='create'):
+    """CARD_LOCATOR.locate() for callers that do not hold a locator"""
+    return CARD_LOCATOR.locate(driver, game, kind)
@@ -15,6 +15,10 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
+from lobby_scanner import scan_lobby
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible, visible_enabled
+
 LOG_DIR = Path("./logs")
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -86,55 +90,12 @@ class CheckersUltraExpertBot:
         try:
             popup_closed = False
             
-            close_selectors = [
-                "button.absolute.top-3.right-3",
-                "button svg[viewBox='0 0 512 512'] path[d*='289.94']//ancestor::button",
-                "svg[viewBox='0 0 512 512']//ancestor::button",
-                "button[aria-label='Close']",
-                "button[aria-label='close']",
-                "button.close",
-                ".close-button",
-                "button[class*='absolute'][class*='top'][class*='right']",
-                "div[role='dialog'] button:first-child",
-                "button svg[stroke='currentColor']//ancestor::button",
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            print(f"Closed popup using selector: {selector}")
-                            popup_closed = True
-                            time.sleep(0.5)
-                            break
-                    if popup_closed:
-                        break
-                except Exception:
-                    continue
-            
-            if not popup_closed:
-                try:
-                    xpath_selectors = [
-                        "//button[contains(text(), 'Close')]",
-                        "//button[contains(text(), 'Ã—')]",
-                        "//button[@aria-label='Close' or @aria-label='close']",
-                    ]
-                    
-                    for xpath in xpath_selectors:
-                        buttons = self.driver.find_elements(By.XPATH, xpath)
-                        for button in buttons:
-                            if button.is_displayed():
-                                button.click()
-                                print(f"Closed popup using xpath: {xpath}")
-                                popup_closed = True
-                                time.sleep(0.5)
-                                break
-                        if popup_closed:
-                            break
-                except:
-                    pass
+            buttons, selector = SELECTORS.find(self.driver, 'popup.close.modal', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                print(f"Closed popup using selector: {selector}")
+                popup_closed = True
+                time.sleep(0.5)
             
             if not popup_closed:
                 try:
@@ -238,52 +199,11 @@ class CheckersUltraExpertBot:
                 elapsed = int(time.time() - start_time)
                 self.close_popups()
 
-                # 1️⃣ Find the "Join Now" title
-                try:
-                    join_now_title = self.driver.find_element(
-                        By.XPATH,
-                        "//div[text()='Join Now']"
-                    )
-
-                    # 2️⃣ Get the container directly after it
-                    join_now_section = join_now_title.find_element(
-                        By.XPATH,
-                        "following-sibling::div"
-                    )
-
-                    # 3️⃣ Scrollable container INSIDE the Join Now section
-                    scroll_container = join_now_section.find_element(
-                        By.XPATH,
-                        ".//div[contains(@class,'overflow-x-scroll')]"
-                    )
-                except:
-                    if elapsed % 10 == 0:
-                        print("Join Now section not found yet...")
-                    time.sleep(1)
-                    continue
-
-                # 🔍 Search ONLY inside the Join Now container
-                for _ in range(20):
-                    try:
-                        # Connect-4 card inside Join Now only
-                        card = scroll_container.find_element(
-                            By.XPATH,
-                            ".//div[contains(@class,'rounded') and .//img[contains(@alt,'Checkers')]]"
-                        )
-
-                        if card.is_displayed():
-                            print("Checkers FOUND in Join Now section!")
-                            return True
-
-                    except:
-                        pass
-
-                    # scroll only the Join Now bar
-                    self.driver.execute_script(
-                        "arguments[0].scrollLeft += 300;",
-                        scroll_container
-                    )
-                    time.sleep(0.25)
+                # Every card in the Join Now strip in one script call, no scrolling
+                cards = [c for c in scan_lobby(self.driver, ('Join Now',)) if 'Checkers' in c['alt']]
+                if cards:
+                    print("Checkers FOUND in Join Now section!")
+                    return True
 
                 if elapsed % 10 == 0:
                     print(f"No Checkers in Join Now yet... ({elapsed}s elapsed)")
@@ -313,7 +233,7 @@ class CheckersUltraExpertBot:
             self.aggressive_popup_close()
             
             Checkers_card = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//img[@alt='Checkers']/ancestor::div[contains(@class, 'cursor-pointer')]"))
+                lambda d: locate_card(d, 'checkers', 'challenge')[0]
             )
             print("Clicking Checkers challenge...")
             Checkers_card.click()
@@ -368,35 +288,17 @@ class CheckersUltraExpertBot:
         
         try:
             # Find grid container
-            grid_selectors = [
-                "div.grid.grid-cols-8",
-                "div[class*='grid-cols-8']",
-                "div[class*='board-responsive']"
-            ]
-            
-            grid = None
-            for selector in grid_selectors:
-                try:
-                    grids = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if grids:
-                        grid = grids[0]
-                        break
-                except:
-                    continue
+            grids, _ = SELECTORS.find(self.driver, 'checkers.grid')
+            grid = grids[0] if grids else None
             
             if not grid:
                 logger.error(f"[] Could not find grid container")
                 return board
             
             # Get all square divs
-            squares = []
-            for selector in ["div[class*='aspect-square']", "div.w-full.aspect-square", "> div"]:
-                try:
-                    squares = grid.find_elements(By.CSS_SELECTOR, selector)
-                    if len(squares) == 64:
-                        break
-                except:
-                    continue
+            squares, _ = SELECTORS.find(grid, 'checkers.squares')
+            if not squares:
+                squares = grid.find_elements(By.CSS_SELECTOR, "div[class*='aspect-square']")
             
             if len(squares) != 64:
                 logger.warning(f"[] Expected 64 squares, found {len(squares)}")
@@ -657,22 +559,15 @@ class CheckersUltraExpertBot:
             logger.info(f"[] Executing move from ({from_r},{from_c}) idx={from_idx}")
             
             # Find grid
-            grid = None
-            for selector in ["div.grid.grid-cols-8", "div[class*='grid-cols-8']"]:
-                try:
-                    grids = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if grids:
-                        grid = grids[0]
-                        break
-                except:
-                    continue
+            grids, _ = SELECTORS.find(self.driver, 'checkers.move_grid')
+            grid = grids[0] if grids else None
             
             if not grid:
                 logger.error(f"[] Cannot find grid")
                 return False
             
             # Get all squares
-            squares = grid.find_elements(By.CSS_SELECTOR, "div[class*='aspect-square']")
+            squares, _ = SELECTORS.find(grid, 'checkers.squares')
             
             if len(squares) < 64:
                 logger.error(f"[] Not enough squares: {len(squares)}")
@@ -1235,21 +1130,10 @@ class CheckersUltraExpertBot:
     def check_for_result_page(self):
         """Check if we're on the result/game-over page"""
         try:
-            # Look for result page indicators
-            result_selectors = [
-                "//h2[contains(text(), 'Defeat')]",
-                "//h2[contains(text(), 'Victory')]",
-                "//h2[contains(text(), 'Winner')]",
-                "//button[contains(., 'Back to Home')]",
-                "//button[contains(., 'Play Again')]",
-                "//section[contains(@class, 'bg-black/90')]//img[@alt='player']",
-            ]
-            
-            for selector in result_selectors:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                if elements and any(el.is_displayed() for el in elements):
-                    print(f"Result page confirmed: {selector}")
-                    return True
+            elements, selector = SELECTORS.find(self.driver, 'result.page', accept=visible)
+            if elements:
+                print(f"Result page confirmed: {selector}")
+                return True
             
             return False
             
@@ -15,6 +15,11 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
+from lobby_scanner import scan_lobby
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible, visible_enabled
+from connect4_threats import analyze_threats, DEFAULT_DEPTH
+
 LOG_DIR = Path("./logs")
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -151,55 +156,12 @@ class Connect4Bot:
         try:
             popup_closed = False
             
-            close_selectors = [
-                "button.absolute.top-3.right-3",
-                "button svg[viewBox='0 0 512 512'] path[d*='289.94']//ancestor::button",
-                "svg[viewBox='0 0 512 512']//ancestor::button",
-                "button[aria-label='Close']",
-                "button[aria-label='close']",
-                "button.close",
-                ".close-button",
-                "button[class*='absolute'][class*='top'][class*='right']",
-                "div[role='dialog'] button:first-child",
-                "button svg[stroke='currentColor']//ancestor::button",
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            print(f"Closed popup using selector: {selector}")
-                            popup_closed = True
-                            time.sleep(0.5)
-                            break
-                    if popup_closed:
-                        break
-                except Exception:
-                    continue
-            
-            if not popup_closed:
-                try:
-                    xpath_selectors = [
-                        "//button[contains(text(), 'Close')]",
-                        "//button[contains(text(), 'Ã—')]",
-                        "//button[@aria-label='Close' or @aria-label='close']",
-                    ]
-                    
-                    for xpath in xpath_selectors:
-                        buttons = self.driver.find_elements(By.XPATH, xpath)
-                        for button in buttons:
-                            if button.is_displayed():
-                                button.click()
-                                print(f"Closed popup using xpath: {xpath}")
-                                popup_closed = True
-                                time.sleep(0.5)
-                                break
-                        if popup_closed:
-                            break
-                except:
-                    pass
+            buttons, selector = SELECTORS.find(self.driver, 'popup.close.modal', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                print(f"Closed popup using selector: {selector}")
+                popup_closed = True
+                time.sleep(0.5)
             
             if not popup_closed:
                 try:
@@ -303,52 +265,11 @@ class Connect4Bot:
                 elapsed = int(time.time() - start_time)
                 self.close_popups()
 
-                # 1️⃣ Find the "Join Now" title
-                try:
-                    join_now_title = self.driver.find_element(
-                        By.XPATH,
-                        "//div[text()='Join Now']"
-                    )
-
-                    # 2️⃣ Get the container directly after it
-                    join_now_section = join_now_title.find_element(
-                        By.XPATH,
-                        "following-sibling::div"
-                    )
-
-                    # 3️⃣ Scrollable container INSIDE the Join Now section
-                    scroll_container = join_now_section.find_element(
-                        By.XPATH,
-                        ".//div[contains(@class,'overflow-x-scroll')]"
-                    )
-                except:
-                    if elapsed % 10 == 0:
-                        print("Join Now section not found yet...")
-                    time.sleep(1)
-                    continue
-
-                # 🔍 Search ONLY inside the Join Now container
-                for _ in range(20):
-                    try:
-                        # Connect-4 card inside Join Now only
-                        card = scroll_container.find_element(
-                            By.XPATH,
-                            ".//div[contains(@class,'rounded') and .//img[contains(@alt,'Connect')]]"
-                        )
-
-                        if card.is_displayed():
-                            print("CONNECT 4 FOUND in Join Now section!")
-                            return True
-
-                    except:
-                        pass
-
-                    # scroll only the Join Now bar
-                    self.driver.execute_script(
-                        "arguments[0].scrollLeft += 300;",
-                        scroll_container
-                    )
-                    time.sleep(0.25)
+                # Every card in the Join Now strip in one script call, no scrolling
+                cards = [c for c in scan_lobby(self.driver, ('Join Now',)) if 'Connect' in c['alt']]
+                if cards:
+                    print("CONNECT 4 FOUND in Join Now section!")
+                    return True
 
                 if elapsed % 10 == 0:
                     print(f"No Connect 4 in Join Now yet... ({elapsed}s elapsed)")
@@ -378,7 +299,7 @@ class Connect4Bot:
             self.aggressive_popup_close()
             
             connect4_card = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//img[@alt='Connect 4']/ancestor::div[contains(@class, 'cursor-pointer')]"))
+                lambda d: locate_card(d, 'connect4', 'challenge')[0]
             )
             print("Clicking Connect 4 challenge...")
             connect4_card.click()
@@ -924,218 +845,28 @@ class Connect4Bot:
             logger.info(f"[] Counter-opening: Column {choice}")
             return choice
         
-        # Immediate win check
-        for col in valid_moves:
-            row = get_next_row(board, col)
-            if row is not None:
-                board[row][col] = player
-                if check_winner(board, player):
-                    board[row][col] = 0
-                    logger.info(f"[] ★★★ WINNING ★★★: Column {col}")
-                    return col
-                board[row][col] = 0
-        
-        # Block opponent win
-        for col in valid_moves:
-            row = get_next_row(board, col)
-            if row is not None:
-                board[row][col] = 3 - player
-                if check_winner(board, 3 - player):
-                    board[row][col] = 0
-                    logger.info(f"[] ★★ BLOCKING ★★: Column {col}")
-                    return col
-                board[row][col] = 0
-        
-        # === TACTICAL ANALYSIS (only after sufficient pieces are on board) ===
-        # Early game: focus on positioning, not tactics
-        # Mid-late game: tactical opportunities become critical
-        
-        use_advanced_tactics = total_pieces >= 10  # Only use tactics after 10+ pieces
-        
-        if use_advanced_tactics:
-            # Check for double threat opportunities (creates 2+ winning threats in one move)
-            logger.info(f"[] Scanning for double threats...")
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = player
-                    
-                    # Count how many winning threats this move creates
-                    threats_created = 0
-                    winning_positions = []
-                    
-                    # Check all possible next moves for wins
-                    for next_col in range(7):
-                        next_row = get_next_row(board, next_col)
-                        if next_row is not None:
-                            board[next_row][next_col] = player
-                            if check_winner(board, player):
-                                threats_created += 1
-                                winning_positions.append(next_col)
-                            board[next_row][next_col] = 0
-                    
-                    board[row][col] = 0
-                    
-                    # If we create 2+ winning threats, opponent can't block both!
-                    if threats_created >= 2:
-                        logger.info(f"[] ★★★ DOUBLE THREAT SETUP ★★★: Column {col} creates {threats_created} winning threats at {winning_positions}")
-                        return col
-            
-            # Check if opponent can create double threat (and block it)
-            logger.info(f"[] Checking opponent double threats...")
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = 3 - player
-                    
-                    # Count opponent's threats after this move
-                    opp_threats = 0
-                    for next_col in range(7):
-                        next_row = get_next_row(board, next_col)
-                        if next_row is not None:
-                            board[next_row][next_col] = 3 - player
-                            if check_winner(board, 3 - player):
-                                opp_threats += 1
-                            board[next_row][next_col] = 0
-                    
-                    board[row][col] = 0
-                    
-                    # Block opponent's double threat setup
-                    if opp_threats >= 2:
-                        logger.info(f"[] ★★ BLOCKING OPPONENT DOUBLE THREAT ★★: Column {col}")
-                        return col
-        
-        # Fork detection - only in mid-late game (16+ pieces)
-        if total_pieces >= 16:
-            # Check for fork opportunities (creating multiple 3-in-a-row threats)
-            logger.info(f"[] Scanning for fork opportunities...")
-            def count_three_in_row_threats(b, p):
-                """Count positions where player has 3-in-a-row with 1 empty (immediate winning threats)"""
-                threat_count = 0
-                threat_positions = set()
-                
-                # Horizontal
-                for r in range(6):
-                    for c in range(4):
-                        window = [b[r][c+i] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = c + window.index(0)
-                            # Check if this empty position is playable (has support below)
-                            if r == 5 or b[r+1][empty_idx] != 0:
-                                threat_positions.add((r, empty_idx))
-                
-                # Vertical
-                for c in range(7):
-                    for r in range(3):
-                        window = [b[r+i][c] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = r + window.index(0)
-                            if empty_idx == 5 or b[empty_idx+1][c] != 0:
-                                threat_positions.add((empty_idx, c))
-                
-                # Diagonal /
-                for r in range(3):
-                    for c in range(4):
-                        window = [b[r+i][c+i] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = window.index(0)
-                            empty_r, empty_c = r + empty_idx, c + empty_idx
-                            if empty_r == 5 or b[empty_r+1][empty_c] != 0:
-                                threat_positions.add((empty_r, empty_c))
-                
-                # Diagonal \
-                for r in range(3, 6):
-                    for c in range(4):
-                        window = [b[r-i][c+i] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = window.index(0)
-                            empty_r, empty_c = r - empty_idx, c + empty_idx
-                            if empty_r == 5 or b[empty_r+1][empty_c] != 0:
-                                threat_positions.add((empty_r, empty_c))
-                
-                return len(threat_positions), threat_positions
-            
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = player
-                    threat_count, positions = count_three_in_row_threats(board, player)
-                    board[row][col] = 0
-                    
-                    # Fork = creating 2+ immediate winning threats
-                    if threat_count >= 2:
-                        logger.info(f"[] ★★★ FORK OPPORTUNITY ★★★: Column {col} creates {threat_count} winning threats")
-                        return col
-            
-            # Block opponent forks
-            logger.info(f"[] Checking opponent fork threats...")
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = 3 - player
-                    threat_count, positions = count_three_in_row_threats(board, 3 - player)
-                    board[row][col] = 0
-                    
-                    if threat_count >= 2:
-                        logger.info(f"[] ★★ BLOCKING OPPONENT FORK ★★: Column {col}")
-                        return col
-        
-        # Vertical threat analysis - always important but validate carefully
-        if total_pieces >= 8:  # Only after some pieces are placed
-            logger.info(f"[] Analyzing vertical threats...")
-            
-            # Advanced: Avoid giving opponent vertical wins
-            dangerous_moves = []
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None and row > 0:  # Must have space above
-                    # Check if opponent has pieces below
-                    opp_pieces_below = 0
-                    for check_row in range(row + 1, 6):
-                        if board[check_row][col] == 3 - player:
-                            opp_pieces_below += 1
-                    
-                    # If opponent has 2+ pieces below, this is dangerous
-                    if opp_pieces_below >= 2:
-                        # Simulate: if we play here, opponent plays above us
-                        board[row][col] = player
-                        board[row-1][col] = 3 - player
-                        if check_winner(board, 3 - player):
-                            dangerous_moves.append(col)
-                            logger.warning(f"[] ⚠️ DANGEROUS: Column {col} gives opponent vertical win")
-                        board[row][col] = 0
-                        board[row-1][col] = 0
-            
-            # Filter out dangerous moves only if we have alternatives
-            if dangerous_moves and len(valid_moves) > len(dangerous_moves):
-                safe_moves = [col for col in valid_moves if col not in dangerous_moves]
-                if safe_moves:
-                    valid_moves = safe_moves
-                    logger.info(f"[] Filtered dangerous moves: {dangerous_moves}")
-            
-            # Check for our vertical threat opportunities
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None and row >= 2:  # Need at least 3 spaces above
-                    # Check if playing here sets up vertical win potential
-                    pieces_below = 0
-                    for check_row in range(row + 1, 6):
-                        if board[check_row][col] == player:
-                            pieces_below += 1
-                    
-                    # If we have 2 pieces below, this creates a vertical threat
-                    if pieces_below == 2:
-                        board[row][col] = player
-                        # Verify it's actually a winning threat (one more move wins)
-                        if row > 0:
-                            board[row-1][col] = player
-                            is_win = check_winner(board, player)
-                            board[row-1][col] = 0
-                            if is_win:
-                                board[row][col] = 0
-                                logger.info(f"[] ★★ VERTICAL THREAT ★★: Column {col} sets up vertical win")
-                                return col
-                        board[row][col] = 0
+        # Threat-space search: immediate wins, must-blocks, forced sequences,
+        # and the moves that would hand the opponent one
+        threats = analyze_threats(board, player, DEFAULT_DEPTH)
+        if threats['win'] is not None:
+            logger.info(f"[] ★★★ WINNING ★★★: Column {threats['win']}")
+            return threats['win']
+        
+        if threats['block'] is not None:
+            logger.info(f"[] ★★ BLOCKING ★★: Column {threats['block']}")
+            return threats['block']
+        
+        if threats['forced_win'] is not None:
+            logger.info(f"[] ★★★ FORCED WIN ★★★: Column {threats['forced_win']} "
+                        f"({threats['nodes']} nodes, {threats['ms']:.1f}ms)")
+            return threats['forced_win']
+        
+        # Drop moves that let the opponent force a win, if any move avoids it
+        unsafe = [col for col in valid_moves if col not in threats['safe']]
+        if unsafe and threats['safe']:
+            valid_moves = [col for col in valid_moves if col in threats['safe']]
+            logger.info(f"[] Filtered moves allowing a forced loss: {unsafe}")
+        logger.info(f"[] Threat search: {threats['nodes']} nodes, {threats['ms']:.1f}ms")
         
         # Multi-move sequence analysis for top moves
         logger.info(f"[] Analyzing opponent predictions...")
@@ -1364,21 +1095,10 @@ class Connect4Bot:
     def check_for_result_page(self):
         """Check if we're on the result/game-over page"""
         try:
-            # Look for result page indicators
-            result_selectors = [
-                "//h2[contains(text(), 'Defeat')]",
-                "//h2[contains(text(), 'Victory')]",
-                "//h2[contains(text(), 'Winner')]",
-                "//button[contains(., 'Back to Home')]",
-                "//button[contains(., 'Play Again')]",
-                "//section[contains(@class, 'bg-black/90')]//img[@alt='player']",
-            ]
-            
-            for selector in result_selectors:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                if elements and any(el.is_displayed() for el in elements):
-                    print(f"Result page confirmed: {selector}")
-                    return True
+            elements, selector = SELECTORS.find(self.driver, 'result.page', accept=visible)
+            if elements:
+                print(f"Result page confirmed: {selector}")
+                return True
             
             return False
             
@@ -15,6 +15,12 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
+from lobby_scanner import scan_lobby
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible, visible_enabled
+from ttt_table import best_move as table_move
+from ultimate_ttt import UltimateEngine, UltimateState
+
 LOG_DIR = Path("./logs")
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -62,6 +68,11 @@ class TicTacToeBot:
         self.difficulty = difficulty
         self.last_board_state = None
         self.my_player = None
+
+        # Super (ultimate) tic-tac-toe: set once the 81-cell board is seen
+        self.ultimate = False
+        self.uttt_engine = UltimateEngine()
+        self.uttt_move_time = {"easy": 1.0, "hard": 6.0}.get(difficulty, 3.0)
         
         # (Old tictactoe precomputations are left as-is but unused)
         self.winning_positions = self._precompute_winning_positions()
@@ -125,55 +136,12 @@ class TicTacToeBot:
         try:
             popup_closed = False
             
-            close_selectors = [
-                "button.absolute.top-3.right-3",
-                "button svg[viewBox='0 0 512 512'] path[d*='289.94']//ancestor::button",
-                "svg[viewBox='0 0 512 512']//ancestor::button",
-                "button[aria-label='Close']",
-                "button[aria-label='close']",
-                "button.close",
-                ".close-button",
-                "button[class*='absolute'][class*='top'][class*='right']",
-                "div[role='dialog'] button:first-child",
-                "button svg[stroke='currentColor']//ancestor::button",
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            print(f"Closed popup using selector: {selector}")
-                            popup_closed = True
-                            time.sleep(0.5)
-                            break
-                    if popup_closed:
-                        break
-                except Exception:
-                    continue
-            
-            if not popup_closed:
-                try:
-                    xpath_selectors = [
-                        "//button[contains(text(), 'Close')]",
-                        "//button[contains(text(), 'Ã—')]",
-                        "//button[@aria-label='Close' or @aria-label='close']",
-                    ]
-                    
-                    for xpath in xpath_selectors:
-                        buttons = self.driver.find_elements(By.XPATH, xpath)
-                        for button in buttons:
-                            if button.is_displayed():
-                                button.click()
-                                print(f"Closed popup using xpath: {xpath}")
-                                popup_closed = True
-                                time.sleep(0.5)
-                                break
-                        if popup_closed:
-                            break
-                except:
-                    pass
+            buttons, selector = SELECTORS.find(self.driver, 'popup.close.modal', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                print(f"Closed popup using selector: {selector}")
+                popup_closed = True
+                time.sleep(0.5)
             
             if not popup_closed:
                 try:
@@ -277,52 +245,11 @@ class TicTacToeBot:
                 elapsed = int(time.time() - start_time)
                 self.close_popups()
 
-                # 1️⃣ Find the "Join Now" title
-                try:
-                    join_now_title = self.driver.find_element(
-                        By.XPATH,
-                        "//div[text()='Join Now']"
-                    )
-
-                    # 2️⃣ Get the container directly after it
-                    join_now_section = join_now_title.find_element(
-                        By.XPATH,
-                        "following-sibling::div"
-                    )
-
-                    # 3️⃣ Scrollable container INSIDE the Join Now section
-                    scroll_container = join_now_section.find_element(
-                        By.XPATH,
-                        ".//div[contains(@class,'overflow-x-scroll')]"
-                    )
-                except:
-                    if elapsed % 10 == 0:
-                        print("Join Now section not found yet...")
-                    time.sleep(1)
-                    continue
-
-                # 🔍 Search ONLY inside the Join Now container
-                for _ in range(20):
-                    try:
-                        # Connect-4 card inside Join Now only
-                        card = scroll_container.find_element(
-                            By.XPATH,
-                            ".//div[contains(@class,'rounded') and .//img[contains(@alt,'Super Tic Tac Toe')]]"
-                        )
-
-                        if card.is_displayed():
-                            print("tictactoe FOUND in Join Now section!")
-                            return True
-
-                    except:
-                        pass
-
-                    # scroll only the Join Now bar
-                    self.driver.execute_script(
-                        "arguments[0].scrollLeft += 300;",
-                        scroll_container
-                    )
-                    time.sleep(0.25)
+                # Every card in the Join Now strip in one script call, no scrolling
+                cards = [c for c in scan_lobby(self.driver, ('Join Now',)) if 'Super Tic Tac Toe' in c['alt']]
+                if cards:
+                    print("tictactoe FOUND in Join Now section!")
+                    return True
 
                 if elapsed % 10 == 0:
                     print(f"No tictactoe in Join Now yet... ({elapsed}s elapsed)")
@@ -351,7 +278,7 @@ class TicTacToeBot:
             self.aggressive_popup_close()
             
             tictactoe_card = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//img[@alt='Super Tic Tac Toe']/ancestor::div[contains(@class, 'cursor-pointer')]"))
+                lambda d: locate_card(d, 'supertictactoe', 'challenge')[0]
             )
             print("Clicking tictactoe challenge...")
             tictactoe_card.click()
@@ -405,173 +332,82 @@ class TicTacToeBot:
     # SUPER TIC TAC TOE: BOARD READING & AI HELPERS
     # ======================================================================
 
-    def _ttt_get_lines(self):
-        """All winning lines on 3x3 board"""
-        lines = []
-        # Rows
-        for r in range(3):
-            lines.append([(r, 0), (r, 1), (r, 2)])
-        # Columns
-        for c in range(3):
-            lines.append([(0, c), (1, c), (2, c)])
-        # Diagonals
-        lines.append([(0, 0), (1, 1), (2, 2)])
-        lines.append([(0, 2), (1, 1), (2, 0)])
-        return lines
-
-    def _ttt_check_winner(self, board):
-        """Check if there's a winner. Returns 'X', 'O', or None"""
-        for line in self._ttt_get_lines():
-            values = [board[r][c] for r, c in line]
-            if values[0] == values[1] == values[2] and values[0] is not None:
-                return values[0]
-        return None
-
-    def _ttt_is_board_full(self, board):
-        """Check if 3x3 board is full"""
-        return all(board[r][c] is not None for r in range(3) for c in range(3))
-
     def _ttt_get_valid_moves(self, board):
         """All empty cells"""
         return [(r, c) for r in range(3) for c in range(3) if board[r][c] is None]
 
-    def _ttt_minimax(self, board, depth, is_maximizing, player, alpha, beta, start_time, max_time):
-        """Minimax with alpha-beta pruning and time limit"""
-        if time.time() - start_time > max_time:
-            return 0
-        
-        opponent = 'O' if player == 'X' else 'X'
-        
-        winner = self._ttt_check_winner(board)
-        if winner == player:
-            return 100 - depth
-        elif winner == opponent:
-            return depth - 100
-        elif self._ttt_is_board_full(board):
-            return 0
-        
-        if depth >= 9:
-            return 0
-        
-        valid_moves = self._ttt_get_valid_moves(board)
-        
-        if is_maximizing:
-            max_eval = float('-inf')
-            for r, c in valid_moves:
-                board[r][c] = player
-                eval_score = self._ttt_minimax(board, depth + 1, False, player, alpha, beta, start_time, max_time)
-                board[r][c] = None
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for r, c in valid_moves:
-                board[r][c] = opponent
-                eval_score = self._ttt_minimax(board, depth + 1, True, player, alpha, beta, start_time, max_time)
-                board[r][c] = None
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval
-
-    def _ttt_get_best_move(self, board, player, max_time=6):
-        """Get best move using minimax with time limit"""
-        start_time = time.time()
-        valid_moves = self._ttt_get_valid_moves(board)
-        
-        if not valid_moves:
-            return None
-        
-        # Center preference for opening
-        if board[1][1] is None:
-            move_count = sum(1 for r in range(3) for c in range(3) if board[r][c] is not None)
-            if move_count <= 1:
-                return (1, 1)
-        
-        best_move = None
-        best_score = float('-inf')
-        
-        for r, c in valid_moves:
-            if time.time() - start_time > max_time:
-                break
-            
-            board[r][c] = player
-            score = self._ttt_minimax(board, 0, False, player, float('-inf'), float('inf'), start_time, max_time)
-            board[r][c] = None
-            
-            if score > best_score:
-                best_score = score
-                best_move = (r, c)
-        
-        return best_move if best_move else random.choice(valid_moves)
-
     # ======================================================================
     # SUPER TIC TAC TOE: GAMEPLAY FUNCTIONS (REPLACED)
     # ======================================================================
 
+    def _read_cell(self, cell):
+        """'X', 'O' or None for one board cell"""
+        # data-value attribute (if exists)
+        data_value = cell.get_attribute('data-value')
+        if data_value:
+            try:
+                val = int(data_value)
+                return 'X' if val == 1 else 'O' if val == 2 else None
+            except:
+                pass
+
+        # images inside cell
+        for img in cell.find_elements(By.TAG_NAME, "img"):
+            alt = img.get_attribute('alt') or ''
+            src = img.get_attribute('src') or ''
+            if alt.upper() == 'X' or 'W-rTeAz-qe.png' in src:
+                return 'X'
+            elif alt.upper() == 'O' or 'B-4DvpsQW3.png' in src:
+                return 'O'
+
+        # fallback: check HTML / class
+        cell_class = cell.get_attribute('class') or ''
+        if 'disabled' in cell_class:
+            html = cell.get_attribute('innerHTML') or ''
+            if 'W-rTeAz-qe.png' in html or 'alt="X"' in html:
+                return 'X'
+            elif 'B-4DvpsQW3.png' in html or 'alt="O"' in html:
+                return 'O'
+        return None
+
+    def _find_cells(self):
+        """Board cells; sets self.ultimate from the cell count (81 = super tic-tac-toe)"""
+        # Both layouts use the same cell markup, so one lookup serves both; the
+        # entry is this bot's own, kept apart from multiple-tictactoe's 9-cell stats
+        cells, selector = SELECTORS.find(self.driver, 'supertictactoe.cells',
+                                         accept=lambda els: els if len(els) in (9, 81) else None)
+        if cells:
+            self.ultimate = len(cells) == 81
+            logger.info(f"[TTT] Found {len(cells)} cells ({selector})")
+            return cells
+        cells = self.driver.find_elements(
+            By.CSS_SELECTOR,
+            "div.cell, div[class*='aspect-square'], div[class*='cell']"
+        )
+        logger.info(f"[TTT] Alternative selector found {len(cells)} cells")
+        if len(cells) >= 81:
+            self.ultimate = True
+        return cells
+
     def read_board_state(self):
         """
-        Read the 3x3 tic-tac-toe board state.
-        Uses same logic as your working TicTacToe bot.
+        Read the board: 3x3 rows for classic tic-tac-toe, or for super
+        tic-tac-toe 9 sub-boards of 9 cells (cells in DOM order, each
+        sub-board's cells grouped together).
         """
-        board = [[None for _ in range(3)] for _ in range(3)]
+        size = 9 if self.ultimate else 3
+        board = [[None for _ in range(size)] for _ in range(size)]
         try:
-            cells = self.driver.find_elements(By.CSS_SELECTOR, "div.cell")
-            logger.info(f"[TTT] Found {len(cells)} cells")
-
-            if len(cells) != 9:
-                logger.warning(f"[TTT] Expected 9 cells, found {len(cells)}")
-                cells = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "div[class*='aspect-square'], div[class*='cell']"
-                )
-                logger.info(f"[TTT] Alternative selector found {len(cells)} cells")
-                if len(cells) == 0:
-                    logger.error("[TTT] No cells found!")
-                    return board
-
-            for i in range(min(9, len(cells))):
-                cell = cells[i]
-                row = i // 3
-                col = i % 3
-
+            cells = self._find_cells()
+            if len(cells) == 0:
+                logger.error("[TTT] No cells found!")
+                return board
+            size = 9 if self.ultimate else 3
+            board = [[None for _ in range(size)] for _ in range(size)]
+
+            for i in range(min(size * size, len(cells))):
                 try:
-                    # data-value attribute (if exists)
-                    data_value = cell.get_attribute('data-value')
-                    if data_value:
-                        try:
-                            val = int(data_value)
-                            board[row][col] = 'X' if val == 1 else 'O' if val == 2 else None
-                            continue
-                        except:
-                            pass
-
-                    # images inside cell
-                    imgs = cell.find_elements(By.TAG_NAME, "img")
-                    if imgs:
-                        for img in imgs:
-                            alt = img.get_attribute('alt') or ''
-                            src = img.get_attribute('src') or ''
-                            if alt.upper() == 'X' or 'W-rTeAz-qe.png' in src:
-                                board[row][col] = 'X'
-                                break
-                            elif alt.upper() == 'O' or 'B-4DvpsQW3.png' in src:
-                                board[row][col] = 'O'
-                                break
-
-                    # fallback: check HTML / class
-                    if board[row][col] is None:
-                        cell_class = cell.get_attribute('class') or ''
-                        if 'disabled' in cell_class:
-                            html = cell.get_attribute('innerHTML') or ''
-                            if 'W-rTeAz-qe.png' in html or 'alt="X"' in html:
-                                board[row][col] = 'X'
-                            elif 'B-4DvpsQW3.png' in html or 'alt="O"' in html:
-                                board[row][col] = 'O'
+                    board[i // size][i % size] = self._read_cell(cells[i])
                 except Exception as e:
                     logger.debug(f"[TTT] Error reading cell {i}: {e}")
                     continue
@@ -701,28 +537,59 @@ class TicTacToeBot:
 
     def calculate_best_move(self, board, player=None):
         """
-        Tic Tac Toe minimax-based move chooser.
+        Tic Tac Toe move chooser, looked up in the perfect-play table.
         `player` is 'X' or 'O'; if None, uses self.my_player.
+        Difficulty only picks among equally good moves.
         """
         if player is None:
             player = self.my_player or 'X'
 
-        # Simple difficulty handling if you want later
-        max_time = 6
-        if self.difficulty == "easy":
-            max_time = 2
-        elif self.difficulty == "hard":
-            max_time = 8
+        if self.ultimate:
+            return self._uttt_best_move(board, player)
 
-        best_move = self._ttt_get_best_move(board, player, max_time=max_time)
+        tiebreak = {"easy": "random", "hard": "trap"}.get(self.difficulty, "center")
+        best_move = table_move(board, player, tiebreak)
         logger.info(f"[TTT] Best move for {player}: {best_move}")
         return best_move
 
+    def _uttt_active_sub_board(self, board, player):
+        """
+        Sub-board we are sent to: the cell of the opponent's last move.
+        -1 (any open sub-board) when that move cannot be told from the boards.
+        """
+        old = self.last_board_state if self.last_board_state and len(self.last_board_state) == 9 else None
+        theirs, new_marks = [], []
+        for sub in range(9):
+            for cell in range(9):
+                mark = board[sub][cell]
+                if mark and mark != player:
+                    theirs.append(cell)
+                    if old and not old[sub][cell]:
+                        new_marks.append(cell)
+        # Their opening move may already be on the first board we read
+        if not new_marks and len(theirs) == 1:
+            new_marks = theirs
+        return new_marks[0] if len(new_marks) == 1 else -1
+
+    def _uttt_best_move(self, board, player):
+        """Super tic-tac-toe move from the MCTS engine, as (sub-board, cell)"""
+        state = UltimateState.from_board(board, player, self._uttt_active_sub_board(board, player))
+        stats = {}
+        move = self.uttt_engine.search(state, self.uttt_move_time, stats)
+        if move is None:
+            return None
+        sub, cell = divmod(move, 9)
+        win_rate = f"{stats['score'] * 100:.0f}%" if stats['score'] is not None else "-"
+        logger.info(f"[UTTT] Best move for {player}: sub-board {sub} cell {cell} - "
+                    f"{stats['playouts']} playouts ({stats['playouts_per_s']}/s), "
+                    f"root visits {stats['visits']} ({stats['reused']} reused), depth {stats['depth']}, win rate {win_rate}")
+        return sub, cell
+
     def detect_opponent_move(self, old_board, new_board):
-        """Detect which (row, col) opponent played in 3x3"""
+        """Detect which (row, col) opponent played; (sub-board, cell) in super tic-tac-toe"""
         try:
-            for r in range(3):
-                for c in range(3):
+            for r in range(len(new_board)):
+                for c in range(len(new_board[r])):
                     if old_board[r][c] != new_board[r][c]:
                         print(f"[Opponent] Played ({r},{c}) from '{old_board[r][c]}' to '{new_board[r][c]}'")
                         return (r, c)
@@ -731,15 +598,12 @@ class TicTacToeBot:
         return None
 
     def make_move(self, row, col):
-        """Click specific 3x3 Tic Tac Toe cell"""
+        """Click a cell: (row, col) in 3x3, (sub-board, cell) in super tic-tac-toe"""
         try:
-            cells = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "div.cell, div[class*='aspect-square'], div[class*='cell']"
-            )
+            cells = self._find_cells()
             logger.info(f"[TTT] Making move ({row},{col}) - {len(cells)} cells found")
 
-            idx = row * 3 + col
+            idx = row * (9 if self.ultimate else 3) + col
             if idx < len(cells):
                 cell = cells[idx]
 
@@ -817,10 +681,11 @@ class TicTacToeBot:
         max_stale_attempts = 3
         
         time.sleep(2)
+        self.uttt_engine.reset()
         my_player = self.detect_player_number()
         self.last_board_state = self.read_board_state()
         
-        max_moves = 50  # safety cap; real max is 9
+        max_moves = 81  # safety cap: a super tic-tac-toe board has 81 cells
         
         while move_count < max_moves:
             try:
@@ -908,15 +773,13 @@ class TicTacToeBot:
                 
                 if self.make_move(row, col):
                     move_count += 1
+                    # The board as we left it, not a re-read: a quick reply would
+                    # already be on it and hide the sub-board we are sent to
+                    self.last_board_state = [list(r) for r in board]
+                    self.last_board_state[row][col] = my_player or 'X'
                     time.sleep(2)
                     
                     stale_element_count = 0
-                    
-                    try:
-                        self.last_board_state = self.read_board_state()
-                    except:
-                        print("Board read failed after move - game may have ended")
-                        break
                 else:
                     print("Move failed")
                     time.sleep(1)
@@ -957,20 +820,10 @@ class TicTacToeBot:
     def check_for_result_page(self):
         """Check if we're on the result/game-over page"""
         try:
-            result_selectors = [
-                "//h2[contains(text(), 'Defeat')]",
-                "//h2[contains(text(), 'Victory')]",
-                "//h2[contains(text(), 'Winner')]",
-                "//button[contains(., 'Back to Home')]",
-                "//button[contains(., 'Play Again')]",
-                "//section[contains(@class, 'bg-black/90')]//img[@alt='player']",
-            ]
-            
-            for selector in result_selectors:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                if elements and any(el.is_displayed() for el in elements):
-                    print(f"Result page confirmed: {selector}")
-                    return True
+            elements, selector = SELECTORS.find(self.driver, 'result.page', accept=visible)
+            if elements:
+                print(f"Result page confirmed: {selector}")
+                return True
             
             return False
             
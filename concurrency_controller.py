@@ -0,0 +1,223 @@
+"""
+Adaptive Concurrency Controller
+Decides at run time how many bot sessions may be active, from available
+memory, load average and the measured RSS per session, and holds back new
+logins while the host is saturated
+"""
+
+import os
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def read_meminfo_mb(field='MemAvailable'):
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class ConcurrencyController:
+    """
+    Session slots whose number follows the host's headroom.
+
+    A sampler thread re-evaluates every `interval` seconds:
+    - memory below min_free_mb or load above the limit lowers the target by
+      one (running sessions finish normally, new ones wait)
+    - room for another session's RSS on top of min_free_mb, acceptable load
+      and sessions waiting for a slot raise it by one
+    RSS per session is measured from /proc as this process tree's RSS
+    divided by the active sessions, smoothed; session_memory_mb is only the
+    starting estimate.
+    """
+
+    def __init__(self, min_sessions=1, max_sessions=8, initial=None, min_free_mb=800,
+                 session_memory_mb=450, max_load_per_cpu=0.9, interval=5.0,
+                 min_start_gap=2.0, warmup=30.0, change_cooldown=20.0):
+        self.min_sessions = max(1, min_sessions)
+        self.max_sessions = max(self.min_sessions, max_sessions)
+        self.target = min(self.max_sessions, max(self.min_sessions, initial or self.min_sessions))
+        self.min_free_mb = min_free_mb
+        self.session_mb = session_memory_mb
+        self.max_load_per_cpu = max_load_per_cpu
+        self.interval = interval
+        self.min_start_gap = min_start_gap
+        self.warmup = warmup
+        self.change_cooldown = change_cooldown
+        self.cpus = os.cpu_count() or 1
+
+        self.cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.starts = []
+        self.last_change = 0
+        self.sample = {}
+        self.peak_active = 0
+        self.delayed = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self._sample()
+        self.thread = threading.Thread(target=self._loop, name="concurrency", daemon=True)
+        self.thread.start()
+        logger.info(f"Concurrency controller: target {self.target} "
+                    f"(range {self.min_sessions}-{self.max_sessions}), keeping {self.min_free_mb}MB free")
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        with self.cond:
+            self.cond.notify_all()
+        logger.info(f"Concurrency controller: peak {self.peak_active} sessions, final target {self.target}, "
+                    f"~{self.session_mb:.0f}MB per session, {self.delayed} logins delayed")
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.debug(f"Concurrency sample failed: {e}")
+
+    def _sample(self):
+        # browser_contexts pulls in selenium, only needed once sessions run
+        from browser_contexts import process_tree_rss_mb
+
+        free = read_meminfo_mb()
+        load = os.getloadavg()[0] / self.cpus if hasattr(os, 'getloadavg') else 0
+        rss = process_tree_rss_mb([os.getpid()]) if os.path.isdir('/proc') else 0
+
+        with self.cond:
+            if self.active and rss:
+                # Smooth, a session's RSS swings with page state
+                self.session_mb = 0.7 * self.session_mb + 0.3 * (rss / self.active)
+            self.sample = {'free_mb': free, 'load_per_cpu': round(load, 2), 'rss_mb': round(rss)}
+
+            now = time.time()
+            old = self.target
+            if self._saturated(free, load):
+                self.target = max(self.min_sessions, min(self.target, self.active) - 1)
+            elif (self.waiting and self.active >= self.target and now - self.last_change > self.change_cooldown
+                  and (free is None or free - self.session_mb > self.min_free_mb + self.session_mb)
+                  and load < self.max_load_per_cpu * 0.8):
+                self.target = min(self.max_sessions, self.target + 1)
+
+            if self.target != old:
+                self.last_change = now
+                free_str = f"{free:.0f}MB free" if free is not None else "free memory unknown"
+                logger.info(f"Concurrency target {old} -> {self.target} ({free_str}, load/cpu {load:.2f}, "
+                            f"~{self.session_mb:.0f}MB per session, {self.active} active)")
+                self.cond.notify_all()
+
+    def _saturated(self, free, load):
+        return (free is not None and free < self.min_free_mb) or load > self.max_load_per_cpu
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    def _can_start(self):
+        if self.active >= self.target:
+            return False
+        now = time.time()
+        self.starts = [t for t in self.starts if now - t < self.warmup]
+        if self.starts and now - self.starts[-1] < self.min_start_gap:
+            return False
+        if self.active == 0:
+            return True
+        # Live check so a burst of starts cannot outrun the sampler; sessions
+        # still launching Chrome have not shown up in MemAvailable yet
+        free = read_meminfo_mb()
+        return free is None or free - (len(self.starts) + 1) * self.session_mb >= self.min_free_mb
+
+    def acquire(self, name=""):
+        """Block until a session may start (i.e. before it launches Chrome and logs in)"""
+        with self.cond:
+            self.waiting += 1
+            held = False
+            try:
+                while not self._can_start():
+                    if self.stop_event.is_set():
+                        break
+                    if not held:
+                        held = True
+                        self.delayed += 1
+                        logger.info(f"[{name}] Waiting for a session slot "
+                                    f"({self.active}/{self.target} active)")
+                    self.cond.wait(timeout=1)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.starts.append(time.time())
+            self.peak_active = max(self.peak_active, self.active)
+
+    def release(self, name=""):
+        with self.cond:
+            self.active -= 1
+            self.cond.notify_all()
+
+    def wrap(self, session_func):
+        """session_func(account, settings) gated by a slot, for executor.submit()"""
+        def gated(account, settings):
+            email = account.get('email', '')
+            self.acquire(email)
+            try:
+                return session_func(account, settings)
+            finally:
+                self.release(email)
+        return gated
+
+    def snapshot(self):
+        with self.cond:
+            return {
+                'target': self.target,
+                'active': self.active,
+                'waiting': self.waiting,
+                'min_sessions': self.min_sessions,
+                'max_sessions': self.max_sessions,
+                'session_mb': round(self.session_mb),
+                **self.sample,
+            }
+
+
+def create_concurrency_controller(settings, max_parallel):
+    """
+    Build and start the controller from settings['concurrency']
+
+    max_parallel becomes the starting target; max_sessions defaults to twice that.
+    With browser pooling on, max_sessions is capped at browser.pool_size: every
+    admitted session needs a pooled browser, and one admitted past the pool
+    would only block in BrowserPool.acquire until it times out.
+
+    Returns:
+        A running ConcurrencyController, or None when disabled
+    """
+    config = settings.get('concurrency', {})
+    if not config.get('enabled', True):
+        return None
+    max_sessions = config.get('max_sessions', max_parallel * 2)
+    pool_size = settings.get('browser', {}).get('pool_size')
+    if pool_size and pool_size < max_sessions:
+        logger.info(f"Concurrency ceiling {max_sessions} capped at the browser pool size {pool_size}")
+        max_sessions = pool_size
+    return ConcurrencyController(
+        min_sessions=min(config.get('min_sessions', 1), max_sessions),
+        max_sessions=max_sessions,
+        initial=config.get('initial', max_parallel),
+        min_free_mb=config.get('min_free_mb', 800),
+        session_memory_mb=config.get('session_memory_mb', 450),
+        max_load_per_cpu=config.get('max_load_per_cpu', 0.9),
+        interval=config.get('interval', 5),
+        min_start_gap=settings.get('stagger_start_delay', 2),
+    ).start()
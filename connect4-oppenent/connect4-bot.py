@@ -4,7 +4,6 @@ Connect 4 Multi-Account PARALLEL Bot
 Enhanced with ULTRA-GODMODE AI with Opponent Prediction & Multi-Move Analysis
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -23,25 +22,38 @@ from datetime import datetime
 from pathlib import Path
 import threading
 import concurrent.futures
-import hashlib
+
+# Shared helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from game_probe import GameProbe
+from popup_guard import PopupGuard
+from webdriver_metrics import create_command_metrics
+from move_trace import MoveTracer
+from game_records import GameRecorder
+from metrics_server import METRICS, start_metrics_server
+from virtual_clock import CLOCK, configure_clock
+from browser_pool import create_browser_pool, launch_chrome, remove_profile
+from concurrency_controller import create_concurrency_controller
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible_enabled
+from log_pipeline import setup_logging, configure_logging
+from lobby_scanner import ChallengeBoard, LobbyScanner, scan_lobby, find_challenge_card
+from session_store import SessionStore
+from wait_utils import (WAIT_STATS, wait_for, pause, element_clickable, element_present,
+                        element_visible, element_gone, url_contains, document_ready,
+                        connect4_column_count, piece_in_column)
 
 # Configure logging
 LOG_DIR = Path(os.getenv('LOG_DIR', '/home/ubuntu/bots/logs'))
 LOG_DIR.mkdir(exist_ok=True, parents=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / f'bot_parallel_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+setup_logging(LOG_DIR / f'bot_parallel_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
 logger = logging.getLogger(__name__)
 
 # Thread-safe progress tracker
 class ProgressTracker:
-    def __init__(self):
+    def __init__(self, game_type):
+        self.game_type = game_type
         self.lock = threading.Lock()
         self.accounts_completed = 0
         self.games_completed = 0
@@ -56,48 +68,32 @@ class ProgressTracker:
             self.games_completed += 1
             if succeeded:
                 self.games_succeeded += 1
+        if not succeeded:
+            METRICS.game_failed(self.game_type)
     
     def get_stats(self):
         with self.lock:
             return self.accounts_completed, self.games_completed, self.games_succeeded
 
-tracker = ProgressTracker()
+tracker = ProgressTracker('connect4')
 
 
 class Connect4Bot:
     def __init__(self, account_email, account_password, dashboard_url="https://app.gameonworld.ai/dashboard", 
-                 difficulty="ultra_expert", bet_increase_clicks=0, headless=True):
-        
-        # Create unique user data directory for this account
-        account_hash = hashlib.md5(account_email.encode()).hexdigest()[:8]
-        user_data_dir = f"/tmp/chrome_profile_{account_hash}_{int(time.time())}"
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        
-        # Unique profile for each instance
-        options.add_argument(f'--user-data-dir={user_data_dir}')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--remote-debugging-port=0')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-        
-        if headless:
-            options.add_argument('--headless=new')
-        
-        # Random window size for isolation
-        window_width = 1920 + random.randint(-100, 100)
-        window_height = 1080 + random.randint(-100, 100)
-        options.add_argument(f'--window-size={window_width},{window_height}')
-        
-        self.driver = webdriver.Chrome(options=options)
+                 difficulty="ultra_expert", bet_increase_clicks=0, headless=True, browser_pool=None, session_store=None,
+                 lean_profile=None, login_url="https://app.gameonworld.ai/auth/login", webdriver_metrics=None,
+                 move_trace=None, game_records=None, challenge_board=None):
+        
+        self.browser_pool = browser_pool
+        if browser_pool:
+            # Warm instance or fresh browser context from the shared pool
+            self.driver = browser_pool.acquire()
+            self.user_data_dir = None
+        else:
+            self.driver, self.user_data_dir = launch_chrome(account_email, headless, lean_profile)
         self.wait = WebDriverWait(self.driver, 20)
         self.dashboard_url = dashboard_url
+        self.login_url = login_url
         self.game_iframe = None
         self.difficulty = difficulty
         self.bet_increase_clicks = bet_increase_clicks
@@ -106,41 +102,38 @@ class Connect4Bot:
         self.move_timeout = 10
         self.account_email = account_email
         self.account_password = account_password
-        self.user_data_dir = user_data_dir
+        self.session_store = session_store
+        # WebDriver round trips per calling method, None unless enabled in settings
+        self.commands = create_command_metrics(self.driver, self, account_email, webdriver_metrics)
+        self.tracer = MoveTracer(account_email, 'connect4', move_trace)
+        self.recorder = GameRecorder(account_email, 'connect4', game_records)
+        self.last_search = {}
+        # Shared lobby scanner's claims, None when every session watches the lobby itself
+        self.challenge_board = challenge_board
+        self.challenge = None
+        self.popup_guard = PopupGuard(self.driver, account_email)
+        self.popup_guard.install()
         logger.info(f"[{account_email}] Bot initialized - ULTRA-GODMODE AI")
         
     def start(self):
         """Navigate to login page"""
-        time.sleep(random.uniform(0.5, 2.0))
-        self.driver.get("https://app.gameonworld.ai/auth/login")
-        time.sleep(2)
+        CLOCK.sleep(random.uniform(0.5, 2.0))
+        self.driver.get(self.login_url)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "input[type='email']"), 10, 'login.page_loaded')
         logger.info(f"[{self.account_email}] Login page loaded")
     
     def close_popups(self):
         """Close any popups"""
         try:
-            close_selectors = [
-                "button.absolute.top-3.right-3",
-                "button svg[viewBox='0 0 512 512']//ancestor::button",
-                "button[aria-label='Close']",
-                "button[aria-label='close']",
-                "button.close",
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            time.sleep(0.5)
-                            return True
-                except:
-                    continue
+            buttons, _ = SELECTORS.find(self.driver, 'popup.close', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                CLOCK.sleep(0.5)
+                return True
             
             try:
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                time.sleep(0.3)
+                CLOCK.sleep(0.3)
             except:
                 pass
             return False
@@ -151,7 +144,13 @@ class Connect4Bot:
         """Login to platform"""
         try:
             logger.info(f"[{self.account_email}] Logging in...")
-            time.sleep(random.uniform(1.0, 3.0))
+            
+            if self.session_store and self.session_store.restore(self.driver, self.account_email, self.dashboard_url,
+                                                                 login_url=self.login_url):
+                self.popup_guard.sweep()
+                return True
+            
+            pause(random.uniform(1.0, 3.0), 'login.human_pacing')
             
             email_input = self.wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email'][placeholder='Email']"))
@@ -159,14 +158,14 @@ class Connect4Bot:
             password_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password'][placeholder='Password']")
             
             email_input.clear()
-            time.sleep(0.3)
+            pause(0.3, 'login.human_pacing')
             email_input.send_keys(self.account_email)
-            time.sleep(random.uniform(0.5, 1.0))
+            pause(random.uniform(0.5, 1.0), 'login.human_pacing')
             
             password_input.clear()
-            time.sleep(0.3)
+            pause(0.3, 'login.human_pacing')
             password_input.send_keys(self.account_password)
-            time.sleep(random.uniform(0.5, 1.0))
+            pause(random.uniform(0.5, 1.0), 'login.human_pacing')
             
             login_button = self.driver.find_element(By.XPATH, "//button[@type='submit' and contains(text(), 'Login')]")
             login_button.click()
@@ -174,206 +173,127 @@ class Connect4Bot:
             WebDriverWait(self.driver, 15).until(
                 lambda driver: "login" not in driver.current_url.lower()
             )
-            time.sleep(2)
+            wait_for(self.driver, document_ready(), 5, 'login.dashboard_ready')
             
-            for i in range(5):
-                if self.close_popups():
-                    time.sleep(0.5)
+            self.popup_guard.sweep()
             
             logger.info(f"[{self.account_email}] Login successful ✓")
+            if self.session_store:
+                self.session_store.save(self.driver, self.account_email)
             return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Login error: {e}")
             return False
     
     def wait_for_challenges(self, timeout=300):
-        """Wait for Connect 4 challenges in 'Challenges' section only (NOT 'AI Challenges')"""
+        """Wait for a Connect 4 challenge in the 'Challenges' section (NOT 'AI Challenges')"""
+        deadline = CLOCK.time() + timeout
+        if self.challenge_board and self.challenge_board.healthy:
+            if self._claim_challenge(deadline):
+                return True
+            if CLOCK.time() >= deadline:
+                logger.warning(f"[{self.account_email}] Timeout - no Connect 4 challenge claimed")
+                return False
+            logger.warning(f"[{self.account_email}] Lobby scanner unavailable - watching the lobby directly")
+        
         logger.info(f"[{self.account_email}] Monitoring Challenges section (timeout: {timeout}s)...")
-        start_time = time.time()
-        last_refresh = time.time()
+        start_time = CLOCK.time()
+        last_refresh = CLOCK.time()
         
-        while time.time() - start_time < timeout:
+        while CLOCK.time() < deadline:
             try:
-                elapsed = int(time.time() - start_time)
-                self.close_popups()
-                
-                # Strategy 1: Find by exact text "Challenges" (not "AI Challenges")
-                try:
-                    # Look for div with exact text "Challenges"
-                    challenges_section = self.driver.find_element(
-                        By.XPATH,
-                        "//div[text()='Challenges' and contains(@class, 'font-semibold')]"
-                    )
-                    
-                    # Get the main container (try different ancestor levels)
-                    for level in [2, 3, 4, 5]:
-                        try:
-                            section_container = challenges_section.find_element(
-                                By.XPATH, f"./ancestor::div[{level}]"
-                            )
-                            
-                            # Look for Connect 4 within this container
-                            connect4_cards = section_container.find_elements(
-                                By.XPATH,
-                                ".//img[@alt='Connect 4']"
-                            )
-                            
-                            if connect4_cards:
-                                for card in connect4_cards:
-                                    if card.is_displayed():
-                                        logger.info(f"[{self.account_email}] Connect 4 found in 'Challenges' section (level {level})!")
-                                        return True
-                        except:
-                            continue
-                except:
-                    pass
-                
-                # Strategy 2: Find all sections with "Challenges" in text, exclude "AI Challenges"
-                try:
-                    all_headers = self.driver.find_elements(
-                        By.XPATH,
-                        "//div[contains(text(), 'Challenges') and contains(@class, 'font-semibold')]"
-                    )
-                    
-                    for header in all_headers:
-                        header_text = header.text.strip()
-                        
-                        # Skip if this is "AI Challenges"
-                        if "AI" in header_text:
-                            logger.debug(f"[{self.account_email}] Skipping AI Challenges section")
-                            continue
-                        
-                        # Only process if it's exactly "Challenges"
-                        if header_text == "Challenges":
-                            for level in [2, 3, 4, 5]:
-                                try:
-                                    section_container = header.find_element(
-                                        By.XPATH, f"./ancestor::div[{level}]"
-                                    )
-                                    
-                                    connect4_cards = section_container.find_elements(
-                                        By.XPATH,
-                                        ".//img[@alt='Connect 4']"
-                                    )
-                                    
-                                    if connect4_cards:
-                                        for card in connect4_cards:
-                                            if card.is_displayed():
-                                                logger.info(f"[{self.account_email}] Connect 4 found in 'Challenges' section!")
-                                                return True
-                                except:
-                                    continue
-                except:
-                    pass
+                elapsed = int(CLOCK.time() - start_time)
                 
-                # Strategy 3: Direct search with class filter
-                try:
-                    # Find all Connect 4 images
-                    all_connect4 = self.driver.find_elements(
-                        By.XPATH,
-                        "//img[@alt='Connect 4']"
-                    )
-                    
-                    for img in all_connect4:
-                        if not img.is_displayed():
-                            continue
-                        
-                        # Check if this image is NOT under "AI Challenges"
-                        try:
-                            # Look up the DOM tree for section headers
-                            parent = img.find_element(By.XPATH, "./ancestor::div[contains(@class, 'overflow-x-auto')]/preceding-sibling::div[contains(@class, 'font-semibold')]")
-                            
-                            if parent.text.strip() == "Challenges":
-                                logger.info(f"[{self.account_email}] Connect 4 found in 'Challenges' section (direct)!")
-                                return True
-                        except:
-                            # Alternative: check if "AI Challenges" header is NOT nearby
-                            try:
-                                ai_header = img.find_element(
-                                    By.XPATH,
-                                    "./ancestor::div[5]//div[contains(text(), 'AI Challenges')]"
-                                )
-                                # If we found AI Challenges header nearby, skip this image
-                                logger.debug(f"[{self.account_email}] Skipping Connect 4 in AI Challenges")
-                                continue
-                            except:
-                                # No AI Challenges header found nearby, this is probably the right one
-                                logger.info(f"[{self.account_email}] Connect 4 found (not in AI section)!")
-                                return True
-                except:
-                    pass
+                # Every card in the strip in one script call, AI Challenges excluded
+                challenges = [c for c in scan_lobby(self.driver, ('Challenges',)) if c['game'] == 'connect4']
+                if challenges:
+                    self.challenge = challenges[0]
+                    logger.info(f"[{self.account_email}] Connect 4 found in 'Challenges' section!")
+                    return True
                 
                 if elapsed % 10 == 0:
                     logger.info(f"[{self.account_email}] No Connect 4 in 'Challenges' section... ({elapsed}s)")
                 
-                if time.time() - last_refresh >= 30:
+                if CLOCK.time() - last_refresh >= 30:
                     logger.info(f"[{self.account_email}] Refreshing page...")
                     self.driver.refresh()
-                    time.sleep(2)
-                    self.close_popups()
-                    last_refresh = time.time()
+                    wait_for(self.driver, document_ready(), 10, 'lobby.refresh')
+                    self.popup_guard.sweep()
+                    last_refresh = CLOCK.time()
                 
-                time.sleep(2)
+                pause(2, 'lobby.poll')
             except Exception as e:
                 logger.error(f"[{self.account_email}] Error checking challenges: {e}")
-                time.sleep(2)
+                CLOCK.sleep(2)
         
         logger.warning(f"[{self.account_email}] Timeout - no Connect 4 in 'Challenges' section")
         return False
     
+    def _claim_challenge(self, deadline):
+        """Take a challenge from the shared lobby scanner and bring it up on our own dashboard"""
+        while CLOCK.time() < deadline:
+            challenge = self.challenge_board.claim('connect4', self.account_email, deadline - CLOCK.time())
+            if not challenge:
+                return False
+            logger.info(f"[{self.account_email}] Claimed challenge '{challenge['text']}' "
+                        f"(seen {CLOCK.time() - challenge['first_seen']:.1f}s ago)")
+            
+            # Our page is not the scanner's, reload until the card shows up here too
+            self.driver.get(self.dashboard_url)
+            if wait_for(self.driver, lambda d: find_challenge_card(d, challenge), 10, 'lobby.claimed_card'):
+                self.challenge = challenge
+                return True
+            logger.info(f"[{self.account_email}] Claimed challenge is gone, waiting for another")
+            self.challenge_board.release(challenge, joined=False)
+        return False
+    
     def join_challenge(self):
         """Find and join Connect 4 challenge from 'Challenges' section only"""
         try:
-            self.close_popups()
+            self.popup_guard.resume()
             
-            # Find "Challenges" header (not "AI Challenges")
-            challenges_header = None
-            headers = self.driver.find_elements(
-                By.XPATH,
-                "//div[contains(@class, 'font-semibold') and contains(@class, 'text-gray-800') and text()='Challenges']"
-            )
+            if self.challenge:
+                connect4_card = find_challenge_card(self.driver, self.challenge)
+                if connect4_card:
+                    return self._join_card(connect4_card)
             
-            for header in headers:
-                # Verify it's not "AI Challenges" by checking the exact text
-                if header.text.strip() == "Challenges":
-                    challenges_header = header
-                    break
-            
-            if not challenges_header:
-                logger.error(f"[{self.account_email}] 'Challenges' section not found")
+            # Lobby cards outside the AI Challenges strip, all fallback strategies in one call
+            connect4_card, _ = locate_card(self.driver, 'connect4', 'challenge')
+            if not connect4_card:
+                logger.error(f"[{self.account_email}] No Connect 4 card in the 'Challenges' section")
                 return False
             
-            # Get the section container
-            section_container = challenges_header.find_element(By.XPATH, "./ancestor::div[3]")
-            
-            # Find Connect 4 within this specific section
-            connect4_card = section_container.find_element(
-                By.XPATH,
-                ".//img[@alt='Connect 4']/ancestor::div[contains(@class, 'cursor-pointer')]"
-            )
-            
-            logger.info(f"[{self.account_email}] Clicking Connect 4 in 'Challenges' section...")
-            connect4_card.click()
-            time.sleep(2)
-            
-            self.close_popups()
-            
-            join_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Join Challenge')]"))
-            )
-            logger.info(f"[{self.account_email}] Joining challenge...")
-            join_button.click()
-            time.sleep(3)
-            
-            for _ in range(5):
-                self.close_popups()
-                time.sleep(1)
-            
-            return self.switch_to_game_iframe()
+            return self._join_card(connect4_card)
         except Exception as e:
             logger.error(f"[{self.account_email}] Error joining challenge: {e}")
+            self._release_challenge(False)
             return False
     
+    def _join_card(self, connect4_card):
+        logger.info(f"[{self.account_email}] Clicking Connect 4 in 'Challenges' section...")
+        # The card opens the join modal, keep it open until we have joined
+        self.popup_guard.pause()
+        connect4_card.click()
+        
+        join_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(text(), 'Join Challenge')]"),
+                               20, 'join.join_button')
+        if not join_button:
+            raise TimeoutException("'Join Challenge' button never became clickable")
+        logger.info(f"[{self.account_email}] Joining challenge...")
+        join_button.click()
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "iframe[src*='connect4']"), 10, 'join.game_iframe')
+        
+        self.popup_guard.resume()
+        
+        joined = self.switch_to_game_iframe()
+        self._release_challenge(joined)
+        return joined
+    
+    def _release_challenge(self, joined):
+        if self.challenge and self.challenge_board and 'first_seen' in self.challenge:
+            self.challenge_board.release(self.challenge, joined)
+        self.challenge = None
+    
     def switch_to_game_iframe(self):
         """Switch to game iframe"""
         try:
@@ -446,6 +366,8 @@ class Connect4Bot:
     def calculate_best_move(self, board, player=1):
         """ULTRA-GODMODE AI - Enhanced algorithm"""
         start_time = time.time()
+        # Filled in as the search runs, read by the move tracer
+        search = self.last_search = {'depth': None, 'nodes': 0, 'score': None}
         transposition_table = {}
         
         def board_hash(b):
@@ -499,6 +421,7 @@ class Connect4Bot:
             return score
         
         def minimax(b, depth, alpha, beta, maximizing):
+            search['nodes'] += 1
             if time.time() - start_time > 9.0:
                 return None, evaluate_position(b, player)
             
@@ -607,6 +530,7 @@ class Connect4Bot:
         
         logger.info(f"[{self.account_email}] Computing depth {depth}...")
         column, score = minimax([row[:] for row in board], depth, float('-inf'), float('inf'), True)
+        search.update(depth=depth, score=score)
         
         calc_time = time.time() - start_time
         
@@ -621,9 +545,10 @@ class Connect4Bot:
         try:
             cells = self.driver.find_elements(By.CSS_SELECTOR, "table tbody tr:first-child td.board-cell")
             if column < len(cells):
+                discs_before = connect4_column_count(self.driver, column)
                 cells[column].click()
                 logger.info(f"[{self.account_email}] Played {column}")
-                time.sleep(1)
+                wait_for(self.driver, piece_in_column(column, discs_before), 2, 'move.piece_landed')
                 return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Move error: {e}")
@@ -654,72 +579,93 @@ class Connect4Bot:
         """Main game loop"""
         logger.info(f"[{self.account_email}] Starting game")
         move_count = 0
-        time.sleep(2)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "table tbody tr td.board-cell"), 5, 'game.board_ready')
         
         self.detect_player_number()
-        
+        probe = GameProbe(self.driver, 'connect4', "iframe[src*='connect4']")
+        self.tracer.start_game(self.driver.execute_script("return location.href"))
+        self.recorder.start_game(self.tracer.game_id, self.my_player)
+        result = None
+
         while move_count < 42:
             try:
-                self.driver.switch_to.default_content()
-                self.close_popups()
-                
-                if self.game_iframe:
-                    self.driver.switch_to.frame(self.game_iframe)
-                
-                if self.check_game_over():
-                    logger.info(f"[{self.account_email}] Game finished")
+                state = self.tracer.probe(probe, self.game_iframe)
+
+                if state.game_over:
+                    logger.info(f"[{self.account_email}] Game finished ({state.result or 'iframe closed'})")
+                    result = state.result
                     break
-                
-                if self.is_my_turn():
-                    board = self.read_board_state()
-                    column = self.calculate_best_move(board, self.my_player)
+
+                if state.popup_present:
+                    self.driver.switch_to.default_content()
+                    self.close_popups()
+                    if self.game_iframe:
+                        self.driver.switch_to.frame(self.game_iframe)
+                    continue
+
+                if state.my_turn and state.board:
+                    self.tracer.turn_detected()
+                    with self.tracer.span('engine') as search:
+                        column = self.calculate_best_move(state.board, self.my_player)
+                        search.update(self.last_search)
                     
-                    if column is not None and self.make_move(column):
-                        move_count += 1
-                        time.sleep(1.5)
+                    if column is not None:
+                        with self.tracer.span('click'):
+                            moved = self.make_move(column)
+                        if moved:
+                            move_count += 1
+                            self.recorder.move(column, state.board, search)
+                            with self.tracer.span('confirm'):
+                                wait_for(self.driver, element_gone(By.CSS_SELECTOR, ".turn-timer-bottom"),
+                                         2.5, 'game.turn_handover', poll=0.25)
+                            if self.commands:
+                                self.commands.move_done(f"col {column}")
+                        self.tracer.move_done(f"col {column}", ok=moved)
                 else:
-                    time.sleep(1)
+                    wait_for(self.driver, element_visible(By.CSS_SELECTOR, ".turn-timer-bottom"),
+                             1, 'game.opponent_turn', poll=0.25)
             except Exception as e:
                 logger.error(f"[{self.account_email}] Game error: {e}")
                 break
         
+        self.recorder.finish(result)
         logger.info(f"[{self.account_email}] Game completed ({move_count} moves)")
-        time.sleep(3)
     
     def handle_post_game(self):
         """Return to dashboard"""
+        if self.commands:
+            self.commands.game_done()
         try:
             logger.info(f"[{self.account_email}] Post-game handling")
             self.driver.switch_to.default_content()
-            time.sleep(2)
+            logger.info(f"[{self.account_email}] Popup guard dismissed {self.popup_guard.closed_count()} popup(s) this game")
             
-            try:
-                back_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Back to Home')]"))
-                )
+            back_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Back to Home')]"),
+                                   12, 'post.back_button')
+            if back_button:
                 back_button.click()
-            except:
+            else:
                 self.driver.get(self.dashboard_url)
             
-            time.sleep(3)
+            wait_for(self.driver, url_contains('dashboard'), 5, 'post.dashboard')
             return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Post-game error: {e}")
             return False
     
     def quit(self):
-        """Close browser and cleanup"""
+        """Close browser (or hand it back to the pool) and cleanup"""
+        if self.commands:
+            self.commands.uninstall()
+        if self.browser_pool:
+            self.popup_guard.uninstall()
+            self.browser_pool.release(self.driver)
+            logger.info(f"[{self.account_email}] Browser returned to pool")
+            return
         try:
             self.driver.quit()
             logger.info(f"[{self.account_email}] Browser closed")
-            
-            # Cleanup temp directory
-            try:
-                import shutil
-                if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
-                    shutil.rmtree(self.user_data_dir, ignore_errors=True)
-            except:
-                pass
+            remove_profile(self.user_data_dir)
         except:
             pass
 
@@ -767,7 +713,7 @@ def run_bot_session(account, settings):
     start_delay = account.get('_start_delay', 0)
     if start_delay > 0:
         logger.info(f"[{email}] Waiting {start_delay}s (stagger delay)")
-        time.sleep(start_delay)
+        CLOCK.sleep(start_delay)
     
     logger.info(f"[{email}] ╔════════════════════════════════════════╗")
     logger.info(f"[{email}] Starting session - {games_to_play} games")
@@ -778,7 +724,16 @@ def run_bot_session(account, settings):
         bot = Connect4Bot(
             account_email=email,
             account_password=password,
-            headless=settings.get('headless', True)
+            headless=settings.get('headless', True),
+            browser_pool=settings.get('_browser_pool'),
+            session_store=settings.get('_session_store'),
+            lean_profile=settings.get('browser', {}).get('lean'),
+            dashboard_url=settings.get('dashboard_url', "https://app.gameonworld.ai/dashboard"),
+            login_url=settings.get('login_url', "https://app.gameonworld.ai/auth/login"),
+            webdriver_metrics=settings.get('webdriver_metrics'),
+            move_trace=settings.get('move_trace'),
+            game_records=settings.get('game_records'),
+            challenge_board=settings.get('_challenge_board')
         )
     except Exception as e:
         logger.error(f"[{email}] Failed to create bot: {e}")
@@ -788,17 +743,22 @@ def run_bot_session(account, settings):
     games_succeeded = 0
     
     try:
+        METRICS.session_started('connect4')
         bot.start()
         
+        bot.recorder.begin()
         if not bot.login():
             logger.error(f"[{email}] Login failed")
             return {"email": email, "games_played": 0, "games_succeeded": 0, "success": False}
+        bot.recorder.mark('login')
         
         for game_num in range(1, games_to_play + 1):
             logger.info(f"[{email}] ─── Game {game_num}/{games_to_play} ───")
             
             try:
+                bot.recorder.begin()
                 if bot.wait_for_challenges(timeout=settings.get('challenge_wait_timeout', 300)):
+                    bot.recorder.mark('wait_for_challenge')
                     if bot.join_challenge():
                         bot.play_game()
                         bot.handle_post_game()
@@ -809,12 +769,12 @@ def run_bot_session(account, settings):
                         if game_num < games_to_play:
                             wait_time = settings.get('wait_between_games', 10)
                             logger.info(f"[{email}] Waiting {wait_time}s...")
-                            time.sleep(wait_time)
+                            CLOCK.sleep(wait_time)
                 else:
                     logger.warning(f"[{email}] No challenge for game {game_num}")
                     games_played += 1
                     tracker.game_done(False)
-                    time.sleep(10)
+                    CLOCK.sleep(10)
             except Exception as e:
                 logger.error(f"[{email}] Game {game_num} error: {e}")
                 games_played += 1
@@ -835,6 +795,63 @@ def run_bot_session(account, settings):
     finally:
         if bot:
             bot.quit()
+            METRICS.session_finished('connect4')
+
+
+def start_lobby_scanner(settings, accounts, joiners):
+    """
+    Log one dedicated browser into the dashboard and start the shared lobby scanner
+
+    The scanner logs in as settings.lobby_scanner.account, which must not
+    also run a joiner session: a second login of the same account can
+    invalidate the first. The caller drops it from the joiners.
+
+    Args:
+        accounts: Every configured account, enabled or not
+        joiners: The accounts that will run joiner sessions
+
+    Returns:
+        (scanner, scanner_bot), or (None, None) when disabled, unconfigured or the login fails
+    """
+    scanner_settings = settings.get('lobby_scanner', {})
+    if not scanner_settings.get('enabled', True):
+        return None, None
+    account = next((a for a in accounts if a['email'] == scanner_settings.get('account')), None)
+    if account is None:
+        logger.info("Lobby scanner off: set settings.lobby_scanner.account to an account it can use on its own")
+        return None, None
+    if len([a for a in joiners if a['email'] != account['email']]) < 2:
+        return None, None
+    
+    scanner_bot = None
+    try:
+        # Its own browser, not a pool slot: it stays on the dashboard for the whole run
+        scanner_bot = Connect4Bot(
+            account_email=account['email'],
+            account_password=account['password'],
+            headless=settings.get('headless', True),
+            session_store=settings.get('_session_store'),
+            lean_profile=settings.get('browser', {}).get('lean'),
+            dashboard_url=settings.get('dashboard_url', "https://app.gameonworld.ai/dashboard"),
+            login_url=settings.get('login_url', "https://app.gameonworld.ai/auth/login")
+        )
+        scanner_bot.start()
+        if not scanner_bot.login():
+            raise RuntimeError("login failed")
+    except Exception as e:
+        logger.warning(f"Lobby scanner not started, sessions will watch the lobby themselves: {e}")
+        if scanner_bot:
+            scanner_bot.quit()
+        return None, None
+    
+    board = ChallengeBoard(claim_ttl=scanner_settings.get('claim_ttl', 60))
+    settings['_challenge_board'] = board
+    scanner = LobbyScanner(
+        scanner_bot.driver, board, scanner_bot.dashboard_url,
+        interval=scanner_settings.get('interval', 2),
+        refresh_every=scanner_settings.get('refresh_every', 30)
+    ).start()
+    return scanner, scanner_bot
 
 
 def main():
@@ -849,6 +866,9 @@ def main():
     
     accounts = config.get('accounts', [])
     settings = config.get('settings', {})
+    configure_logging(settings.get('logging'))
+    start_metrics_server(settings)
+    configure_clock(settings)
     
     enabled_accounts = [acc for acc in accounts if acc.get('enabled', True)]
     
@@ -862,37 +882,69 @@ def main():
     logger.info(f"Processing {len(enabled_accounts)} accounts with max {max_parallel} parallel")
     logger.info(f"Stagger delay: {stagger_delay}s")
     
-    # Add stagger delays
+    # The controller adjusts the active session count to the host's headroom
+    # and spaces session starts itself; without it, stagger them up front
+    controller = create_concurrency_controller(settings, max_parallel)
+    ceiling = controller.max_sessions if controller else max_parallel
     for i, account in enumerate(enabled_accounts):
-        account['_start_delay'] = i * stagger_delay
+        account['_start_delay'] = 0 if controller else i * stagger_delay
     
     results = []
     
-    # Run in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
-        future_to_account = {
-            executor.submit(run_bot_session, account, settings): account 
-            for account in enabled_accounts
-        }
+    # Restore saved logins instead of replaying the form every run
+    session_settings = settings.get('session_cache', {})
+    if session_settings.get('enabled', True):
+        settings['_session_store'] = SessionStore(
+            directory=session_settings.get('directory'),
+            max_age_hours=session_settings.get('max_age_hours', 72)
+        )
+    
+    # Keep warm Chrome instances (or browser contexts) alive across account sessions
+    browser_pool = create_browser_pool(settings, ceiling)
+    settings['_browser_pool'] = browser_pool
+    
+    # One browser watches the lobby for every session
+    scanner, scanner_bot = start_lobby_scanner(settings, accounts, enabled_accounts)
+    if scanner_bot:
+        # The scanner's account stays on the dashboard, it does not join as well
+        enabled_accounts = [acc for acc in enabled_accounts if acc['email'] != scanner_bot.account_email]
+        logger.info(f"Lobby scanner running as {scanner_bot.account_email}")
+    
+    session_func = controller.wrap(run_bot_session) if controller else run_bot_session
+    try:
+        # Run in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ceiling) as executor:
+            future_to_account = {
+                executor.submit(session_func, account, settings): account 
+                for account in enabled_accounts
+            }
         
-        for future in concurrent.futures.as_completed(future_to_account):
-            account = future_to_account[future]
-            try:
-                result = future.result()
-                results.append(result)
+            for future in concurrent.futures.as_completed(future_to_account):
+                account = future_to_account[future]
+                try:
+                    result = future.result()
+                    results.append(result)
                 
-                acc_done, games_done, games_succ = tracker.get_stats()
-                logger.info(f"╠═══ PROGRESS: {acc_done}/{len(enabled_accounts)} accounts, "
-                           f"{games_succ}/{games_done} games succeeded ═══╣")
+                    acc_done, games_done, games_succ = tracker.get_stats()
+                    logger.info(f"╠═══ PROGRESS: {acc_done}/{len(enabled_accounts)} accounts, "
+                               f"{games_succ}/{games_done} games succeeded ═══╣")
                 
-            except Exception as e:
-                logger.error(f"[{account['email']}] Thread exception: {e}")
-                results.append({
-                    "email": account['email'],
-                    "games_played": 0,
-                    "games_succeeded": 0,
-                    "success": False
-                })
+                except Exception as e:
+                    logger.error(f"[{account['email']}] Thread exception: {e}")
+                    results.append({
+                        "email": account['email'],
+                        "games_played": 0,
+                        "games_succeeded": 0,
+                        "success": False
+                    })
+    finally:
+        if scanner:
+            scanner.stop()
+            scanner_bot.quit()
+        if controller:
+            controller.stop()
+        if browser_pool:
+            browser_pool.shutdown()
     
     # Summary
     logger.info("\n╔═══════════════════════════════════════════════════════════════╗")
@@ -916,6 +968,8 @@ def main():
     logger.info(f"║ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                f"{' ' * 37}║")
     logger.info("╚═══════════════════════════════════════════════════════════════╝")
+    
+    WAIT_STATS.log_report(logger)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+"""
+Connect 4 Threat-Space Search
+Winnable-square bitmasks for both players and a search over forcing
+sequences (our threat -> their only reply) that finds immediate wins,
+forced wins and the moves we must not allow, in milliseconds
+
+Bitboards use the usual column-major layout: bit col * 7 + height, height 0
+at the bottom, with one spare bit on top of each column.
+
+    threats = analyze_threats(board, player=1, depth=6)
+    threats['win'], threats['block'], threats['forced_win'], threats['safe']
+"""
+
+import time
+
+ROWS, COLS = 6, 7
+H1 = ROWS + 1
+
+BOTTOM = sum(1 << (col * H1) for col in range(COLS))
+BOARD_MASK = BOTTOM * ((1 << ROWS) - 1)
+COLUMN_MASKS = tuple(((1 << ROWS) - 1) << (col * H1) for col in range(COLS))
+
+# Center-first: forcing lines through the middle are found sooner
+COLUMN_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+DEFAULT_DEPTH = 6
+
+
+def to_bitboards(board, player):
+    """
+    Args:
+        board: 6 rows top to bottom, 0 = empty, 1 / 2 = players
+        player: Our piece value
+
+    Returns:
+        (ours, theirs, mask) bitboards
+    """
+    ours = theirs = 0
+    for r in range(ROWS):
+        for c in range(COLS):
+            if board[r][c]:
+                bit = 1 << (c * H1 + ROWS - 1 - r)
+                if board[r][c] == player:
+                    ours |= bit
+                else:
+                    theirs |= bit
+    return ours, theirs, ours | theirs
+
+
+def winning_squares(pos, mask):
+    """Empty squares that would complete four in a row for `pos`, playable or not"""
+    # Vertical
+    r = (pos << 1) & (pos << 2) & (pos << 3)
+    # Horizontal and both diagonals: a square completes a line with three
+    # stones on one side, or two on one side and one on the other
+    for shift in (H1, ROWS, ROWS + 2):
+        p = (pos << shift) & (pos << 2 * shift)
+        r |= p & (pos << 3 * shift)
+        r |= p & (pos >> shift)
+        p = (pos >> shift) & (pos >> 2 * shift)
+        r |= p & (pos << shift)
+        r |= p & (pos >> 3 * shift)
+    return r & (BOARD_MASK ^ mask)
+
+
+def playable(mask):
+    """Lowest empty square of every column that is not full"""
+    return (mask + BOTTOM) & BOARD_MASK
+
+
+def column_of(bit):
+    return (bit.bit_length() - 1) // H1
+
+
+def _moves(candidates):
+    for col in COLUMN_ORDER:
+        bit = candidates & COLUMN_MASKS[col]
+        if bit:
+            yield bit
+
+
+def _forced_win(me, opp, mask, depth, stats):
+    """
+    Search forcing sequences for the side to move
+
+    Every move we try must threaten to win at once, so the reply is forced;
+    two threats the opponent cannot both stop (side by side or stacked)
+    end the line.
+
+    Returns:
+        The first move of a forced win as a bit, or 0
+    """
+    stats['nodes'] += 1
+    play = playable(mask)
+    wins = winning_squares(me, mask) & play
+    if wins:
+        return wins & -wins
+    their_wins = winning_squares(opp, mask)
+    their_now = their_wins & play
+    if their_now & (their_now - 1) or depth == 0:
+        return 0
+
+    # With a threat against us pending, blocking it is the only move
+    for move in _moves(their_now or play):
+        # Never fill the square under one of their winning squares
+        if (move << 1) & their_wins:
+            continue
+        new_me, new_mask = me | move, mask | move
+        ours = winning_squares(new_me, new_mask)
+        threats = ours & playable(new_mask)
+        if not threats:
+            continue
+        if threats & (threats - 1) or (threats << 1) & ours:
+            return move
+        # Single threat: their reply is forced, and must not win for them
+        if threats & winning_squares(opp, new_mask):
+            continue
+        if _forced_win(new_me, opp | threats, new_mask | threats, depth - 1, stats):
+            return move
+    return 0
+
+
+def analyze_threats(board, player, depth=DEFAULT_DEPTH):
+    """
+    Threat picture for the side to move
+
+    Args:
+        board: 6x7 rows top to bottom, 0 = empty
+        player: The side to move (1 or 2)
+        depth: Forcing moves searched per side
+
+    Returns:
+        dict with
+            win         column that wins now, or None
+            block       column of their immediate win we must block, or None
+            forced_win  first column of a forced win within depth, or None
+            safe        columns after which they have no forced win within depth
+                        (empty when every move loses; then any move is as good)
+            ours, theirs  winnable-square bitmasks of both sides
+            nodes, ms   search effort
+    """
+    start = time.time()
+    stats = {'nodes': 0}
+    me, opp, mask = to_bitboards(board, player)
+    play = playable(mask)
+    ours, theirs = winning_squares(me, mask), winning_squares(opp, mask)
+    result = {'win': None, 'block': None, 'forced_win': None, 'safe': [], 'ours': ours, 'theirs': theirs}
+
+    if ours & play:
+        result['win'] = column_of(ours & play & -(ours & play))
+    elif theirs & play:
+        result['block'] = column_of(theirs & play & -(theirs & play))
+    else:
+        move = _forced_win(me, opp, mask, depth, stats)
+        if move:
+            result['forced_win'] = column_of(move)
+
+    if result['win'] is None:
+        for move in _moves(play):
+            if not _forced_win(opp, me | move, mask | move, depth, stats):
+                result['safe'].append(column_of(move))
+
+    result['nodes'] = stats['nodes']
+    result['ms'] = (time.time() - start) * 1000
+    return result
@@ -0,0 +1,357 @@
+"""
+Combined Game State Probe
+Collects popup, game-over, turn and board signals in one or two script calls
+"""
+
+import re
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Words that mark a finished game in the result overlay, per game type
+RESULT_WORDS = {
+    'connect4': ['won', 'defeat', 'draw', 'winner'],
+    'checkers': ['won', 'lost', 'defeat', 'victory', 'draw', 'winner'],
+    'tictactoe': ['victory', 'defeat', 'draw'],
+}
+
+# Result headings a game shows instead of (or as well as) the fixed overlay;
+# tic-tac-toe puts "Victory" / "Defeat" / "Draw" in an h1/h2 inside its iframe
+RESULT_HEADINGS = {
+    'tictactoe': ("//h1[contains(text(), 'Victory') or contains(text(), 'Defeat') or contains(text(), 'Draw')] | "
+                  "//h2[contains(text(), 'Victory') or contains(text(), 'Defeat') or contains(text(), 'Draw')]"),
+}
+
+# Shared JS helpers: visibility check and top-document signals
+_JS_COMMON = r"""
+function visible(el) {
+    if (!el || !el.getClientRects().length) return false;
+    const view = el.ownerDocument.defaultView;
+    const s = view.getComputedStyle(el);
+    return s.visibility !== 'hidden' && s.display !== 'none' && s.opacity !== '0';
+}
+
+function xpathAll(doc, expr) {
+    const snap = doc.evaluate(expr, doc, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+}
+
+function resultText(doc, words, headings) {
+    // Whole words only: a fixed wallet bar saying "Withdraw" is not a draw
+    const pattern = new RegExp('\\b(' + words.join('|') + ')\\b', 'i');
+    // The fixed-position result modal; arbitrary page headings can mention "winner" mid-game
+    for (const el of doc.querySelectorAll("[style*='position: fixed']")) {
+        if (!visible(el)) continue;
+        const text = (el.innerText || '').toLowerCase();
+        if (pattern.test(text)) return text.slice(0, 120);
+    }
+    // Plus the game's own result headings, where it has them
+    if (headings) {
+        const shown = xpathAll(doc, headings).filter(visible);
+        if (shown.length) return shown.map(el => el.innerText).join(' ').toLowerCase().slice(0, 120);
+    }
+    return null;
+}
+
+function topSignals(doc, iframeCss, words, headings) {
+    const closeSelectors = [
+        "button.absolute.top-3.right-3",
+        "button[aria-label='Close']",
+        "button[aria-label='close']",
+        "button.close",
+    ];
+    let popup = false;
+    for (const sel of closeSelectors) {
+        for (const btn of doc.querySelectorAll(sel)) {
+            if (visible(btn) && !btn.disabled) { popup = true; break; }
+        }
+        if (popup) break;
+    }
+    if (!popup) {
+        for (const svg of doc.querySelectorAll("svg[viewBox='0 0 512 512']")) {
+            const btn = svg.closest('button');
+            if (btn && visible(btn) && !btn.disabled) { popup = true; break; }
+        }
+    }
+    return {
+        popup_present: popup,
+        iframe_present: !!doc.querySelector(iframeCss),
+        result_text: resultText(doc, words, headings),
+    };
+}
+"""
+
+# Per-game board / turn readers, evaluated against the game iframe document
+_JS_READERS = r"""
+const READERS = {
+    connect4: function (doc) {
+        const board = [];
+        const rows = doc.querySelectorAll('table tbody tr');
+        for (let r = 0; r < 6; r++) {
+            const row = [0, 0, 0, 0, 0, 0, 0];
+            if (rows[r]) {
+                rows[r].querySelectorAll('td.board-cell').forEach((cell, c) => {
+                    if (c >= 7) return;
+                    if (cell.querySelector("img[src*='yellow']")) row[c] = 2;
+                    else if (cell.querySelector("img[src*='red']")) row[c] = 1;
+                });
+            }
+            board.push(row);
+        }
+        const timer = doc.querySelector('.turn-timer-bottom');
+        return {board: board, my_turn: !!(timer && visible(timer))};
+    },
+
+    checkers: function (doc) {
+        let grid = null;
+        for (const sel of ['div.grid.grid-cols-8', "div[class*='grid-cols-8']", "div[class*='board-responsive']"]) {
+            grid = doc.querySelector(sel);
+            if (grid) break;
+        }
+        if (!grid) return {board: null, my_turn: false};
+        let squares = [];
+        for (const sel of ["div[class*='aspect-square']", 'div.w-full.aspect-square', ':scope > div']) {
+            squares = grid.querySelectorAll(sel);
+            if (squares.length === 64) break;
+        }
+        const cells = [];
+        for (let i = 0; i < Math.min(64, squares.length); i++) {
+            let piece = null;
+            for (const img of squares[i].querySelectorAll('img')) {
+                if (!visible(img)) continue;
+                const alt = (img.getAttribute('alt') || '').toLowerCase();
+                const src = (img.getAttribute('src') || '').toLowerCase();
+                const isKing = alt.includes('king') || alt.includes('crown') || src.includes('king') ||
+                               alt.includes('double') || src.includes('crowned');
+                let type = null;
+                if (src.includes('w-rteaz-qe') || src.includes('/w-') || alt.includes('player1')) type = 'A';
+                else if (src.includes('b-4dvpsqw3') || src.includes('/b-') || alt.includes('player2')) type = 'B';
+                if (type) { piece = [type, isKing]; break; }
+            }
+            cells.push(piece);
+        }
+
+        let myTurn = xpathAll(doc, "//*[contains(text(), 'Your Turn') or contains(text(), 'your turn')]").some(visible);
+        if (!myTurn) {
+            const height = doc.defaultView.innerHeight;
+            for (const timer of doc.querySelectorAll("span[class*='text-green-100']")) {
+                if (visible(timer) && timer.getBoundingClientRect().top + doc.defaultView.scrollY > height * 0.4) {
+                    myTurn = true;
+                    break;
+                }
+            }
+        }
+        if (!myTurn) {
+            for (const sq of Array.from(squares).slice(0, 24)) {
+                const cls = sq.getAttribute('class') || '';
+                const style = sq.getAttribute('style') || '';
+                if (cls.includes('cursor-pointer') || style.includes('cursor: pointer') ||
+                    cls.includes('highlight') || cls.includes('select')) { myTurn = true; break; }
+            }
+        }
+        return {board: cells, square_count: squares.length, my_turn: myTurn};
+    },
+
+    tictactoe: function (doc) {
+        let cells = doc.querySelectorAll('div.cell');
+        if (cells.length !== 9) cells = doc.querySelectorAll("div[class*='aspect-square'], div[class*='cell']");
+        if (!cells.length) return {board: null, my_turn: null};
+        const board = [[null, null, null], [null, null, null], [null, null, null]];
+        for (let i = 0; i < Math.min(9, cells.length); i++) {
+            const cell = cells[i];
+            const r = Math.floor(i / 3), c = i % 3;
+            const dataValue = parseInt(cell.getAttribute('data-value'), 10);
+            if (!isNaN(dataValue)) {
+                board[r][c] = dataValue === 1 ? 'X' : dataValue === 2 ? 'O' : null;
+                continue;
+            }
+            for (const img of cell.querySelectorAll('img')) {
+                const alt = (img.getAttribute('alt') || '').toUpperCase();
+                const src = img.getAttribute('src') || '';
+                if (alt === 'X' || src.includes('W-rTeAz-qe.png')) { board[r][c] = 'X'; break; }
+                if (alt === 'O' || src.includes('B-4DvpsQW3.png')) { board[r][c] = 'O'; break; }
+            }
+            if (board[r][c] === null && (cell.getAttribute('class') || '').includes('disabled')) {
+                const html = cell.innerHTML;
+                if (html.includes('W-rTeAz-qe.png') || html.includes('alt="X"')) board[r][c] = 'X';
+                else if (html.includes('B-4DvpsQW3.png') || html.includes('alt="O"')) board[r][c] = 'O';
+            }
+        }
+
+        // Same precedence as TicTacToeBot.is_my_turn; null means undecided
+        let myTurn = null;
+        if (Array.from(doc.querySelectorAll('div.my-turn')).some(
+                d => visible(d) && (d.innerText || '').toUpperCase().includes('YOUR TURN'))) myTurn = true;
+        else if (Array.from(doc.querySelectorAll('div.opponent-turn')).some(visible)) myTurn = false;
+        else {
+            for (const b of doc.querySelectorAll('div.board')) {
+                const cls = b.getAttribute('class') || '';
+                if (cls.includes('my-turn-board')) { myTurn = true; break; }
+                if (cls.includes('opponent-turn-board')) { myTurn = false; break; }
+            }
+        }
+        if (myTurn === null) {
+            if (xpathAll(doc, "//*[contains(text(), 'Your Turn')]").some(visible)) myTurn = true;
+            else if (xpathAll(doc, "//*[contains(text(), 'Opponent')]").some(visible)) myTurn = false;
+        }
+        return {board: board, my_turn: myTurn};
+    },
+};
+"""
+
+# Runs inside the game iframe: reads the board and, when the parent document
+# is reachable (same origin / web security disabled), the top-level signals too
+FRAME_PROBE_JS = _JS_COMMON + _JS_READERS + r"""
+const gameType = arguments[0], iframeCss = arguments[1], words = arguments[2], headings = arguments[3];
+const out = READERS[gameType](document);
+out.frame_result_text = resultText(document, words, headings);
+out.top = null;
+try {
+    if (window.top !== window && window.top.document) {
+        out.top = topSignals(window.top.document, iframeCss, words, headings);
+    }
+} catch (e) {}
+return out;
+"""
+
+# Runs in the top-level document when the frame cannot see its parent
+TOP_PROBE_JS = _JS_COMMON + r"""
+return topSignals(document, arguments[0], arguments[1], arguments[2]);
+"""
+
+
+def classify_result(text):
+    """Map a result overlay text to 'victory', 'defeat', 'draw' or 'unknown'"""
+    if not text:
+        return None
+    words = set(re.findall(r'[a-z]+', text.lower()))
+    if 'draw' in words:
+        return 'draw'
+    if words & {'defeat', 'lost'}:
+        return 'defeat'
+    if words & {'victory', 'won', 'winner'}:
+        return 'victory'
+    return 'unknown'
+
+
+def checkers_board_from_cells(cells):
+    """
+    Convert probed checkers squares into the bot's board format
+
+    Args:
+        cells: List of up to 64 entries, each None or [piece_type, is_king]
+
+    Returns:
+        8x8 board of {'player': 'player1'/'player2', 'isKing': bool}; all empty
+        when fewer than 64 cells were read
+    """
+    board = [[None for _ in range(8)] for _ in range(8)]
+    if not cells or len(cells) < 64:
+        return board
+
+    for idx, cell in enumerate(cells[:64]):
+        if cell:
+            board[idx // 8][idx % 8] = {'type': cell[0], 'isKing': bool(cell[1])}
+
+    # Whichever piece type dominates the bottom three rows is player1
+    bottom_a = sum(1 for r in [5, 6, 7] for c in range(8)
+                   if board[r][c] and board[r][c]['type'] == 'A')
+    bottom_b = sum(1 for r in [5, 6, 7] for c in range(8)
+                   if board[r][c] and board[r][c]['type'] == 'B')
+    type_to_player = ({'A': 'player1', 'B': 'player2'} if bottom_a > bottom_b
+                      else {'B': 'player1', 'A': 'player2'})
+
+    for r in range(8):
+        for c in range(8):
+            if board[r][c]:
+                board[r][c] = {'player': type_to_player[board[r][c]['type']],
+                               'isKing': board[r][c]['isKing']}
+    return board
+
+
+class GameState:
+    """Snapshot of everything the game loop needs for one tick"""
+
+    def __init__(self, popup_present=False, game_over=False, result=None, my_turn=False,
+                 board=None, frame_ok=True, script_calls=0):
+        self.popup_present = popup_present
+        self.game_over = game_over
+        self.result = result
+        self.my_turn = my_turn
+        self.board = board
+        self.frame_ok = frame_ok
+        self.script_calls = script_calls
+
+    def __repr__(self):
+        return (f"GameState(popup={self.popup_present}, over={self.game_over}, result={self.result}, "
+                f"my_turn={self.my_turn}, frame_ok={self.frame_ok}, calls={self.script_calls})")
+
+
+class GameProbe:
+    """
+    Reads the whole per-tick game state with a fixed number of WebDriver calls.
+
+    The driver is expected to be inside the game iframe (as left by
+    switch_to_game_iframe) and is left there again after every probe.
+    Fast path is a single execute_script; when the parent document is not
+    reachable from the frame it costs default_content + one top-level script
+    + switching back into the frame.
+    """
+
+    def __init__(self, driver, game_type, iframe_css):
+        if game_type not in RESULT_WORDS:
+            raise ValueError(f"Unknown game type: {game_type}")
+        self.driver = driver
+        self.game_type = game_type
+        self.iframe_css = iframe_css
+        self.words = RESULT_WORDS[game_type]
+        self.headings = RESULT_HEADINGS.get(game_type)
+
+    def probe(self, game_iframe):
+        """Collect popup, game-over, turn and board signals for one loop tick"""
+        calls = 1
+        frame = None
+        try:
+            frame = self.driver.execute_script(FRAME_PROBE_JS, self.game_type, self.iframe_css, self.words,
+                                                self.headings)
+        except WebDriverException as e:
+            logger.debug(f"Frame probe failed: {e}")
+
+        top = frame.get('top') if frame else None
+        if top is None:
+            calls += 2
+            try:
+                self.driver.switch_to.default_content()
+                top = self.driver.execute_script(TOP_PROBE_JS, self.iframe_css, self.words, self.headings)
+            except WebDriverException as e:
+                logger.debug(f"Top-level probe failed: {e}")
+                return GameState(frame_ok=False, script_calls=calls)
+
+            if top.get('iframe_present') and game_iframe is not None:
+                calls += 1
+                try:
+                    self.driver.switch_to.frame(game_iframe)
+                except WebDriverException:
+                    return GameState(popup_present=top.get('popup_present', False),
+                                     frame_ok=False, script_calls=calls)
+
+        result_text = top.get('result_text') or (frame or {}).get('frame_result_text')
+        game_over = bool(result_text) or not top.get('iframe_present', True)
+
+        board = frame.get('board') if frame else None
+        if self.game_type == 'checkers' and frame:
+            board = checkers_board_from_cells(board)
+
+        return GameState(
+            popup_present=bool(top.get('popup_present')),
+            game_over=game_over,
+            result=classify_result(result_text),
+            my_turn=frame.get('my_turn') if frame else False,
+            board=board,
+            frame_ok=frame is not None,
+            script_calls=calls,
+        )
@@ -0,0 +1,291 @@
+"""
+Game Record Store
+Appends one structured record per played game to a local SQLite file:
+account, game type, our side, every move we made with the board it was
+chosen from, the engine's depth / nodes / time, the result and how long
+each phase of the game took
+
+Usage:
+    python game_records.py                              # results per game type and account
+    python game_records.py --game connect4 --since 2025-01-01
+    python game_records.py --export games.jsonl         # full records as JSON lines
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+import logging
+
+from metrics_server import METRICS
+from virtual_clock import CLOCK
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECORD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'game_records.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game_id TEXT,
+    account TEXT NOT NULL,
+    game_type TEXT NOT NULL,
+    side TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    result TEXT NOT NULL,
+    move_count INTEGER NOT NULL,
+    moves TEXT NOT NULL,
+    phases TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_account ON games (account, started_at);
+CREATE INDEX IF NOT EXISTS games_started ON games (started_at);
+CREATE INDEX IF NOT EXISTS games_result ON games (result, game_type);
+"""
+
+
+def encode_board(board):
+    """
+    Compact text form of a board, rows separated by '/'
+
+    Empty cells are '.', checkers pieces a/b (A/B for kings), anything else
+    its first character (connect4 1/2, tic-tac-toe X/O).
+    """
+    rows = []
+    for row in board or []:
+        cells = []
+        for cell in row:
+            if not cell:
+                cells.append('.')
+            elif isinstance(cell, dict):
+                piece = 'a' if cell.get('player') == 'player1' else 'b'
+                cells.append(piece.upper() if cell.get('isKing') else piece)
+            else:
+                cells.append(str(cell)[0])
+        rows.append(''.join(cells))
+    return '/'.join(rows)
+
+
+def board_hash(encoded):
+    return hashlib.blake2b(encoded.encode(), digest_size=8).hexdigest()
+
+
+class GameRecordStore:
+    """
+    Append-only SQLite store shared by every session in the process.
+
+    WAL mode lets separate bot processes append to the same file; writes
+    are serialized per process with a lock.
+    """
+
+    def __init__(self, path=DEFAULT_RECORD_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def append(self, record):
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO games (game_id, account, game_type, side, started_at, finished_at, result, "
+                    "move_count, moves, phases) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (record['game_id'], record['account'], record['game_type'], record['side'],
+                     record['started_at'], record['finished_at'], record['result'], len(record['moves']),
+                     json.dumps(record['moves'], separators=(',', ':')),
+                     json.dumps(record['phases'], separators=(',', ':')))
+                )
+
+    def query(self, game_type=None, account=None, since=None):
+        """Full records, oldest first"""
+        clauses, params = [], []
+        for column, value in (('game_type', game_type), ('account', account)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT game_id, account, game_type, side, started_at, finished_at, result, moves, phases "
+                f"FROM games {where} ORDER BY started_at", params
+            ).fetchall()
+        keys = ('game_id', 'account', 'game_type', 'side', 'started_at', 'finished_at', 'result', 'moves', 'phases')
+        records = []
+        for row in rows:
+            record = dict(zip(keys, row))
+            record['moves'] = json.loads(record['moves'])
+            record['phases'] = json.loads(record['phases'])
+            records.append(record)
+        return records
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path=None):
+    """One store per file for the whole process"""
+    path = os.path.abspath(path or DEFAULT_RECORD_FILE)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = GameRecordStore(path)
+        return _stores[path]
+
+
+class GameRecorder:
+    """
+    Builds the record of the game in progress for one session.
+
+    Like MoveTracer every method is cheap when disabled, so the game loops
+    call it unconditionally; game and phase metrics are reported either way.
+    """
+
+    def __init__(self, account_email, game_type, settings=None):
+        settings = settings or {}
+        self.enabled = settings.get('enabled', False)
+        self.record_file = settings.get('file') or DEFAULT_RECORD_FILE
+        self.account_email = account_email
+        self.game_type = game_type
+        self.record = None
+        self.in_game = False
+        self.phases = {}
+        self.last_mark = None
+
+    def begin(self):
+        """A new game attempt starts: phase timings count from here"""
+        self.phases = {}
+        self.last_mark = CLOCK.time()
+
+    def mark(self, phase):
+        """Close a phase, timed from the previous mark"""
+        now = CLOCK.time()
+        if self.last_mark is not None:
+            self.phases[phase] = round(now - self.last_mark, 2)
+            METRICS.phase(self.game_type, phase, now - self.last_mark)
+        self.last_mark = now
+
+    def start_game(self, game_id, side):
+        METRICS.game_started(self.game_type)
+        self.in_game = True
+        self.mark('enter_game')
+        if not self.enabled:
+            return
+        self.record = {
+            'game_id': game_id,
+            'account': self.account_email,
+            'game_type': self.game_type,
+            'side': None if side is None else str(side),
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'moves': [],
+        }
+
+    def move(self, move, board, search=None):
+        """
+        One of our moves
+
+        Args:
+            move: Column, (row, col) or checkers path, stored as JSON
+            board: The board the move was chosen from
+            search: Engine attributes (depth, nodes, score, ms)
+        """
+        if not self.record:
+            return
+        encoded = encode_board(board)
+        search = search or {}
+        self.record['moves'].append({
+            'n': len(self.record['moves']) + 1,
+            'move': move,
+            'board': encoded,
+            'hash': board_hash(encoded),
+            'depth': search.get('depth'),
+            'nodes': search.get('nodes'),
+            'score': search.get('score'),
+            'ms': round(search['ms'], 1) if search.get('ms') is not None else None,
+        })
+
+    def finish(self, result):
+        """Append the record; result is GameState.result ('victory', 'defeat', 'draw', 'unknown')"""
+        if not self.in_game:
+            return
+        self.in_game = False
+        self.mark('play')
+        METRICS.game_finished(self.game_type, result)
+        if not self.record:
+            return
+        record, self.record = self.record, None
+        record['result'] = result or 'unknown'
+        record['finished_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        record['phases'] = dict(self.phases)
+        try:
+            open_store(self.record_file).append(record)
+        except sqlite3.Error as e:
+            logger.warning(f"[{self.account_email}] Could not store game record: {e}")
+
+
+# ============================================================================
+# SUMMARY CLI
+# ============================================================================
+
+def summarize(records):
+    """Results per (game type, account): games, wins, losses, draws, average moves and game length"""
+    groups = {}
+    for record in records:
+        group = groups.setdefault((record['game_type'], record['account']), {
+            'games': 0, 'victory': 0, 'defeat': 0, 'draw': 0, 'unknown': 0, 'moves': 0, 'play_s': 0.0
+        })
+        group['games'] += 1
+        group[record['result'] if record['result'] in group else 'unknown'] += 1
+        group['moves'] += len(record['moves'])
+        group['play_s'] += record['phases'].get('play', 0)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the played-game record store")
+    parser.add_argument('file', nargs='?', default=DEFAULT_RECORD_FILE)
+    parser.add_argument('--game', help='Only this game type (connect4, checkers, tictactoe)')
+    parser.add_argument('--account', help='Only this account')
+    parser.add_argument('--since', help='Only games started on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--export', metavar='FILE', help='Write the matching records as JSON lines')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"No record store at {args.file} - enable settings.game_records and play a game first")
+        return
+
+    store = GameRecordStore(args.file)
+    records = store.query(args.game, args.account, args.since)
+    if args.export:
+        with open(args.export, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+        print(f"Exported {len(records)} games to {args.export}")
+        return
+    if not records:
+        print("No matching games")
+        return
+
+    print(f"\n{'GAME':<10} {'ACCOUNT':<32} {'GAMES':>6} {'WON':>5} {'LOST':>5} {'DRAW':>5} {'?':>4} "
+          f"{'WIN%':>6} {'MOVES':>6} {'AVG PLAY':>9}")
+    for (game_type, account), group in sorted(summarize(records).items()):
+        decided = group['victory'] + group['defeat'] + group['draw']
+        win_rate = f"{group['victory'] / decided * 100:5.1f}%" if decided else "     -"
+        print(f"{game_type:<10} {account:<32} {group['games']:>6} {group['victory']:>5} {group['defeat']:>5} "
+              f"{group['draw']:>5} {group['unknown']:>4} {win_rate:>6} {group['moves'] / group['games']:>6.1f} "
+              f"{group['play_s'] / group['games']:>8.0f}s")
+
+
+if __name__ == "__main__":
+    main()
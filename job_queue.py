@@ -0,0 +1,119 @@
+"""
+Game Job Queue
+Priority queue of single-game jobs shared by idle workers, with per-job
+retries and backoff and one game at a time per account
+"""
+
+import heapq
+import itertools
+import threading
+import logging
+
+from virtual_clock import CLOCK
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Jobs are ordered by (-priority, order) and only handed out once their
+    not-before time has passed and their account is free.
+
+    A job that ends without a succeeded game (no opponent, create/login
+    failure, crash) goes back in with exponential backoff until max_retries
+    is used up; the worker that ran it picks up other work in the meantime.
+    When a game finishes, that account's next job is due `cooldown` seconds
+    later instead of a thread sleeping through the gap.
+    """
+
+    def __init__(self, jobs=(), cooldown=10, max_retries=2, retry_backoff=60, max_backoff=900):
+        self.cooldown = cooldown
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.cond = threading.Condition()
+        self.heap = []
+        self.seq = itertools.count()
+        self.busy = set()
+        self.free_at = {}
+        self.stopping = False
+        self.retries = 0
+        for job in jobs:
+            self.push(job)
+
+    def push(self, job, not_before=0):
+        job.setdefault('attempt', 1)
+        with self.cond:
+            heapq.heappush(self.heap, (-job.get('priority', 0), job.get('order', ()), next(self.seq),
+                                       not_before, job))
+            self.cond.notify_all()
+
+    def get(self):
+        """
+        Block until a job is runnable
+
+        Returns:
+            The job (its account is now busy), or None once the queue is empty or stopped
+        """
+        with self.cond:
+            while not self.stopping:
+                if not self.heap and not self.busy:
+                    return None
+                now = CLOCK.time()
+                wake = None
+                skipped = []
+                job = None
+                while self.heap:
+                    entry = heapq.heappop(self.heap)
+                    email = entry[4]['account']['email']
+                    ready = max(entry[3], self.free_at.get(email, 0))
+                    if email not in self.busy and ready <= now:
+                        job = entry[4]
+                        break
+                    skipped.append(entry)
+                    if email not in self.busy:
+                        wake = ready if wake is None else min(wake, ready)
+                for entry in skipped:
+                    heapq.heappush(self.heap, entry)
+                if job:
+                    self.busy.add(job['account']['email'])
+                    return job
+                # Nothing runnable: wait for a not-before time or a finishing job
+                self.cond.wait(timeout=CLOCK.real_seconds(wake - now) if wake else None)
+            return None
+
+    def done(self, job, succeeded):
+        """
+        Release the job's account and requeue it on failure
+
+        Returns:
+            True if the job was requeued for another attempt
+        """
+        email = job['account']['email']
+        retry = not succeeded and job['attempt'] <= self.max_retries and not self.stopping
+        with self.cond:
+            self.busy.discard(email)
+            self.free_at[email] = CLOCK.time() + self.cooldown
+            if retry:
+                delay = min(self.max_backoff, self.retry_backoff * 2 ** (job['attempt'] - 1))
+                job['attempt'] += 1
+                self.retries += 1
+                heapq.heappush(self.heap, (-job.get('priority', 0), job.get('order', ()), next(self.seq),
+                                           CLOCK.time() + delay, job))
+                logger.info(f"Retrying {job['id']} in {delay:.0f}s (attempt {job['attempt']}/{self.max_retries + 1})")
+            self.cond.notify_all()
+        return retry
+
+    def stop(self):
+        """Hand out no more jobs; running ones finish"""
+        with self.cond:
+            self.stopping = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        with self.cond:
+            return len(self.heap)
+
+    def running(self):
+        with self.cond:
+            return sorted(self.busy)
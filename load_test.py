@@ -0,0 +1,349 @@
+"""
+Concurrency Load Test
+Ramps N synthetic accounts against the offline mock platform and samples RSS,
+CPU, engine latency, WebDriver latency and missed turns at every level, then
+recommends a max_parallel_accounts value for this host
+
+Usage:
+    python load_test.py                                   # connect4, levels 1,2,4,6,8
+    python load_test.py --game checkers --levels 1,2,3,4 --games 2
+    python load_test.py --game tictactoe --max-level 12 --json curve.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import importlib.util
+import concurrent.futures
+import logging
+
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from mock_platform import MockPlatform
+from browser_contexts import process_tree_rss_mb
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# game -> (runner script, bot class or None for a module-level engine, engine function)
+RUNNERS = {
+    'connect4': ('multiple-connect4.py', 'Connect4HostBot', 'calculate_best_move'),
+    'connect4-joiner': ('connect4-oppenent/connect4-bot.py', 'Connect4Bot', 'calculate_best_move'),
+    'checkers': ('multiple-checkers.py', 'CheckersUltraExpertBot', 'calculate_best_move_ultra_expert'),
+    'tictactoe': ('multiple-tictactoe.py', None, 'table_move'),
+}
+
+DEFAULT_LEVELS = [1, 2, 4, 6, 8]
+
+
+def load_runner(game):
+    """Import a runner script by path (their file names are not valid module names)"""
+    script = RUNNERS[game][0]
+    spec = importlib.util.spec_from_file_location(f"runner_{game.replace('-', '_')}",
+                                                  os.path.join(BASE_DIR, script))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile, None for an empty list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+class LatencyProbe:
+    """
+    Times every engine call and every WebDriver command while installed.
+
+    Wraps the runner's engine function and RemoteWebDriver.execute in place;
+    uninstall() puts the originals back.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.engine = []
+        self.webdriver = []
+        self._restore = []
+
+    def _timed(self, func, bucket):
+        probe = self
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with probe.lock:
+                    bucket.append(time.perf_counter() - start)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _patch(self, owner, name, bucket):
+        original = getattr(owner, name)
+        setattr(owner, name, self._timed(original, bucket))
+        self._restore.append((owner, name, original))
+
+    def install(self, module, game):
+        _, class_name, engine = RUNNERS[game]
+        self._patch(getattr(module, class_name) if class_name else module, engine, self.engine)
+        self._patch(RemoteWebDriver, 'execute', self.webdriver)
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._restore):
+            setattr(owner, name, original)
+        self._restore = []
+
+    def drain(self):
+        """Return and clear what was recorded since the last drain"""
+        with self.lock:
+            engine, webdriver = list(self.engine), list(self.webdriver)
+            # Clear in place, the wrappers hold references to these lists
+            del self.engine[:]
+            del self.webdriver[:]
+        return engine, webdriver
+
+
+def _cpu_times():
+    """(busy, total) jiffies across all CPUs from /proc/stat"""
+    with open('/proc/stat') as f:
+        fields = [int(v) for v in f.readline().split()[1:]]
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    return sum(fields) - idle, sum(fields)
+
+
+def available_memory_mb():
+    with open('/proc/meminfo') as f:
+        for line in f:
+            if line.startswith('MemAvailable:'):
+                return int(line.split()[1]) / 1024
+    return 0
+
+
+class ResourceSampler(threading.Thread):
+    """Samples RSS of this process tree (Python + chromedrivers + Chrome) and host CPU"""
+
+    def __init__(self, interval=1.0):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.rss = []
+        self.cpu = []
+        self.stop_event = threading.Event()
+
+    def run(self):
+        busy, total = _cpu_times()
+        while not self.stop_event.wait(self.interval):
+            self.rss.append(process_tree_rss_mb([os.getpid()]))
+            new_busy, new_total = _cpu_times()
+            if new_total > total:
+                self.cpu.append((new_busy - busy) / (new_total - total) * 100)
+            busy, total = new_busy, new_total
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+# ============================================================================
+# RAMP
+# ============================================================================
+
+def run_level(module, accounts, platform, probe, args, baseline_rss):
+    """
+    Run `accounts` concurrent sessions to completion
+
+    Returns:
+        Dict of metrics for this concurrency level
+    """
+    settings = {
+        'headless': not args.headed,
+        'dashboard_url': platform.dashboard_url,
+        'login_url': platform.login_url,
+        'opponent_wait_timeout': args.opponent_timeout,
+        'wait_between_games': 1,
+        'max_parallel_accounts': accounts,
+    }
+    synthetic = [{
+        'email': f"loadtest-{i}@mock.local",
+        'password': 'loadtest',
+        'games_per_run': args.games,
+        'bet_increase_clicks': 0,
+        '_start_delay': i * args.stagger,
+    } for i in range(accounts)]
+
+    probe.drain()
+    games_before = len(platform.stats()['games'])
+    sampler = ResourceSampler(args.sample_interval)
+    sampler.start()
+    started = time.time()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=accounts) as executor:
+            sessions = list(executor.map(lambda account: module.run_bot_session(account, settings), synthetic))
+    finally:
+        sampler.stop()
+    wall = time.time() - started
+
+    engine, webdriver = probe.drain()
+    games = platform.stats()['games'][games_before:]
+    bot_moves = sum(g.get('bot_moves', 0) for g in games)
+    missed = sum(g.get('missed_turns', 0) for g in games)
+    turn_latencies = [ms / 1000 for g in games for ms in g.get('latencies_ms', [])]
+    peak_rss = max(sampler.rss, default=baseline_rss)
+
+    return {
+        'accounts': accounts,
+        'wall_s': round(wall, 1),
+        'sessions_ok': sum(1 for s in sessions if s and s.get('success')),
+        'games_finished': len(games),
+        'games_expected': accounts * args.games,
+        'rss_peak_mb': round(peak_rss),
+        'rss_per_account_mb': round((peak_rss - baseline_rss) / accounts),
+        'cpu_mean_pct': round(sum(sampler.cpu) / len(sampler.cpu), 1) if sampler.cpu else None,
+        'cpu_peak_pct': round(max(sampler.cpu), 1) if sampler.cpu else None,
+        'engine_p50_s': percentile(engine, 50),
+        'engine_p95_s': percentile(engine, 95),
+        'webdriver_p50_ms': percentile([t * 1000 for t in webdriver], 50),
+        'webdriver_p95_ms': percentile([t * 1000 for t in webdriver], 95),
+        'webdriver_commands': len(webdriver),
+        'turn_p95_s': percentile(turn_latencies, 95),
+        'bot_moves': bot_moves,
+        'missed_turns': missed,
+    }
+
+
+def level_problems(level, baseline, args):
+    """Reasons this level is not sustainable, empty if it is"""
+    problems = []
+    if level['games_finished'] < level['games_expected']:
+        problems.append(f"{level['games_expected'] - level['games_finished']} games did not finish")
+    if level['bot_moves'] and level['missed_turns'] / level['bot_moves'] > args.max_missed_rate:
+        problems.append(f"{level['missed_turns']} missed turns")
+    if level['cpu_peak_pct'] is not None and level['cpu_peak_pct'] > args.cpu_limit:
+        problems.append(f"CPU peak {level['cpu_peak_pct']}%")
+    if baseline and baseline['engine_p95_s'] and level['engine_p95_s'] and \
+            level['engine_p95_s'] > baseline['engine_p95_s'] * args.latency_factor:
+        problems.append(f"engine p95 {level['engine_p95_s']:.2f}s vs {baseline['engine_p95_s']:.2f}s at 1 account")
+    return problems
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else '-'
+
+
+def print_curve(curve):
+    print(f"\n{'ACCTS':>5} {'GAMES':>7} {'RSS':>7} {'RSS/ACC':>8} {'CPU':>6} {'CPU MAX':>8} "
+          f"{'ENGINE P50/P95':>15} {'WD P50/P95':>13} {'TURN P95':>9} {'MISSED':>7}  STATUS")
+    for level in curve:
+        print(f"{level['accounts']:>5} {level['games_finished']:>3}/{level['games_expected']:<3} "
+              f"{level['rss_peak_mb']:>5}MB {level['rss_per_account_mb']:>6}MB "
+              f"{_fmt(level['cpu_mean_pct'], '>5.0f')}% {_fmt(level['cpu_peak_pct'], '>7.0f')}% "
+              f"{_fmt(level['engine_p50_s'], '>6.2f')}/{_fmt(level['engine_p95_s'], '<6.2f')}s "
+              f"{_fmt(level['webdriver_p50_ms'], '>5.0f')}/{_fmt(level['webdriver_p95_ms'], '<5.0f')}ms "
+              f"{_fmt(level['turn_p95_s'], '>8.2f')}s {level['missed_turns']:>7}  "
+              f"{'; '.join(level['problems']) or 'ok'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find how many concurrent sessions this host sustains")
+    parser.add_argument('--game', choices=sorted(RUNNERS), default='connect4')
+    parser.add_argument('--levels', help='Comma-separated account counts (default 1,2,4,6,8)')
+    parser.add_argument('--max-level', type=int, help='Ramp 1..N in steps of 1 instead of --levels')
+    parser.add_argument('--games', type=int, default=1, help='Games per synthetic account per level')
+    parser.add_argument('--stagger', type=float, default=1.0, help='Seconds between account starts')
+    parser.add_argument('--think-time', type=float, default=0.3, help='Mock opponent seconds per move')
+    parser.add_argument('--opponent-delay', type=float, default=1.0, help='Mock seconds until an opponent joins')
+    parser.add_argument('--turn-timeout', type=float, default=10.0, help='Bot turns slower than this are missed')
+    parser.add_argument('--opponent-timeout', type=int, default=120)
+    parser.add_argument('--cpu-limit', type=float, default=85.0, help='Max sustainable CPU peak (%%)')
+    parser.add_argument('--latency-factor', type=float, default=2.0,
+                        help='Max engine p95 slowdown versus a single account')
+    parser.add_argument('--max-missed-rate', type=float, default=0.0, help='Tolerated missed turns per bot move')
+    parser.add_argument('--sample-interval', type=float, default=1.0)
+    parser.add_argument('--keep-going', action='store_true', help='Keep ramping after the first failing level')
+    parser.add_argument('--json', help='Write the curve and recommendation to this file')
+    parser.add_argument('--headed', action='store_true', help='Show browser windows')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not os.path.isdir('/proc'):
+        logger.error("Load test sampling needs /proc (Linux)")
+        sys.exit(1)
+
+    if args.max_level:
+        levels = list(range(1, args.max_level + 1))
+    elif args.levels:
+        levels = sorted({int(v) for v in args.levels.split(',')})
+    else:
+        levels = DEFAULT_LEVELS
+
+    module = load_runner(args.game)
+    platform = MockPlatform(port=0, think_time=args.think_time, opponent_delay=args.opponent_delay,
+                            challenge_delay=args.opponent_delay, turn_timeout=args.turn_timeout).start()
+    probe = LatencyProbe()
+    probe.install(module, args.game)
+
+    baseline_rss = process_tree_rss_mb([os.getpid()])
+    memory_budget = available_memory_mb()
+    logger.info(f"Load test: {args.game}, levels {levels}, {memory_budget:.0f}MB available")
+
+    curve, baseline = [], None
+    try:
+        for accounts in levels:
+            # Don't start a level that would obviously swap
+            if curve and curve[-1]['rss_per_account_mb'] * accounts > memory_budget * 0.9:
+                logger.warning(f"Stopping before {accounts} accounts: projected RSS exceeds available memory")
+                break
+
+            logger.info(f"=== Level: {accounts} concurrent accounts ===")
+            level = run_level(module, accounts, platform, probe, args, baseline_rss)
+            level['problems'] = level_problems(level, baseline, args)
+            curve.append(level)
+            if baseline is None:
+                baseline = level
+            logger.info(f"Level {accounts}: {'; '.join(level['problems']) or 'ok'}")
+            if level['problems'] and not args.keep_going:
+                break
+    except KeyboardInterrupt:
+        logger.info("Interrupted, reporting finished levels")
+    finally:
+        probe.uninstall()
+        platform.stop()
+
+    if not curve:
+        logger.error("No level completed")
+        sys.exit(1)
+
+    print_curve(curve)
+    passing = [level for level in curve if not level['problems']]
+    recommended = max((level['accounts'] for level in passing), default=0)
+    report = {'game': args.game, 'memory_available_mb': round(memory_budget), 'curve': curve,
+              'recommended_max_parallel_accounts': recommended}
+
+    if recommended:
+        per_account = max(level['rss_per_account_mb'] for level in passing)
+        report['recommended_required_mem_mb'] = per_account * recommended + 500
+        print(f"\nRecommended: \"max_parallel_accounts\": {recommended}")
+        print(f"Memory for that run: ~{per_account}MB per account, "
+              f"REQUIRED_MEM={report['recommended_required_mem_mb']} in smart_cron_wrapper.sh")
+    else:
+        print("\nNo concurrency level passed - even a single account misses turns or games on this host")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Curve written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Shared Lobby Scanner
+One browser per host watches the dashboard lobby, parses every open
+challenge in a single script call and publishes them on a ChallengeBoard
+that idle joiner sessions claim from, instead of each account polling
+the lobby with its own XPath walks, strip scrolling and refreshes
+"""
+
+import re
+import threading
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+from wait_utils import wait_for, document_ready
+from virtual_clock import CLOCK
+
+logger = logging.getLogger(__name__)
+
+# Card image alt text -> game type
+GAME_ALTS = {
+    'Connect 4': 'connect4',
+    'Checkers': 'checkers',
+    'Tic Tac Toe': 'tictactoe',
+}
+
+# Lobby strips that hold human challenges ("AI Challenges" is never included)
+LOBBY_SECTIONS = ('Challenges', 'Join Now')
+
+_JS_SCAN = r"""
+const sections = arguments[0];
+const wantKey = arguments[1];
+const out = [];
+const headers = Array.from(document.querySelectorAll('div')).filter(el =>
+    el.children.length === 0 && sections.includes((el.textContent || '').trim()));
+for (const header of headers) {
+    // The card strip follows the header, as a sibling of it or of one of its wrappers
+    let strip = null;
+    for (let node = header, depth = 0; node && !strip && depth < 5; node = node.parentElement, depth++) {
+        for (let sib = node.nextElementSibling; sib && !strip; sib = sib.nextElementSibling) {
+            strip = sib.matches('[class*=overflow-x]') ? sib : sib.querySelector('[class*=overflow-x]');
+        }
+    }
+    if (!strip) continue;
+    const seen = new Set();
+    let index = 0;
+    for (const img of strip.querySelectorAll('img[alt]')) {
+        const card = img.closest('.cursor-pointer, [class*=rounded]') || img.parentElement;
+        if (!strip.contains(card) || seen.has(card)) continue;
+        seen.add(card);
+        // Hidden cards (display:none wrappers, stale templates) are not open challenges
+        if (card.offsetParent === null || getComputedStyle(card).visibility === 'hidden') continue;
+        const text = (card.innerText || '').replace(/\s+/g, ' ').trim();
+        const key = header.textContent.trim() + '|' + img.alt + '|' + text;
+        if (wantKey !== null) {
+            if (key === wantKey) return card;
+            continue;
+        }
+        out.push({section: header.textContent.trim(), alt: img.alt, text: text, index: index++, key: key});
+    }
+}
+return wantKey !== null ? null : out;
+"""
+
+_STAKE = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+
+def scan_lobby(driver, sections=LOBBY_SECTIONS):
+    """
+    Every open challenge on the current dashboard page, in one round trip
+
+    Cards scrolled out of the strip are still in the DOM, so nothing is
+    scrolled; hidden cards are skipped, as the old is_displayed() walks did.
+
+    Returns:
+        List of dicts (key, game, alt, stake, text, section, index); game is None for unknown cards
+    """
+    cards = driver.execute_script(_JS_SCAN, list(sections), None) or []
+    challenges = []
+    for card in cards:
+        stake = _STAKE.search(card['text'])
+        challenges.append({
+            'key': card['key'],
+            'game': GAME_ALTS.get(card['alt']),
+            'alt': card['alt'],
+            'stake': float(stake.group(1).replace(',', '.')) if stake else None,
+            'text': card['text'],
+            'section': card['section'],
+            'index': card['index'],
+        })
+    return challenges
+
+
+def find_challenge_card(driver, challenge, sections=LOBBY_SECTIONS):
+    """The card element for a scanned challenge on this driver's page, or None"""
+    return driver.execute_script(_JS_SCAN, list(sections), challenge['key'])
+
+
+# ============================================================================
+# CHALLENGE BOARD
+# ============================================================================
+
+class ChallengeBoard:
+    """
+    In-process set of open challenges shared by the scanner and the joiners.
+
+    A challenge is handed to one joiner at a time. It stays claimed while it
+    is still listed, and goes back on offer if the joiner releases it
+    without joining or the claim outlives claim_ttl.
+    """
+
+    def __init__(self, claim_ttl=60):
+        self.claim_ttl = claim_ttl
+        self.cond = threading.Condition()
+        self.open = {}
+        self.claims = {}
+        self.healthy = False
+        self.published_at = 0
+        self.claim_latency = []
+
+    def publish(self, challenges):
+        now = CLOCK.time()
+        with self.cond:
+            listed = {c['key'] for c in challenges}
+            for key in list(self.open):
+                if key not in listed:
+                    del self.open[key]
+                    self.claims.pop(key, None)
+            for challenge in challenges:
+                if challenge['game'] and challenge['key'] not in self.open:
+                    self.open[challenge['key']] = dict(challenge, first_seen=now)
+            for key, (_, claimed_at) in list(self.claims.items()):
+                if now - claimed_at > self.claim_ttl:
+                    del self.claims[key]
+            self.healthy = True
+            self.published_at = now
+            self.cond.notify_all()
+
+    def mark_unhealthy(self):
+        with self.cond:
+            self.healthy = False
+            self.cond.notify_all()
+
+    def claim(self, game, claimant, timeout=300):
+        """
+        Block until an unclaimed challenge for this game type is open
+
+        Returns:
+            The challenge dict, or None on timeout or when the scanner stops publishing
+        """
+        deadline = CLOCK.time() + timeout
+        with self.cond:
+            while self.healthy:
+                candidates = [c for key, c in self.open.items()
+                              if c['game'] == game and key not in self.claims]
+                if candidates:
+                    challenge = min(candidates, key=lambda c: c['first_seen'])
+                    self.claims[challenge['key']] = (claimant, CLOCK.time())
+                    self.claim_latency.append(CLOCK.time() - challenge['first_seen'])
+                    return challenge
+                remaining = deadline - CLOCK.time()
+                if remaining <= 0:
+                    return None
+                self.cond.wait(timeout=CLOCK.real_seconds(min(remaining, 5)))
+        return None
+
+    def release(self, challenge, joined):
+        """Joined challenges stay claimed until they leave the lobby, others are offered again"""
+        with self.cond:
+            if not joined:
+                self.claims.pop(challenge['key'], None)
+                self.cond.notify_all()
+
+    def stats(self):
+        with self.cond:
+            latency = sorted(self.claim_latency)
+            return {
+                'open': len(self.open),
+                'claimed': len(self.claims),
+                'claims': len(latency),
+                'claim_latency_p50_s': round(latency[len(latency) // 2], 2) if latency else None,
+            }
+
+
+# ============================================================================
+# SCANNER
+# ============================================================================
+
+class LobbyScanner:
+    """
+    Polls the lobby from one logged-in driver and feeds a ChallengeBoard.
+
+    After max_failures scans in a row fail the board is marked unhealthy,
+    so joiners fall back to watching the lobby themselves.
+    """
+
+    def __init__(self, driver, board, dashboard_url, interval=2.0, refresh_every=30, max_failures=5):
+        self.driver = driver
+        self.board = board
+        self.dashboard_url = dashboard_url
+        self.interval = interval
+        self.refresh_every = refresh_every
+        self.max_failures = max_failures
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.scans = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, name="lobby-scanner", daemon=True)
+        self.thread.start()
+        logger.info(f"Lobby scanner started (every {self.interval}s, refresh every {self.refresh_every}s)")
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=10)
+        self.board.mark_unhealthy()
+        logger.info(f"Lobby scanner stopped after {self.scans} scans: {self.board.stats()}")
+
+    def _loop(self):
+        failures = 0
+        last_refresh = CLOCK.time()
+        while not self.stop_event.is_set():
+            try:
+                if CLOCK.time() - last_refresh >= self.refresh_every:
+                    self.driver.get(self.dashboard_url)
+                    wait_for(self.driver, document_ready(), 10, 'lobby.scanner_refresh')
+                    last_refresh = CLOCK.time()
+                challenges = scan_lobby(self.driver)
+                self.board.publish(challenges)
+                self.scans += 1
+                failures = 0
+            except WebDriverException as e:
+                failures += 1
+                logger.warning(f"Lobby scan failed ({failures}/{self.max_failures}): {e.msg}")
+                if failures >= self.max_failures:
+                    self.board.mark_unhealthy()
+                    return
+            self.stop_event.wait(CLOCK.real_seconds(self.interval))
@@ -0,0 +1,158 @@
+"""
+Non-blocking Log Pipeline
+Game threads only put records on an in-memory queue; one listener thread
+writes them to the log file and stdout. Chatty hot-path messages carry a
+category so they can be sampled, or dropped below a level, before they are
+ever queued
+
+    logger.info(f"Found {n} cells", extra=LOG_READ)
+
+Settings ("logging" in accounts.json):
+    format      "text" (default) or "json" for the log file; stdout stays text
+    sample      {category: N} keep one record in N (WARNING and above always kept)
+    min_level   {category: level} drop the category's records below that level
+"""
+
+import sys
+import json
+import queue
+import atexit
+import threading
+import logging
+import logging.handlers
+
+TEXT_FORMAT = '%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s'
+
+# Hot-path categories: per-read board reader notices, search phase progress, board dumps
+LOG_READ = {'category': 'read'}
+LOG_SEARCH = {'category': 'search'}
+LOG_BOARD = {'category': 'board'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'thread': record.threadName,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        category = getattr(record, 'category', None)
+        if category:
+            entry['cat'] = category
+        return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+class CategoryFilter(logging.Filter):
+    """Sampling and per-category minimum levels, applied before a record is queued"""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.sample = {}
+        self.min_level = {}
+        self.counts = {}
+        self.dropped = {}
+
+    def configure(self, sample=None, min_level=None):
+        with self.lock:
+            self.sample = {cat: max(1, int(n)) for cat, n in (sample or {}).items()}
+            self.min_level = {cat: logging.getLevelName(level.upper()) if isinstance(level, str) else int(level)
+                              for cat, level in (min_level or {}).items()}
+
+    def allows(self, category, level):
+        return level >= self.min_level.get(category, logging.NOTSET)
+
+    def filter(self, record):
+        category = getattr(record, 'category', None)
+        if not category:
+            return True
+        if not self.allows(category, record.levelno):
+            keep = False
+        elif record.levelno >= logging.WARNING:
+            keep = True
+        else:
+            every = self.sample.get(category, 1)
+            with self.lock:
+                count = self.counts[category] = self.counts.get(category, 0) + 1
+            keep = (count - 1) % every == 0
+        if not keep:
+            with self.lock:
+                self.dropped[category] = self.dropped.get(category, 0) + 1
+        return keep
+
+
+class LogPipeline:
+    """The root logger's QueueHandler plus the listener thread draining it"""
+
+    def __init__(self, log_file, level=logging.INFO):
+        self.category_filter = CategoryFilter()
+        self.file_handler = logging.FileHandler(log_file)
+        self.file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+        self.queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        self.queue_handler.addFilter(self.category_filter)
+        self.listener = logging.handlers.QueueListener(
+            self.queue_handler.queue, self.file_handler, stream_handler, respect_handler_level=True
+        )
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.queue_handler)
+        self.listener.start()
+        self.running = True
+        atexit.register(self.stop)
+
+    def configure(self, log_settings):
+        self.category_filter.configure(log_settings.get('sample'), log_settings.get('min_level'))
+        formatter = JsonFormatter() if log_settings.get('format') == 'json' else logging.Formatter(TEXT_FORMAT)
+        self.file_handler.setFormatter(formatter)
+
+    def stop(self):
+        """Flush everything queued so far; idempotent"""
+        if self.running:
+            self.running = False
+            self.listener.stop()
+
+
+_PIPELINE = None
+
+
+def setup_logging(log_file, level=logging.INFO):
+    """
+    Route the root logger through a queue to the file and stdout
+
+    Like logging.basicConfig this does nothing when the root logger already
+    has handlers, so whichever entry point configures logging first wins.
+
+    Returns:
+        The active LogPipeline, or None when logging was configured without one
+    """
+    global _PIPELINE
+    if logging.getLogger().handlers:
+        return _PIPELINE
+    _PIPELINE = LogPipeline(log_file, level)
+    return _PIPELINE
+
+
+def configure_logging(log_settings):
+    """Apply the "logging" settings section; no-op without a pipeline"""
+    if _PIPELINE and log_settings:
+        _PIPELINE.configure(log_settings)
+
+
+def log_enabled(category, level=logging.INFO):
+    """False when the category's records at this level would be dropped, to skip building them"""
+    return _PIPELINE is None or _PIPELINE.category_filter.allows(category['category'], level)
+
+
+def dropped_counts():
+    """Records dropped per category so far"""
+    if _PIPELINE is None:
+        return {}
+    with _PIPELINE.category_filter.lock:
+        return dict(_PIPELINE.category_filter.dropped)
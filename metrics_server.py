@@ -0,0 +1,250 @@
+"""
+Live Metrics Endpoint
+Process-wide counters, gauges and histograms for games, phases, moves and
+the browsers, served in the Prometheus text format from a small local HTTP
+server so a running session can be watched without reading its logs
+
+Settings ("metrics" in accounts.json):
+    enabled     serve the endpoint (default false)
+    host, port  listen address (default 127.0.0.1:9464)
+
+    curl -s localhost:9464/metrics
+"""
+
+import os
+import time
+import bisect
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9464
+
+PHASE_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 900, 1800)
+MOVE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COMMAND_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self, kind='counter'):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {kind}"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Settable value, or a callback sampled at scrape time"""
+
+    def __init__(self, name, help_text, labels=(), callback=None):
+        super().__init__(name, help_text, labels)
+        self.callback = callback
+
+    def set(self, value, *labels):
+        with self.lock:
+            self.values[labels] = value
+
+    def render(self, kind='gauge'):
+        if self.callback:
+            try:
+                self.set(self.callback())
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} callback failed: {e}")
+        return super().render(kind)
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=MOVE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def observe(self, value, *labels):
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.series.items()):
+                cumulative = 0
+                for bound, bucket in zip(self.buckets, counts):
+                    cumulative += bucket
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, [('le', bound)])} "
+                                 f"{cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+def _process_tree_rss_bytes():
+    from browser_contexts import process_tree_rss_mb
+    return int(process_tree_rss_mb([os.getpid()]) * 1024 * 1024) if os.path.isdir('/proc') else 0
+
+
+class GameMetrics:
+    """
+    Everything the bots report, with one method per event.
+
+    The hooks live in the shared helpers (GameRecorder, MoveTracer,
+    CommandMetrics) and in each runner's session loop; all of them are
+    cheap enough to run whether or not the endpoint is being served.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.games_started = Counter('gameon_games_started_total', 'Games entered', ('game',))
+        self.games_finished = Counter('gameon_games_finished_total', 'Games played to the end, by result',
+                                      ('game', 'result'))
+        self.games_failed = Counter('gameon_games_failed_total',
+                                    'Game attempts that failed (no opponent, create failure, error)', ('game',))
+        self.sessions_active = Gauge('gameon_sessions_active', 'Account sessions currently running', ('game',))
+        self.phase_seconds = Histogram('gameon_phase_seconds',
+                                       'Session phase durations (login, create_game, wait_for_opponent, play, ...)',
+                                       ('game', 'phase'), PHASE_BUCKETS)
+        self.move_seconds = Histogram('gameon_move_span_seconds',
+                                      'Per-move span durations (read_board, engine, click, confirm)',
+                                      ('game', 'span'), MOVE_BUCKETS)
+        self.search_nodes = Counter('gameon_search_nodes_total', 'Engine nodes searched', ('game',))
+        self.search_seconds = Counter('gameon_search_seconds_total', 'Engine time spent searching', ('game',))
+        self.search_rate = Gauge('gameon_search_nodes_per_second', 'Nodes per second of the latest search',
+                                 ('game',))
+        self.command_seconds = Histogram('gameon_webdriver_command_seconds',
+                                         'WebDriver round trips (when webdriver_metrics is enabled)',
+                                         ('command',), COMMAND_BUCKETS)
+        self.rss = Gauge('gameon_process_tree_rss_bytes', 'RSS of this process plus its chromedriver/Chrome children',
+                         callback=_process_tree_rss_bytes)
+        self.uptime = Gauge('gameon_uptime_seconds', 'Seconds since the process started',
+                            callback=lambda: round(time.time() - self.started))
+
+    def session_started(self, game):
+        self.sessions_active.inc(game)
+
+    def session_finished(self, game):
+        self.sessions_active.inc(game, amount=-1)
+
+    def game_started(self, game):
+        self.games_started.inc(game)
+
+    def game_finished(self, game, result):
+        self.games_finished.inc(game, result or 'unknown')
+
+    def game_failed(self, game):
+        self.games_failed.inc(game)
+
+    def phase(self, game, phase, seconds):
+        self.phase_seconds.observe(seconds, game, phase)
+
+    def move_span(self, game, span, seconds):
+        self.move_seconds.observe(seconds, game, span)
+
+    def search(self, game, nodes, seconds):
+        self.search_nodes.inc(game, amount=nodes)
+        self.search_seconds.inc(game, amount=seconds)
+        if seconds > 0:
+            self.search_rate.set(round(nodes / seconds), game)
+
+    def webdriver_command(self, command, seconds):
+        self.command_seconds.observe(seconds, command)
+
+    def render(self):
+        lines = []
+        for metric in (self.games_started, self.games_finished, self.games_failed, self.sessions_active,
+                       self.phase_seconds, self.move_seconds, self.search_nodes, self.search_seconds,
+                       self.search_rate, self.command_seconds, self.rss, self.uptime):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = GameMetrics()
+
+
+# ============================================================================
+# HTTP ENDPOINT
+# ============================================================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = METRICS.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(settings):
+    """
+    Serve METRICS if settings.metrics.enabled; once per process
+
+    Returns:
+        The running server, or None when disabled or the port is taken
+    """
+    global _server
+    metrics_settings = settings.get('metrics', {})
+    if not metrics_settings.get('enabled', False):
+        return None
+    with _server_lock:
+        if _server:
+            return _server
+        host = metrics_settings.get('host', '127.0.0.1')
+        port = metrics_settings.get('port', DEFAULT_PORT)
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Metrics endpoint on http://{host}:{port}/metrics")
+        return _server
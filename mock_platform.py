@@ -0,0 +1,867 @@
+"""
+Offline Mock GameOn Platform
+Local HTTP server that mimics the pages the bots drive - login form, dashboard
+game cards, create/join modals, Challenges lobby and the Connect 4 / Checkers /
+Tic Tac Toe game iframes - with the same DOM structure and selectors, plus a
+scripted opponent inside every game
+
+Usage:
+    python mock_platform.py                          # serve on 127.0.0.1:8765
+    python mock_platform.py --port 9000 --popups --opponent-delay 5
+    python mock_platform.py --time-scale 20          # with "clock": {"speedup": 20} in accounts.json
+
+Point a runner at it with these accounts.json settings:
+    "dashboard_url": "http://127.0.0.1:8765/dashboard",
+    "login_url": "http://127.0.0.1:8765/auth/login"
+
+GET /api/stats returns per-game wall-clock, bot move latency and missed-turn
+counts recorded by the game iframes.
+"""
+
+import json
+import time
+import secrets
+import argparse
+import threading
+import logging
+from collections import Counter
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = 'mock_session'
+
+DEFAULT_CONFIG = {
+    'opponent_delay': 2.0,      # seconds from "Play Game" until the opponent joins
+    'challenge_delay': 3.0,     # seconds until a Connect 4 challenge shows up in the lobby
+    'think_time': 0.5,          # scripted opponent delay per move
+    'skill': 0.7,               # chance the opponent plays the tactical move instead of a random one
+    'bot_seat': 1,              # 1 (moves first), 2, or "random" for created games
+    'turn_timeout': 10.0,       # bot turns slower than this count as missed
+    'popups': False,            # show a promo popup on every dashboard load
+    'time_scale': 1.0,          # match the bots' clock speedup: delays shrink, game durations stay simulated
+}
+
+# Delays divided by time_scale before they reach the pages. The turn timeout
+# and bot move latencies stay real: the bots' engines and page waits do not
+# speed up with the clock
+SCALED_DELAYS = ('opponent_delay', 'challenge_delay', 'think_time')
+
+
+# ============================================================================
+# PAGES
+# ============================================================================
+
+BASE_CSS = """
+body { font-family: sans-serif; margin: 0; background: #f4f5f7; }
+button { cursor: pointer; padding: 8px 16px; }
+.relative { position: relative; }
+.absolute { position: absolute; }
+.top-3 { top: 12px; }
+.right-3 { right: 12px; }
+"""
+
+LOGIN_HTML = """<!doctype html>
+<html><head><title>GameOn - Sign in</title><style>__CSS__
+.login-form { width: 320px; margin: 120px auto; display: flex; flex-direction: column; gap: 12px; }
+.error { color: #c00; }
+</style></head>
+<body>
+<form class="login-form" method="post" action="/auth/login">
+  <h3>Sign in to GameOn</h3>
+  __ERROR__
+  <input type="email" name="email" placeholder="Email" required>
+  <input type="password" name="password" placeholder="Password" required>
+  <button type="submit">Login</button>
+</form>
+</body></html>
+"""
+
+DASHBOARD_HTML = """<!doctype html>
+<html><head><title>GameOn - Dashboard</title><style>__CSS__
+.games { display: flex; gap: 16px; padding: 16px; }
+.game-card { width: 180px; background: #fff; border-radius: 8px; padding: 8px; cursor: pointer; }
+.game-card img { width: 164px; height: 100px; }
+.lobby-section { padding: 8px 16px; }
+.overflow-x-auto { display: flex; gap: 8px; min-height: 60px; }
+.challenge { background: #fff; padding: 6px; border-radius: 6px; }
+.challenge img { width: 60px; height: 40px; }
+.modal-panel { width: 360px; margin: 120px auto; background: #fff; padding: 24px; border-radius: 8px; }
+#game-area iframe { border: 0; width: 820px; height: 760px; }
+</style></head>
+<body>
+<div class="topbar"><b>GameOn</b> <span id="user"></span></div>
+
+<div class="games" id="games">
+  <div data-card="true" class="game-card" data-game="connect4">
+    <img alt="Connect 4" src="/static/c1.jpg"><h4>Connect 4</h4>
+  </div>
+  <div data-card="true" class="game-card" data-game="checkers">
+    <img alt="Checkers" src="/static/checkers.jpg"><h4>Checkers</h4>
+  </div>
+  <div data-card="true" class="game-card" data-game="tictactoe">
+    <img alt="Tic Tac Toe" src="/static/tictactoe.jpg"><h4>Tic Tac Toe</h4>
+  </div>
+</div>
+
+<div class="lobby-block"><div class="lobby-inner"><div class="lobby-section">
+  <div class="font-semibold text-gray-800">AI Challenges</div>
+  <div class="overflow-x-auto">
+    <div class="challenge cursor-pointer"><img alt="Connect 4" src="/static/c1.jpg"> vs AI</div>
+  </div>
+</div></div></div>
+
+<div class="lobby-block"><div class="lobby-inner"><div class="lobby-section">
+  <div class="font-semibold text-gray-800">Challenges</div>
+  <div class="overflow-x-auto" id="challenges"></div>
+</div></div></div>
+
+<div id="status"></div>
+<div id="game-area"></div>
+
+<div id="modal" style="position: fixed; inset: 0; display: none; background: rgba(0,0,0,0.4);">
+  <div class="modal-panel relative">
+    <button class="absolute top-3 right-3" aria-label="Close" onclick="closeModal()">&times;</button>
+    <h3 id="modal-title"></h3>
+    <div id="step-intro"><button id="play-now">Play Now</button></div>
+    <div id="step-bet" style="display: none;">
+      <div class="bet">
+        Bet: <span id="bet">10</span>
+        <button aria-label="Increase bet" class="plus" onclick="bump()">
+          <svg viewBox="0 0 24 24" width="14" height="14"><line x1="12" y1="5" x2="12" y2="19" stroke="black"></line><line x1="5" y1="12" x2="19" y2="12" stroke="black"></line></svg>
+        </button>
+      </div>
+      <button id="play-game">Play Game</button>
+    </div>
+    <div id="step-join" style="display: none;"><button id="join">Join Challenge</button></div>
+  </div>
+</div>
+
+<div id="promo" style="position: fixed; right: 20px; bottom: 20px; display: none; background: #fff; padding: 24px;">
+  <button class="absolute top-3 right-3" aria-label="Close" onclick="this.parentNode.style.display='none'">&times;</button>
+  Daily bonus available - come back tomorrow for more coins
+</div>
+
+<script>
+const CFG = __CONFIG__;
+const $ = id => document.getElementById(id);
+let pendingGame = null;
+
+localStorage.setItem('mock_user', CFG.email);
+$('user').innerText = CFG.email;
+
+function show(step) {
+  for (const id of ['step-intro', 'step-bet', 'step-join']) $(id).style.display = id === step ? 'block' : 'none';
+  $('modal').style.display = 'block';
+}
+function closeModal() { $('modal').style.display = 'none'; }
+function bump() { $('bet').innerText = parseInt($('bet').innerText, 10) + 10; }
+
+document.querySelectorAll('[data-card="true"]').forEach(card => card.addEventListener('click', () => {
+  pendingGame = card.dataset.game;
+  $('modal-title').innerText = card.querySelector('h4').innerText;
+  show('step-intro');
+}));
+$('play-now').addEventListener('click', () => show('step-bet'));
+$('play-game').addEventListener('click', () => {
+  closeModal();
+  const seat = CFG.bot_seat === 'random' ? 1 + Math.floor(Math.random() * 2) : CFG.bot_seat;
+  $('status').innerText = 'Waiting for an opponent to join...';
+  setTimeout(() => startGame(pendingGame, seat), CFG.opponent_delay * 1000);
+});
+$('join').addEventListener('click', () => { closeModal(); startGame('connect4', 2); });
+
+function startGame(game, seat) {
+  $('status').innerText = '';
+  const id = Math.random().toString(36).slice(2, 10);
+  const frame = document.createElement('iframe');
+  frame.src = '/games/' + game + '/?seat=' + seat + '&id=' + id;
+  $('game-area').innerHTML = '';
+  $('game-area').appendChild(frame);
+  frame.scrollIntoView();
+}
+
+setTimeout(() => {
+  const row = document.createElement('div');
+  row.className = 'challenge cursor-pointer';
+  row.innerHTML = '<img alt="Connect 4" src="/static/c1.jpg"> mock-host';
+  row.addEventListener('click', () => { $('modal-title').innerText = 'Connect 4 challenge'; show('step-join'); });
+  $('challenges').appendChild(row);
+}, CFG.challenge_delay * 1000);
+
+if (CFG.popups) setTimeout(() => { $('promo').style.display = 'block'; }, 800);
+
+window.addEventListener('message', event => {
+  if (!event.data || event.data.type !== 'gameover') return;
+  const overlay = document.createElement('div');
+  overlay.setAttribute('style', 'position: fixed; inset: 0; background: rgba(0,0,0,0.6); text-align: center; padding-top: 200px;');
+  overlay.innerHTML = '<h2 style="color: #fff;"></h2><button>Back to Home</button>';
+  overlay.querySelector('h2').innerText = event.data.text;
+  overlay.querySelector('button').addEventListener('click', () => { location.href = '/dashboard'; });
+  document.body.appendChild(overlay);
+});
+</script>
+</body></html>
+"""
+
+# Shared by every game iframe: turn timing, missed turns and result reporting
+GAME_COMMON_JS = """
+const CFG = __CONFIG__;
+const stats = {started: Date.now(), botMoves: 0, latencies: [], missed: 0};
+const SIM = CFG.time_scale || 1;
+let over = false, turnStarted = null, missTimer = null;
+
+function botTurnStarted() {
+  turnStarted = performance.now();
+  clearTimeout(missTimer);
+  missTimer = setTimeout(() => { stats.missed++; }, CFG.turn_timeout * 1000);
+}
+
+function botMoved() {
+  if (turnStarted !== null) stats.latencies.push(Math.round(performance.now() - turnStarted));
+  turnStarted = null;
+  clearTimeout(missTimer);
+  stats.botMoves++;
+}
+
+function finish(result) {
+  over = true;
+  clearTimeout(missTimer);
+  const text = {victory: 'Victory! You won', defeat: 'Defeat - you lost', draw: 'Draw'}[result];
+  fetch('/api/result', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({
+    game: CFG.game, id: CFG.id, seat: CFG.seat, result: result, duration_ms: Math.round((Date.now() - stats.started) * SIM),
+    bot_moves: stats.botMoves, latencies_ms: stats.latencies, missed_turns: stats.missed
+  })}).catch(() => {});
+  window.parent.postMessage({type: 'gameover', result: result, text: text}, '*');
+}
+
+function pick(list) { return list[Math.floor(Math.random() * list.length)]; }
+function smart() { return Math.random() < CFG.skill; }
+"""
+
+CONNECT4_HTML = """<!doctype html>
+<html><head><title>Connect 4</title><style>
+body { font-family: sans-serif; margin: 0; }
+.player-banner { padding: 8px; color: #fff; }
+td.board-cell { width: 56px; height: 56px; background: #1f4fd1; text-align: center; cursor: pointer; }
+td.board-cell img { width: 46px; height: 46px; }
+.turn-timer-top, .turn-timer-bottom { padding: 6px; font-weight: bold; }
+</style></head>
+<body>
+<div class="player-banner" id="banner-top">Opponent</div>
+<div class="turn-timer-top" style="display: none;">Opponent is thinking...</div>
+<div class="board"><table><tbody id="rows"></tbody></table></div>
+<div class="turn-timer-bottom" style="display: none;">Your turn</div>
+<div class="player-banner" id="banner-bottom">You</div>
+<script>
+__COMMON__
+const ROWS = 6, COLS = 7, COLORS = {1: '#FD7235', 2: '#FFD93D'}, IMAGES = {1: '/static/red.svg', 2: '/static/yellow.svg'};
+const me = CFG.seat, opp = 3 - CFG.seat;
+const board = Array.from({length: ROWS}, () => Array(COLS).fill(0));
+const cells = [];
+let turn = 1;
+
+document.getElementById('banner-top').setAttribute('style', 'background: ' + COLORS[opp]);
+document.getElementById('banner-bottom').setAttribute('style', 'background: ' + COLORS[me]);
+
+for (let r = 0; r < ROWS; r++) {
+  const tr = document.createElement('tr');
+  cells.push([]);
+  for (let c = 0; c < COLS; c++) {
+    const td = document.createElement('td');
+    td.className = 'board-cell';
+    td.addEventListener('click', () => botMove(c));
+    tr.appendChild(td);
+    cells[r].push(td);
+  }
+  document.getElementById('rows').appendChild(tr);
+}
+
+function dropRow(b, c) {
+  for (let r = ROWS - 1; r >= 0; r--) if (b[r][c] === 0) return r;
+  return -1;
+}
+
+function wins(b, p) {
+  for (let r = 0; r < ROWS; r++) for (let c = 0; c < COLS; c++) {
+    for (const [dr, dc] of [[0, 1], [1, 0], [1, 1], [1, -1]]) {
+      let n = 0;
+      for (let i = 0; i < 4; i++) {
+        const rr = r + dr * i, cc = c + dc * i;
+        if (rr < 0 || rr >= ROWS || cc < 0 || cc >= COLS || b[rr][cc] !== p) break;
+        n++;
+      }
+      if (n === 4) return true;
+    }
+  }
+  return false;
+}
+
+function place(r, c, p) {
+  board[r][c] = p;
+  const img = document.createElement('img');
+  img.src = IMAGES[p];
+  cells[r][c].appendChild(img);
+}
+
+function updateTurn() {
+  const mine = !over && turn === me;
+  document.querySelector('.turn-timer-bottom').style.display = mine ? 'block' : 'none';
+  document.querySelector('.turn-timer-top').style.display = !over && !mine ? 'block' : 'none';
+}
+
+function afterMove(p) {
+  if (wins(board, p)) return endGame(p === me ? 'victory' : 'defeat');
+  if (board[0].every(v => v !== 0)) return endGame('draw');
+  turn = 3 - p;
+  updateTurn();
+  if (turn === me) botTurnStarted();
+  else setTimeout(opponentMove, CFG.think_time * 1000);
+}
+
+function endGame(result) { finish(result); updateTurn(); }
+
+function botMove(c) {
+  if (over || turn !== me) return;
+  const r = dropRow(board, c);
+  if (r < 0) return;
+  place(r, c, me);
+  botMoved();
+  afterMove(me);
+}
+
+function opponentMove() {
+  if (over) return;
+  const valid = [...Array(COLS).keys()].filter(c => dropRow(board, c) >= 0);
+  let col = null;
+  if (smart()) {
+    for (const p of [opp, me]) {
+      for (const c of valid) {
+        const b = board.map(row => row.slice());
+        b[dropRow(b, c)][c] = p;
+        if (wins(b, p)) { col = c; break; }
+      }
+      if (col !== null) break;
+    }
+    if (col === null) col = pick([3, 2, 4, 1, 5, 0, 6].filter(c => valid.includes(c)).slice(0, 3));
+  }
+  if (col === null) col = pick(valid);
+  place(dropRow(board, col), col, opp);
+  afterMove(opp);
+}
+
+updateTurn();
+if (turn === me) botTurnStarted();
+else setTimeout(opponentMove, CFG.think_time * 1000);
+</script>
+</body></html>
+"""
+
+CHECKERS_HTML = """<!doctype html>
+<html><head><title>Checkers</title><style>
+body { font-family: sans-serif; margin: 0; }
+.board-responsive { width: 560px; }
+.grid.grid-cols-8 { display: grid; grid-template-columns: repeat(8, 1fr); }
+.aspect-square { height: 70px; display: flex; align-items: center; justify-content: center; }
+.light { background: #eed9b6; }
+.dark { background: #8b5a2b; }
+.highlight { outline: 3px solid #3f3; outline-offset: -3px; }
+.aspect-square img { width: 54px; height: 54px; }
+.turn { padding: 6px; font-weight: bold; }
+</style></head>
+<body>
+<div class="turn" id="turn-top" style="display: none;">Opponent's turn</div>
+<div class="board-responsive"><div class="grid grid-cols-8" id="grid"></div></div>
+<div class="turn" id="turn-bottom" style="display: none;">Your Turn</div>
+<script>
+__COMMON__
+// The bot always sits at the bottom (type A, moving up); seat only decides who starts
+const ME = 'A', OPP = 'B', SRC = {A: '/static/pieces/W-rTeAz-qe.png', B: '/static/pieces/B-4DvpsQW3.png'};
+const ALT = {A: 'player1', B: 'player2'};
+const board = Array.from({length: 8}, () => Array(8).fill(null));
+const squares = [];
+let turn = CFG.seat === 1 ? ME : OPP, selected = null, chaining = false, chainTimer = null, plies = 0;
+
+for (let r = 0; r < 8; r++) for (let c = 0; c < 8; c++) {
+  const dark = (r + c) % 2 === 1;
+  if (dark && r < 3) board[r][c] = {t: OPP, k: false};
+  if (dark && r > 4) board[r][c] = {t: ME, k: false};
+  const sq = document.createElement('div');
+  sq.dataset.base = 'w-full aspect-square ' + (dark ? 'dark' : 'light');
+  sq.className = sq.dataset.base;
+  sq.addEventListener('click', () => botClick(r, c));
+  document.getElementById('grid').appendChild(sq);
+  squares.push(sq);
+}
+
+function inside(r, c) { return r >= 0 && r < 8 && c >= 0 && c < 8; }
+function dirs(piece) {
+  if (piece.k) return [[-1, -1], [-1, 1], [1, -1], [1, 1]];
+  return piece.t === ME ? [[-1, -1], [-1, 1]] : [[1, -1], [1, 1]];
+}
+
+function captures(r, c) {
+  const piece = board[r][c], out = [];
+  for (const [dr, dc] of dirs(piece)) {
+    const mr = r + dr, mc = c + dc, tr = r + 2 * dr, tc = c + 2 * dc;
+    if (inside(tr, tc) && board[mr][mc] && board[mr][mc].t !== piece.t && !board[tr][tc]) out.push([tr, tc]);
+  }
+  return out;
+}
+
+function steps(r, c) {
+  return dirs(board[r][c]).map(([dr, dc]) => [r + dr, c + dc]).filter(([tr, tc]) => inside(tr, tc) && !board[tr][tc]);
+}
+
+function allMoves(t) {
+  const caps = [], simple = [];
+  for (let r = 0; r < 8; r++) for (let c = 0; c < 8; c++) {
+    if (!board[r][c] || board[r][c].t !== t) continue;
+    for (const to of captures(r, c)) caps.push([[r, c], to]);
+    for (const to of steps(r, c)) simple.push([[r, c], to]);
+  }
+  return {caps: caps, simple: simple};
+}
+
+// Returns true when the piece can keep jumping
+function apply(from, to) {
+  const [fr, fc] = from, [tr, tc] = to, piece = board[fr][fc];
+  board[tr][tc] = piece;
+  board[fr][fc] = null;
+  const jumped = Math.abs(tr - fr) === 2;
+  if (jumped) board[(fr + tr) / 2][(fc + tc) / 2] = null;
+  const crowned = !piece.k && ((piece.t === ME && tr === 0) || (piece.t === OPP && tr === 7));
+  if (crowned) piece.k = true;
+  return jumped && !crowned && captures(tr, tc).length > 0;
+}
+
+function render() {
+  for (let r = 0; r < 8; r++) for (let c = 0; c < 8; c++) {
+    const sq = squares[r * 8 + c], piece = board[r][c];
+    const isSel = selected && selected[0] === r && selected[1] === c;
+    sq.className = sq.dataset.base + (isSel ? ' highlight' : '');
+    const img = sq.querySelector('img');
+    if (!piece) { if (img) img.remove(); continue; }
+    const el = img || sq.appendChild(document.createElement('img'));
+    el.src = SRC[piece.t];
+    el.alt = ALT[piece.t] + (piece.k ? ' king' : '');
+  }
+  const mine = !over && turn === ME;
+  document.getElementById('turn-bottom').style.display = mine ? 'block' : 'none';
+  document.getElementById('turn-top').style.display = !over && !mine ? 'block' : 'none';
+}
+
+function checkEnd() {
+  plies++;
+  const moves = allMoves(turn);
+  if (!moves.caps.length && !moves.simple.length) { finish(turn === ME ? 'defeat' : 'victory'); return true; }
+  if (plies >= 200) { finish('draw'); return true; }
+  return false;
+}
+
+function endBotTurn() {
+  clearTimeout(chainTimer);
+  selected = null;
+  chaining = false;
+  botMoved();
+  turn = OPP;
+  if (!checkEnd()) setTimeout(opponentMove, CFG.think_time * 1000);
+  render();
+}
+
+function botClick(r, c) {
+  if (over || turn !== ME) return;
+  const piece = board[r][c];
+  if (piece && piece.t === ME && !chaining) { selected = [r, c]; render(); return; }
+  if (!selected || piece) return;
+  const [sr, sc] = selected, dr = r - sr, dc = c - sc;
+  const isStep = Math.abs(dr) === 1 && Math.abs(dc) === 1 && !chaining &&
+                 steps(sr, sc).some(([tr, tc]) => tr === r && tc === c);
+  const isJump = captures(sr, sc).some(([tr, tc]) => tr === r && tc === c);
+  if (!isStep && !isJump) return;
+  const more = apply(selected, [r, c]);
+  if (more) {
+    selected = [r, c];
+    chaining = true;
+    clearTimeout(chainTimer);
+    // A bot that stops mid-chain still hands the turn over
+    chainTimer = setTimeout(endBotTurn, 2500);
+    render();
+    return;
+  }
+  endBotTurn();
+}
+
+function opponentMove() {
+  if (over) return;
+  const moves = allMoves(OPP);
+  if (moves.caps.length) {
+    let [from, to] = pick(moves.caps);
+    while (apply(from, to)) { from = to; to = captures(from[0], from[1])[0]; }
+  } else {
+    let choice = pick(moves.simple);
+    if (smart()) {
+      // Prefer steps that do not land next to a bot piece able to jump
+      const safe = moves.simple.filter(([, [tr, tc]]) => ![[1, -1], [1, 1]].some(([dr, dc]) =>
+        inside(tr + dr, tc + dc) && board[tr + dr][tc + dc] && board[tr + dr][tc + dc].t === ME &&
+        inside(tr - dr, tc - dc) && !board[tr - dr][tc - dc]));
+      if (safe.length) choice = pick(safe);
+    }
+    apply(choice[0], choice[1]);
+  }
+  turn = ME;
+  if (!checkEnd()) botTurnStarted();
+  render();
+}
+
+render();
+if (turn === ME) botTurnStarted();
+else setTimeout(opponentMove, CFG.think_time * 1000);
+</script>
+</body></html>
+"""
+
+TICTACTOE_HTML = """<!doctype html>
+<html><head><title>Tic Tac Toe</title><style>
+body { font-family: sans-serif; margin: 0; }
+.board { display: grid; grid-template-columns: repeat(3, 110px); gap: 6px; padding: 12px; }
+.cell { height: 110px; background: #eee; display: flex; align-items: center; justify-content: center; cursor: pointer; }
+.cell img { width: 80px; height: 80px; }
+.my-turn, .opponent-turn { padding: 6px; font-weight: bold; }
+</style></head>
+<body>
+<div class="opponent-turn" style="display: none;">Opponent's turn</div>
+<div class="board" id="board"></div>
+<div class="my-turn" style="display: none;">YOUR TURN</div>
+<script>
+__COMMON__
+const MARK = {1: 'X', 2: 'O'}, SRC = {1: '/static/pieces/W-rTeAz-qe.png', 2: '/static/pieces/B-4DvpsQW3.png'};
+const LINES = [[0,1,2],[3,4,5],[6,7,8],[0,3,6],[1,4,7],[2,5,8],[0,4,8],[2,4,6]];
+const me = CFG.seat, opp = 3 - CFG.seat;
+const board = Array(9).fill(0), cells = [];
+let turn = 1;
+
+document.querySelector('.my-turn').classList.add('my-turn-' + MARK[me].toLowerCase());
+for (let i = 0; i < 9; i++) {
+  const cell = document.createElement('div');
+  cell.className = 'cell';
+  cell.setAttribute('data-value', '0');
+  cell.addEventListener('click', () => botMove(i));
+  document.getElementById('board').appendChild(cell);
+  cells.push(cell);
+}
+
+function winner(b) {
+  for (const [a, c, d] of LINES) if (b[a] && b[a] === b[c] && b[a] === b[d]) return b[a];
+  return 0;
+}
+
+function place(i, p) {
+  board[i] = p;
+  cells[i].setAttribute('data-value', String(p));
+  cells[i].className = 'cell disabled';
+  const img = document.createElement('img');
+  img.src = SRC[p];
+  img.alt = MARK[p];
+  cells[i].appendChild(img);
+}
+
+function updateTurn() {
+  const mine = !over && turn === me;
+  document.querySelector('.my-turn').style.display = mine ? 'block' : 'none';
+  document.querySelector('.opponent-turn').style.display = !over && !mine ? 'block' : 'none';
+  document.getElementById('board').className = 'board ' + (mine ? 'my-turn-board' : 'opponent-turn-board');
+}
+
+function afterMove(p) {
+  if (winner(board)) { finish(p === me ? 'victory' : 'defeat'); updateTurn(); return; }
+  if (board.every(v => v)) { finish('draw'); updateTurn(); return; }
+  turn = 3 - p;
+  updateTurn();
+  if (turn === me) botTurnStarted();
+  else setTimeout(opponentMove, CFG.think_time * 1000);
+}
+
+function botMove(i) {
+  if (over || turn !== me || board[i]) return;
+  place(i, me);
+  botMoved();
+  afterMove(me);
+}
+
+function opponentMove() {
+  if (over) return;
+  const empty = [...Array(9).keys()].filter(i => !board[i]);
+  let choice = null;
+  if (smart()) {
+    for (const p of [opp, me]) {
+      choice = empty.find(i => { const b = board.slice(); b[i] = p; return winner(b) === p; });
+      if (choice !== undefined) break;
+      choice = null;
+    }
+    if (choice === null && !board[4]) choice = 4;
+  }
+  if (choice === null) choice = pick(empty);
+  place(choice, opp);
+  afterMove(opp);
+}
+
+updateTurn();
+if (turn === me) botTurnStarted();
+else setTimeout(opponentMove, CFG.think_time * 1000);
+</script>
+</body></html>
+"""
+
+GAME_PAGES = {
+    'connect4': CONNECT4_HTML,
+    'checkers': CHECKERS_HTML,
+    'tictactoe': TICTACTOE_HTML,
+}
+
+# Colour per static asset name fragment, everything is served as a small SVG
+ASSET_COLORS = [
+    ('red', '#e53935'), ('yellow', '#fdd835'), ('w-', '#fafafa'), ('b-', '#212121'),
+    ('c1', '#1f4fd1'), ('checkers', '#8b5a2b'), ('tictactoe', '#43a047'),
+]
+
+
+def _asset_svg(name):
+    name = name.lower()
+    color = next((c for key, c in ASSET_COLORS if key in name), '#9e9e9e')
+    if name.endswith('.jpg'):
+        shape = f'<rect width="64" height="64" fill="{color}"/>'
+    else:
+        shape = f'<circle cx="32" cy="32" r="28" fill="{color}" stroke="#555" stroke-width="3"/>'
+    return f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 64 64">{shape}</svg>'
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class MockPlatform:
+    """
+    The mock site plus its recorded statistics.
+
+    start() serves from a daemon thread (port 0 picks a free port), which is
+    what scripted end-to-end runs use; main() serves in the foreground.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, accounts=None, **config):
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update({k: v for k, v in config.items() if v is not None})
+        self.accounts = accounts or {}
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.logins = 0
+        self.games = []
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def dashboard_url(self):
+        return f"{self.base_url}/dashboard"
+
+    @property
+    def login_url(self):
+        return f"{self.base_url}/auth/login"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Mock platform serving at {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def authenticate(self, email, password):
+        """Any non-empty credentials work unless an accounts map was given"""
+        if not email or not password:
+            return None
+        if self.accounts and self.accounts.get(email) != password:
+            return None
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[token] = email
+            self.logins += 1
+        return token
+
+    def record_result(self, result):
+        result['finished_at'] = time.time()
+        with self.lock:
+            self.games.append(result)
+        logger.info(f"Game {result.get('game')} #{result.get('id')}: {result.get('result')} in "
+                    f"{result.get('duration_ms', 0) / 1000:.1f}s, {result.get('bot_moves', 0)} bot moves, "
+                    f"{result.get('missed_turns', 0)} missed turns")
+
+    def stats(self):
+        with self.lock:
+            games = list(self.games)
+            return {
+                'logins': self.logins,
+                'requests': dict(self.requests),
+                'games': games,
+                'results': dict(Counter(g.get('result') for g in games)),
+            }
+
+    def page_config(self, **extra):
+        """Config embedded in a page, with the delays in real seconds"""
+        config = dict(self.config, **extra)
+        scale = float(config.get('time_scale') or 1)
+        for key in SCALED_DELAYS:
+            config[key] = config[key] / scale
+        return config
+
+    def _handler_class(self):
+        platform = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logger.debug(fmt % args)
+
+            def _send(self, status, body='', content_type='text/html; charset=utf-8', headers=None):
+                data = body.encode() if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _redirect(self, location, headers=None):
+                self._send(302, '', headers={'Location': location, **(headers or {})})
+
+            def _session_email(self):
+                cookie = SimpleCookie(self.headers.get('Cookie', ''))
+                token = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+                return platform.sessions.get(token)
+
+            def _body(self):
+                length = int(self.headers.get('Content-Length', 0))
+                return self.rfile.read(length).decode() if length else ''
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                path = url.path.rstrip('/') or '/'
+                with platform.lock:
+                    platform.requests[path if not path.startswith('/static') else '/static'] += 1
+
+                if path in ('/', '/dashboard'):
+                    email = self._session_email()
+                    if not email:
+                        return self._redirect('/auth/login')
+                    config = platform.page_config(email=email)
+                    page = DASHBOARD_HTML.replace('__CSS__', BASE_CSS).replace('__CONFIG__', json.dumps(config))
+                    return self._send(200, page)
+
+                if path == '/auth/login':
+                    return self._send(200, LOGIN_HTML.replace('__CSS__', BASE_CSS).replace('__ERROR__', ''))
+
+                if path.startswith('/games/'):
+                    game = path.split('/')[2]
+                    if game not in GAME_PAGES:
+                        return self._send(404, 'Unknown game')
+                    query = parse_qs(url.query)
+                    config = platform.page_config(game=game,
+                                  seat=int(query.get('seat', ['1'])[0]),
+                                  id=query.get('id', [''])[0])
+                    common = GAME_COMMON_JS.replace('__CONFIG__', json.dumps(config))
+                    return self._send(200, GAME_PAGES[game].replace('__COMMON__', common))
+
+                if path.startswith('/static/'):
+                    return self._send(200, _asset_svg(path), 'image/svg+xml',
+                                      headers={'Cache-Control': 'max-age=3600'})
+
+                if path == '/api/stats':
+                    return self._send(200, json.dumps(platform.stats(), indent=2), 'application/json')
+
+                self._send(404, 'Not found')
+
+            def do_POST(self):
+                path = urlparse(self.path).path.rstrip('/')
+                with platform.lock:
+                    platform.requests[f'POST {path}'] += 1
+
+                if path == '/auth/login':
+                    form = parse_qs(self._body())
+                    token = platform.authenticate(form.get('email', [''])[0], form.get('password', [''])[0])
+                    if not token:
+                        page = LOGIN_HTML.replace('__CSS__', BASE_CSS).replace(
+                            '__ERROR__', '<div class="error">Invalid email or password</div>')
+                        return self._send(401, page)
+                    return self._redirect('/dashboard', headers={
+                        'Set-Cookie': f'{SESSION_COOKIE}={token}; Path=/; HttpOnly'
+                    })
+
+                if path == '/api/result':
+                    try:
+                        platform.record_result(json.loads(self._body()))
+                    except ValueError:
+                        return self._send(400, 'Bad result payload')
+                    return self._send(204)
+
+                self._send(404, 'Not found')
+
+        return Handler
+
+
+def load_mock_accounts(config_path):
+    """email -> password map from an accounts.json, so only configured accounts can log in"""
+    with open(config_path) as f:
+        config = json.load(f)
+    return {acc['email']: acc['password'] for acc in config.get('accounts', []) if 'email' in acc}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline mock of the GameOn platform for end-to-end bot runs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--accounts', help='Only accept logins from this accounts.json')
+    parser.add_argument('--opponent-delay', type=float, help='Seconds until an opponent joins a created game')
+    parser.add_argument('--challenge-delay', type=float, help='Seconds until a lobby challenge appears')
+    parser.add_argument('--think-time', type=float, help='Scripted opponent seconds per move')
+    parser.add_argument('--skill', type=float, help='0..1 chance of a tactical opponent move')
+    parser.add_argument('--bot-seat', choices=['1', '2', 'random'], help='Seat of the bot in created games')
+    parser.add_argument('--turn-timeout', type=float, help='Bot turns slower than this count as missed')
+    parser.add_argument('--popups', action='store_true', default=None, help='Show a promo popup on the dashboard')
+    parser.add_argument('--time-scale', type=float,
+                        help='Run N times faster than real time; match the bots\' settings.clock.speedup')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    bot_seat = args.bot_seat if args.bot_seat in (None, 'random') else int(args.bot_seat)
+    platform = MockPlatform(
+        host=args.host, port=args.port,
+        accounts=load_mock_accounts(args.accounts) if args.accounts else None,
+        opponent_delay=args.opponent_delay, challenge_delay=args.challenge_delay,
+        think_time=args.think_time, skill=args.skill, bot_seat=bot_seat,
+        turn_timeout=args.turn_timeout, popups=args.popups, time_scale=args.time_scale,
+    )
+    logger.info(f"Mock GameOn platform on {platform.base_url}")
+    logger.info(f'Settings: "dashboard_url": "{platform.dashboard_url}", "login_url": "{platform.login_url}"')
+    try:
+        platform.server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+    finally:
+        platform.server.server_close()
+        results = platform.stats()['results']
+        if results:
+            logger.info(f"Results: {results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Per-move Latency Tracing
+Splits every move into perceive / think / act spans and writes one JSONL
+record per move, plus a CLI that summarizes the recorded distributions
+
+Spans per move:
+    detect_turn   previous move done -> the probe that saw our turn (opponent time, polling, popups)
+    read_board    that probe call itself (GameProbe returns turn and board in one round trip)
+    engine        move search, with depth / nodes / score
+    click         make_move()
+    confirm       waiting for the turn to hand over
+
+Usage:
+    python move_trace.py                         # summary per game type
+    python move_trace.py --by account
+    python move_trace.py logs/move_trace.jsonl --game checkers --by account
+"""
+
+import os
+import json
+import time
+import uuid
+import argparse
+import threading
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qs
+
+from metrics_server import METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'move_trace.jsonl')
+SPAN_ORDER = ['detect_turn', 'read_board', 'engine', 'click', 'confirm']
+
+_file_lock = threading.Lock()
+
+
+def game_id_from_src(src):
+    """Game id from the iframe URL (?id= / ?gameId= or last path segment), random if there is none"""
+    if src:
+        url = urlparse(src)
+        query = parse_qs(url.query)
+        for key in ('id', 'gameId', 'game_id', 'room'):
+            if query.get(key):
+                return query[key][0]
+        segment = url.path.rstrip('/').rsplit('/', 1)[-1]
+        if any(ch.isdigit() for ch in segment):
+            return segment
+    return uuid.uuid4().hex[:8]
+
+
+class MoveTracer:
+    """
+    Collects the spans of the move in progress and flushes them on move_done().
+
+    Always safe to call: when disabled every method is a cheap no-op, so the
+    game loops do not need to check for it.
+    """
+
+    def __init__(self, account_email, game_type, settings=None):
+        settings = settings or {}
+        self.enabled = settings.get('enabled', False)
+        self.trace_file = settings.get('file') or DEFAULT_TRACE_FILE
+        self.account_email = account_email
+        self.game_type = game_type
+        self.game_id = None
+        self.move = 0
+        self._reset_move()
+
+    def _reset_move(self):
+        self.cursor = time.perf_counter()
+        self.spans = {}
+        self.probes = 0
+        self.last_probe = None
+
+    def start_game(self, iframe_src=None):
+        self.game_id = game_id_from_src(iframe_src)
+        self.move = 0
+        self._reset_move()
+
+    def probe(self, game_probe, game_iframe):
+        """Run a GameProbe and remember its timing, the last one becomes read_board"""
+        start = time.perf_counter()
+        state = game_probe.probe(game_iframe)
+        self.probes += 1
+        self.last_probe = (start, time.perf_counter())
+        METRICS.move_span(self.game_type, 'read_board', self.last_probe[1] - start)
+        return state
+
+    def turn_detected(self):
+        """Our turn was seen by the last probe: close detect_turn and read_board"""
+        if not self.enabled or not self.last_probe:
+            return
+        start, end = self.last_probe
+        self.spans['detect_turn'] = {'ms': (start - self.cursor) * 1000, 'probes': self.probes}
+        self.spans['read_board'] = {'ms': (end - start) * 1000}
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a block; the yielded dict takes extra attributes (e.g. engine depth)
+        """
+        attrs = {}
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            seconds = time.perf_counter() - start
+            attrs['ms'] = seconds * 1000
+            METRICS.move_span(self.game_type, name, seconds)
+            if name == 'engine' and attrs.get('nodes'):
+                METRICS.search(self.game_type, attrs['nodes'], seconds)
+            if self.enabled:
+                self.spans[name] = attrs
+
+    def move_done(self, label=None, ok=True):
+        """Write the record for this move and start timing the next one"""
+        if self.enabled:
+            self.move += 1
+            now = time.perf_counter()
+            spans = {name: {k: (round(v, 1) if k == 'ms' else v) for k, v in attrs.items()}
+                     for name, attrs in self.spans.items()}
+            self._write({
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'account': self.account_email,
+                'game_type': self.game_type,
+                'game_id': self.game_id,
+                'move': self.move,
+                'label': label,
+                'ok': ok,
+                'total_ms': round((now - self.cursor) * 1000, 1),
+                'spans': spans,
+            })
+        self._reset_move()
+
+    def _write(self, record):
+        try:
+            os.makedirs(os.path.dirname(self.trace_file), exist_ok=True)
+            with _file_lock:
+                with open(self.trace_file, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            logger.warning(f"[{self.account_email}] Could not write move trace: {e}")
+
+
+# ============================================================================
+# SUMMARY CLI
+# ============================================================================
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def load_records(path, game_type=None, account=None):
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if game_type and record.get('game_type') != game_type:
+                continue
+            if account and record.get('account') != account:
+                continue
+            records.append(record)
+    return records
+
+
+def summarize(records, by='game_type'):
+    """
+    Group records and compute per-span distributions
+
+    Returns:
+        {group: {'moves', 'games', 'spans': {name: {n, p50, p95, max, share}}, 'engine': {...}}}
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault(record.get(by) or '?', []).append(record)
+
+    summary = {}
+    for group, items in sorted(groups.items()):
+        totals = [r['total_ms'] for r in items]
+        spans = {}
+        for name in SPAN_ORDER + ['total']:
+            values = totals if name == 'total' else \
+                [r['spans'][name]['ms'] for r in items if name in r.get('spans', {})]
+            if values:
+                spans[name] = {
+                    'n': len(values),
+                    'p50': _percentile(values, 50),
+                    'p95': _percentile(values, 95),
+                    'max': max(values),
+                    'share': sum(values) / sum(totals) * 100 if sum(totals) else 0,
+                }
+
+        searches = [r['spans']['engine'] for r in items
+                    if r.get('spans', {}).get('engine', {}).get('nodes')]
+        engine = {}
+        if searches:
+            nodes = [s['nodes'] for s in searches]
+            seconds = sum(s['ms'] for s in searches) / 1000
+            engine = {
+                'searches': len(searches),
+                'depth_p50': _percentile([s.get('depth') or 0 for s in searches], 50),
+                'nodes_p50': _percentile(nodes, 50),
+                'nodes_p95': _percentile(nodes, 95),
+                'nodes_per_s': sum(nodes) / seconds if seconds else 0,
+            }
+
+        summary[group] = {
+            'moves': len(items),
+            'games': len({(r.get('account'), r.get('game_id')) for r in items}),
+            'failed_moves': sum(1 for r in items if not r.get('ok', True)),
+            'spans': spans,
+            'engine': engine,
+        }
+    return summary
+
+
+def print_summary(summary, by):
+    for group, data in summary.items():
+        print(f"\n{by.upper()}: {group}  ({data['moves']} moves, {data['games']} games, "
+              f"{data['failed_moves']} failed)")
+        print(f"  {'SPAN':<12} {'N':>6} {'P50':>9} {'P95':>9} {'MAX':>9} {'SHARE':>6}")
+        for name, stats in data['spans'].items():
+            print(f"  {name:<12} {stats['n']:>6} {stats['p50']:>7.0f}ms {stats['p95']:>7.0f}ms "
+                  f"{stats['max']:>7.0f}ms {stats['share'] if name != 'total' else 100:>5.1f}%")
+        engine = data['engine']
+        if engine:
+            print(f"  engine: {engine['searches']} searches, depth p50 {engine['depth_p50']}, "
+                  f"nodes p50/p95 {engine['nodes_p50']:,}/{engine['nodes_p95']:,}, "
+                  f"{engine['nodes_per_s']:,.0f} nodes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize per-move latency traces")
+    parser.add_argument('file', nargs='?', default=DEFAULT_TRACE_FILE)
+    parser.add_argument('--by', choices=['game_type', 'account', 'game_id'], default='game_type')
+    parser.add_argument('--game', help='Only this game type (connect4, checkers, tictactoe)')
+    parser.add_argument('--account', help='Only this account')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"No trace file at {args.file} - enable settings.move_trace and run a session first")
+        return
+
+    records = load_records(args.file, args.game, args.account)
+    if not records:
+        print("No matching moves")
+        return
+
+    summary = summarize(records, args.by)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary, args.by)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,6 @@ Checkers Multi-Account PARALLEL Bot - ULTRA EXPERT AI (FIXED FOR GRID LAYOUT)
 Fixed for grid-based board with player1/player2 system
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -22,23 +21,34 @@ import threading
 from copy import deepcopy
 import concurrent.futures
 
+from game_probe import GameProbe
+from popup_guard import PopupGuard
+from webdriver_metrics import create_command_metrics
+from move_trace import MoveTracer
+from game_records import GameRecorder
+from metrics_server import METRICS, start_metrics_server
+from virtual_clock import CLOCK, configure_clock
+from browser_pool import create_browser_pool, launch_chrome, remove_profile
+from concurrency_controller import create_concurrency_controller
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible_enabled
+from log_pipeline import setup_logging, configure_logging, LOG_READ, LOG_SEARCH
+from session_store import SessionStore
+from wait_utils import (WAIT_STATS, wait_for, pause, element_clickable, element_present,
+                        element_gone, url_contains, document_ready,
+                        square_highlighted, square_has_piece)
+
 # Configure logging
 LOG_DIR = Path("/home/user/Gameon-AI-Bots/logs")
 LOG_DIR.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / f'checkers_parallel_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+setup_logging(LOG_DIR / f'checkers_parallel_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
 logger = logging.getLogger(__name__)
 
 # Thread-safe progress tracker
 class ProgressTracker:
-    def __init__(self):
+    def __init__(self, game_type):
+        self.game_type = game_type
         self.lock = threading.Lock()
         self.accounts_completed = 0
         self.games_completed = 0
@@ -53,52 +63,46 @@ class ProgressTracker:
             self.games_completed += 1
             if succeeded:
                 self.games_succeeded += 1
+        if not succeeded:
+            METRICS.game_failed(self.game_type)
     
     def get_stats(self):
         with self.lock:
             return self.accounts_completed, self.games_completed, self.games_succeeded
 
-tracker = ProgressTracker()
+tracker = ProgressTracker('checkers')
 
 
 class CheckersUltraExpertBot:
     def __init__(self, account_email, account_password, dashboard_url="https://app.gameonworld.ai/dashboard",
-                 bet_increase_clicks=0, headless=True):
-        
-        # Create unique user data directory
-        import hashlib
-        account_hash = hashlib.md5(account_email.encode()).hexdigest()[:8]
-        user_data_dir = f"/tmp/chrome_profile_{account_hash}_{int(time.time())}"
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument(f'--user-data-dir={user_data_dir}')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--remote-debugging-port=0')
-        options.add_argument('--disable-web-security')
-        
-        if headless:
-            options.add_argument('--headless=new')
+                 bet_increase_clicks=0, headless=True, browser_pool=None, session_store=None,
+                 lean_profile=None, login_url="https://app.gameonworld.ai/auth/login", webdriver_metrics=None,
+                 move_trace=None, game_records=None):
         
-        window_width = 1920 + random.randint(-100, 100)
-        window_height = 1080 + random.randint(-100, 100)
-        options.add_argument(f'--window-size={window_width},{window_height}')
-        
-        self.driver = webdriver.Chrome(options=options)
+        self.browser_pool = browser_pool
+        if browser_pool:
+            # Warm instance or fresh browser context from the shared pool
+            self.driver = browser_pool.acquire()
+            self.user_data_dir = None
+        else:
+            self.driver, self.user_data_dir = launch_chrome(account_email, headless, lean_profile)
         self.wait = WebDriverWait(self.driver, 20)
         self.dashboard_url = dashboard_url
+        self.login_url = login_url
         self.game_iframe = None
         self.bet_increase_clicks = bet_increase_clicks
         self.my_color = None
         self.move_timeout = 15
         self.account_email = account_email
-        self.user_data_dir = user_data_dir
         self.transposition_table = {}
+        self.session_store = session_store
+        # WebDriver round trips per calling method, None unless enabled in settings
+        self.commands = create_command_metrics(self.driver, self, account_email, webdriver_metrics)
+        self.tracer = MoveTracer(account_email, 'checkers', move_trace)
+        self.recorder = GameRecorder(account_email, 'checkers', game_records)
+        self.last_search = {}
+        self.popup_guard = PopupGuard(self.driver, account_email)
+        self.popup_guard.install()
         
         # Configurable AI depth - OPTIMIZED FOR SPEED
         self.ai_early_depth = 4      # Reduced from 6 (faster opening)
@@ -110,36 +114,23 @@ class CheckersUltraExpertBot:
         
     def start(self):
         """Navigate to login page"""
-        time.sleep(random.uniform(0.5, 2.0))
-        self.driver.get("https://app.gameonworld.ai/auth/login")
-        time.sleep(2)
+        CLOCK.sleep(random.uniform(0.5, 2.0))
+        self.driver.get(self.login_url)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "input[type='email']"), 10, 'login.page_loaded')
         logger.info(f"[{self.account_email}] Login page loaded")
     
     def close_popups(self):
         """Close any popups"""
         try:
-            close_selectors = [
-                "button.absolute.top-3.right-3",
-                "button svg[viewBox='0 0 512 512']//ancestor::button",
-                "button[aria-label='Close']",
-                "button[aria-label='close']",
-                "button.close",
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            time.sleep(0.5)
-                            return True
-                except:
-                    continue
+            buttons, _ = SELECTORS.find(self.driver, 'popup.close', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                CLOCK.sleep(0.5)
+                return True
             
             try:
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                time.sleep(0.3)
+                CLOCK.sleep(0.3)
             except:
                 pass
             return False
@@ -150,7 +141,13 @@ class CheckersUltraExpertBot:
         """Login to platform"""
         try:
             logger.info(f"[{email}] Logging in...")
-            time.sleep(random.uniform(1.0, 3.0))
+            
+            if self.session_store and self.session_store.restore(self.driver, email, self.dashboard_url,
+                                                                 login_url=self.login_url):
+                self.popup_guard.sweep()
+                return True
+            
+            pause(random.uniform(1.0, 3.0), 'login.human_pacing')
             
             email_input = self.wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email'][placeholder='Email']"))
@@ -158,14 +155,14 @@ class CheckersUltraExpertBot:
             password_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password'][placeholder='Password']")
             
             email_input.clear()
-            time.sleep(0.3)
+            pause(0.3, 'login.human_pacing')
             email_input.send_keys(email)
-            time.sleep(random.uniform(0.5, 1.0))
+            pause(random.uniform(0.5, 1.0), 'login.human_pacing')
             
             password_input.clear()
-            time.sleep(0.3)
+            pause(0.3, 'login.human_pacing')
             password_input.send_keys(password)
-            time.sleep(random.uniform(0.5, 1.0))
+            pause(random.uniform(0.5, 1.0), 'login.human_pacing')
             
             login_button = self.driver.find_element(By.XPATH, "//button[@type='submit' and contains(text(), 'Login')]")
             login_button.click()
@@ -173,13 +170,13 @@ class CheckersUltraExpertBot:
             WebDriverWait(self.driver, 15).until(
                 lambda driver: "login" not in driver.current_url.lower()
             )
-            time.sleep(2)
+            wait_for(self.driver, document_ready(), 5, 'login.dashboard_ready')
             
-            for i in range(5):
-                if self.close_popups():
-                    time.sleep(0.5)
+            self.popup_guard.sweep()
             
             logger.info(f"[{email}] Login successful ✓")
+            if self.session_store:
+                self.session_store.save(self.driver, email)
             return True
         except Exception as e:
             logger.error(f"[{email}] Login error: {e}")
@@ -193,100 +190,47 @@ class CheckersUltraExpertBot:
             current_url = self.driver.current_url
             if "dashboard" not in current_url:
                 self.driver.get(self.dashboard_url)
-                time.sleep(3)
+                wait_for(self.driver, document_ready(), 10, 'create.dashboard_loaded')
             
-            self.close_popups()
-            time.sleep(2)
+            self.popup_guard.resume()
+            # The card opens the create-game modal, keep it open until the game starts
+            self.popup_guard.pause()
             
             self.driver.execute_script("window.scrollTo(0, 400);")
-            time.sleep(1)
-            
-            checkers_found = False
-            strategies = [
-                self._find_by_text_content,
-                self._find_by_image,
-                self._find_by_javascript
-            ]
+            wait_for(self.driver, element_present(By.CSS_SELECTOR, "[data-card='true']"), 5, 'create.cards_loaded')
             
-            for strategy in strategies:
-                try:
-                    if strategy():
-                        checkers_found = True
-                        break
-                except:
-                    continue
-            
-            if not checkers_found:
+            # All fallback strategies run in the page, last winner first
+            checkers_card, strategy = locate_card(self.driver, 'checkers')
+            if not checkers_card:
                 logger.error(f"[{self.account_email}] Could not find Checkers card")
                 return False
+            logger.info(f"[{self.account_email}] Checkers card found ({strategy})")
+            checkers_card.click()
             
-            time.sleep(2)
-            
-            play_now_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Play Now')]"))
-            )
+            play_now_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Play Now')]"),
+                                       20, 'create.play_now')
+            if not play_now_button:
+                raise TimeoutException("'Play Now' button never became clickable")
             play_now_button.click()
             logger.info(f"[{self.account_email}] Clicked 'Play Now'")
-            time.sleep(2)
+            
+            play_game_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Play Game')]"),
+                                        20, 'create.play_game')
+            if not play_game_button:
+                raise TimeoutException("'Play Game' button never became clickable")
             
             if self.bet_increase_clicks > 0:
                 self._increase_bet()
             
-            play_game_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Play Game')]"))
-            )
             play_game_button.click()
             logger.info(f"[{self.account_email}] Game created ✓")
-            time.sleep(3)
+            wait_for(self.driver, element_gone(By.XPATH, "//button[contains(., 'Play Game')]"), 5, 'create.modal_closed')
             
             return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Error creating game: {e}")
             return False
     
-    def _find_by_text_content(self):
-        cards = self.driver.find_elements(By.CSS_SELECTOR, "[data-card='true']")
-        for card in cards:
-            if 'checker' in card.text.lower() and card.is_displayed():
-                card.click()
-                time.sleep(2)
-                return True
-        return False
-    
-    def _find_by_image(self):
-        images = self.driver.find_elements(By.TAG_NAME, "img")
-        for img in images:
-            alt = (img.get_attribute("alt") or "").lower()
-            src = (img.get_attribute("src") or "").lower()
-            if 'checker' in alt or 'checker' in src:
-                if img.is_displayed():
-                    try:
-                        parent = img.find_element(By.XPATH, "./ancestor::div[@data-card='true']")
-                        parent.click()
-                        time.sleep(2)
-                        return True
-                    except:
-                        pass
-        return False
-    
-    def _find_by_javascript(self):
-        js_script = """
-        let elements = Array.from(document.querySelectorAll('*')).filter(el => 
-            el.textContent && el.textContent.toLowerCase().includes('checker')
-        );
-        for (let el of elements) {
-            if (el.offsetParent !== null) {
-                let clickable = el.closest('[data-card="true"]');
-                if (clickable) {
-                    clickable.click();
-                    return true;
-                }
-            }
-        }
-        return false;
-        """
-        return self.driver.execute_script(js_script)
-    
     def _increase_bet(self):
         logger.info(f"[{self.account_email}] Increasing bet ({self.bet_increase_clicks} clicks)")
         for i in range(self.bet_increase_clicks):
@@ -295,17 +239,17 @@ class CheckersUltraExpertBot:
                     "//svg[.//line[@x1='12' and @y1='5']]//ancestor::button")
                 if plus_button.is_displayed():
                     plus_button.click()
-                    time.sleep(0.3)
+                    pause(0.3, 'create.bet_click')
             except:
                 break
     
     def wait_for_opponent(self, timeout=900):
         """Wait for opponent"""
         logger.info(f"[{self.account_email}] Waiting for opponent (max {timeout}s)")
-        start_time = time.time()
+        start_time = CLOCK.time()
         last_iframe_count = 0
         
-        while time.time() - start_time < timeout:
+        while CLOCK.time() - start_time < timeout:
             try:
                 iframes = self.driver.find_elements(By.CSS_SELECTOR, "iframe")
                 
@@ -320,7 +264,7 @@ class CheckersUltraExpertBot:
                         
                         if "checker" in src.lower() or "game" in src.lower():
                             logger.info(f"[{self.account_email}] ✓ Opponent joined! (Game iframe detected)")
-                            time.sleep(3)
+                            self.popup_guard.resume()
                             return True
                 
                 # Check for grid structure appearing
@@ -334,20 +278,20 @@ class CheckersUltraExpertBot:
                                 "div[class*='aspect-square']")
                             if len(squares) == 64:
                                 logger.info(f"[{self.account_email}] ✓ Opponent joined! (Board detected)")
-                                time.sleep(2)
+                                self.popup_guard.resume()
                                 return True
                 except:
                     pass
                 
-                elapsed = int(time.time() - start_time)
+                elapsed = int(CLOCK.time() - start_time)
                 if elapsed % 30 == 0:
                     logger.info(f"[{self.account_email}] Still waiting... {elapsed}s elapsed")
                 
-                time.sleep(2)
+                pause(2, 'opponent.poll')
                 
             except Exception as e:
                 logger.error(f"[{self.account_email}] Error while waiting: {e}")
-                time.sleep(2)
+                CLOCK.sleep(2)
         
         logger.warning(f"[{self.account_email}] ✗ Timeout - no opponent after {timeout}s")
         return False
@@ -356,7 +300,7 @@ class CheckersUltraExpertBot:
         """Switch to game iframe"""
         try:
             logger.info(f"[{self.account_email}] Looking for game iframe...")
-            time.sleep(1)
+            wait_for(self.driver, element_present(By.CSS_SELECTOR, "iframe"), 5, 'game.iframe_present')
             
             iframes = self.driver.find_elements(By.CSS_SELECTOR, "iframe")
             logger.info(f"[{self.account_email}] Found {len(iframes)} total iframes")
@@ -374,32 +318,22 @@ class CheckersUltraExpertBot:
                         # Quick wait for grid board
                         logger.info(f"[{self.account_email}] Waiting for grid board (max 10s)...")
                         
-                        for wait_attempt in range(5):
-                            try:
-                                grids = self.driver.find_elements(By.CSS_SELECTOR, 
-                                    "div.grid.grid-cols-8, div[class*='grid-cols-8']")
-                                
-                                if grids:
-                                    squares = self.driver.find_elements(By.CSS_SELECTOR, 
-                                        "div[class*='aspect-square']")
-                                    
-                                    if len(squares) == 64:
-                                        # Check for pieces
-                                        piece_images = self.driver.find_elements(By.CSS_SELECTOR, 
-                                            "div[class*='aspect-square'] img")
-                                        piece_count = sum(1 for img in piece_images if img.is_displayed())
-                                        
-                                        if piece_count >= 5:
-                                            logger.info(f"[{self.account_email}] ✓ Board ready with {piece_count} pieces")
-                                            return True
-                                        
-                                        logger.debug(f"[{self.account_email}] Found {piece_count} pieces, waiting...")
-                                
-                                time.sleep(2)
-                            except Exception as e:
-                                logger.debug(f"[{self.account_email}] Check attempt {wait_attempt+1}: {e}")
-                                time.sleep(1)
-                        
+                        def board_ready(driver):
+                            squares = driver.find_elements(By.CSS_SELECTOR,
+                                "div.grid.grid-cols-8 div[class*='aspect-square'], "
+                                "div[class*='grid-cols-8'] div[class*='aspect-square']")
+                            if len(squares) < 64:
+                                return False
+                            piece_images = driver.find_elements(By.CSS_SELECTOR,
+                                "div[class*='aspect-square'] img")
+                            piece_count = sum(1 for img in piece_images if img.is_displayed())
+                            return piece_count if piece_count >= 5 else False
+
+                        piece_count = wait_for(self.driver, board_ready, 10, 'game.board_ready', poll=0.5)
+                        if piece_count:
+                            logger.info(f"[{self.account_email}] ✓ Board ready with {piece_count} pieces")
+                            return True
+
                         logger.warning(f"[{self.account_email}] Board timeout, proceeding anyway")
                         return True
                         
@@ -420,35 +354,17 @@ class CheckersUltraExpertBot:
         
         try:
             # Find grid container
-            grid_selectors = [
-                "div.grid.grid-cols-8",
-                "div[class*='grid-cols-8']",
-                "div[class*='board-responsive']"
-            ]
-            
-            grid = None
-            for selector in grid_selectors:
-                try:
-                    grids = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if grids:
-                        grid = grids[0]
-                        break
-                except:
-                    continue
+            grids, _ = SELECTORS.find(self.driver, 'checkers.grid')
+            grid = grids[0] if grids else None
             
             if not grid:
                 logger.error(f"[{self.account_email}] Could not find grid container")
                 return board
             
             # Get all square divs
-            squares = []
-            for selector in ["div[class*='aspect-square']", "div.w-full.aspect-square", "> div"]:
-                try:
-                    squares = grid.find_elements(By.CSS_SELECTOR, selector)
-                    if len(squares) == 64:
-                        break
-                except:
-                    continue
+            squares, _ = SELECTORS.find(grid, 'checkers.squares')
+            if not squares:
+                squares = grid.find_elements(By.CSS_SELECTOR, "div[class*='aspect-square']")
             
             if len(squares) != 64:
                 logger.warning(f"[{self.account_email}] Expected 64 squares, found {len(squares)}")
@@ -513,11 +429,11 @@ class CheckersUltraExpertBot:
             if bottom_rows_A > bottom_rows_B:
                 type_to_player['A'] = 'player1'
                 type_to_player['B'] = 'player2'
-                logger.info(f"[{self.account_email}] Piece mapping: Type A=player1 (bottom), Type B=player2 (top)")
+                logger.info(f"[{self.account_email}] Piece mapping: Type A=player1 (bottom), Type B=player2 (top)", extra=LOG_READ)
             else:
                 type_to_player['B'] = 'player1'
                 type_to_player['A'] = 'player2'
-                logger.info(f"[{self.account_email}] Piece mapping: Type B=player1 (bottom), Type A=player2 (top)")
+                logger.info(f"[{self.account_email}] Piece mapping: Type B=player1 (bottom), Type A=player2 (top)", extra=LOG_READ)
             
             # Third pass: Convert type to actual player
             for row in range(8):
@@ -709,22 +625,15 @@ class CheckersUltraExpertBot:
             logger.info(f"[{self.account_email}] Executing move from ({from_r},{from_c}) idx={from_idx}")
             
             # Find grid
-            grid = None
-            for selector in ["div.grid.grid-cols-8", "div[class*='grid-cols-8']"]:
-                try:
-                    grids = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if grids:
-                        grid = grids[0]
-                        break
-                except:
-                    continue
+            grids, _ = SELECTORS.find(self.driver, 'checkers.move_grid')
+            grid = grids[0] if grids else None
             
             if not grid:
                 logger.error(f"[{self.account_email}] Cannot find grid")
                 return False
             
             # Get all squares
-            squares = grid.find_elements(By.CSS_SELECTOR, "div[class*='aspect-square']")
+            squares, _ = SELECTORS.find(grid, 'checkers.squares')
             
             if len(squares) < 64:
                 logger.error(f"[{self.account_email}] Not enough squares: {len(squares)}")
@@ -743,7 +652,7 @@ class CheckersUltraExpertBot:
                     "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", 
                     source
                 )
-                time.sleep(0.3)
+                source_class = source.get_attribute('class') or ''
                 
                 # Try clicking
                 try:
@@ -753,7 +662,7 @@ class CheckersUltraExpertBot:
                     self.driver.execute_script("arguments[0].click();", source)
                 
                 logger.info(f"[{self.account_email}] ✓ Selected square {from_idx} ({from_r},{from_c})")
-                time.sleep(0.6)
+                wait_for(self.driver, square_highlighted(source, source_class), 0.6, 'move.square_selected')
                 
             except Exception as e:
                 logger.error(f"[{self.account_email}] Failed to select source: {e}")
@@ -764,7 +673,7 @@ class CheckersUltraExpertBot:
                     if imgs:
                         self.driver.execute_script("arguments[0].click();", imgs[0])
                         logger.info(f"[{self.account_email}] ✓ Selected via image")
-                        time.sleep(0.6)
+                        wait_for(self.driver, square_highlighted(source, ''), 0.6, 'move.square_selected')
                 except:
                     return False
             
@@ -783,7 +692,6 @@ class CheckersUltraExpertBot:
                         "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", 
                         dest
                     )
-                    time.sleep(0.3)
                     
                     try:
                         dest.click()
@@ -792,14 +700,15 @@ class CheckersUltraExpertBot:
                     
                     logger.info(f"[{self.account_email}] ✓ Moved to square {to_idx} ({to_r},{to_c}) "
                               f"[step {step_idx+1}/{len(move['path'])}]")
-                    time.sleep(0.5)
+                    is_last_step = step_idx == len(move['path']) - 1
+                    wait_for(self.driver, square_has_piece(dest), 1.5 if is_last_step else 0.5,
+                             'move.piece_landed')
                     
                 except Exception as e:
                     logger.error(f"[{self.account_email}] Failed to click destination {to_idx}: {e}")
                     return False
             
             logger.info(f"[{self.account_email}] ★ Move completed successfully ★")
-            time.sleep(1)
             return True
             
         except Exception as e:
@@ -811,6 +720,8 @@ class CheckersUltraExpertBot:
     def calculate_best_move_ultra_expert(self, board, player):
         """ULTRA EXPERT AI with deep minimax - FIXED FOR PLAYER1/PLAYER2"""
         start_time = time.time()
+        # Filled in as the search runs, read by the move tracer
+        search = self.last_search = {'depth': None, 'nodes': 0, 'score': None}
         
         def board_hash(b):
             return tuple(tuple(
@@ -897,6 +808,7 @@ class CheckersUltraExpertBot:
         
         def minimax_ultra(b, depth, alpha, beta, maximizing):
             """Ultra deep minimax with alpha-beta"""
+            search['nodes'] += 1
             if time.time() - start_time > 14.5:
                 return None, evaluate_position_ultra(b, player)
             
@@ -970,9 +882,10 @@ class CheckersUltraExpertBot:
         else:
             depth = self.ai_end_depth
         
-        logger.info(f"[{self.account_email}] ULTRA EXPERT depth {depth} (pieces: {total_pieces})...")
+        logger.info(f"[{self.account_email}] ULTRA EXPERT depth {depth} (pieces: {total_pieces})...", extra=LOG_SEARCH)
         
         move, score = minimax_ultra(deepcopy(board), depth, float('-inf'), float('inf'), True)
+        search.update(depth=depth, score=score)
         
         calc_time = time.time() - start_time
         logger.info(f"[{self.account_email}] ★ ULTRA EXPERT DEPTH {depth} ★ Time: {calc_time:.2f}s, Score: {score:,}")
@@ -1127,76 +1040,60 @@ class CheckersUltraExpertBot:
         no_turn_count = 0
         consecutive_failed_moves = 0
         iframe_switch_failures = 0
-        time.sleep(2)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "div[class*='aspect-square'] img"), 5, 'game.board_ready')
         
         self.detect_my_color()
-        
+        probe = GameProbe(self.driver, 'checkers', "iframe[src*='checker' i]")
+        self.tracer.start_game(self.driver.execute_script("return location.href"))
+        self.recorder.start_game(self.tracer.game_id, self.my_color)
+        result = None
+
         while move_count < max_moves:
             try:
-                # Switch to default
-                try:
-                    self.driver.switch_to.default_content()
-                except:
-                    pass
-                
-                self.close_popups()
-                
-                # Switch to game iframe
-                if self.game_iframe:
-                    try:
-                        self.driver.switch_to.frame(self.game_iframe)
-                        iframe_switch_failures = 0
-                    except Exception as e:
-                        logger.warning(f"[{self.account_email}] Failed to switch to saved iframe: {e}")
-                        iframe_switch_failures += 1
-                        
-                        if iframe_switch_failures <= 3:
-                            logger.info(f"[{self.account_email}] Attempting to re-locate iframe...")
-                            if not self.switch_to_game_iframe():
-                                if iframe_switch_failures >= 3:
-                                    logger.error(f"[{self.account_email}] Cannot find iframe after 3 attempts")
-                                    break
-                                time.sleep(2)
-                                continue
-                        else:
-                            logger.error(f"[{self.account_email}] Too many iframe switch failures")
-                            break
-                else:
+                if not self.game_iframe:
                     logger.info(f"[{self.account_email}] No saved iframe, searching...")
                     if not self.switch_to_game_iframe():
                         logger.error(f"[{self.account_email}] Could not locate game iframe")
                         break
-                
+
+                state = self.tracer.probe(probe, self.game_iframe)
+
                 # Check game over
-                if self.check_game_over():
-                    logger.info(f"[{self.account_email}] Game finished")
+                if state.game_over:
+                    logger.info(f"[{self.account_email}] Game finished ({state.result or 'iframe closed'})")
+                    result = state.result
                     break
-                
-                # Read board
-                board = self.read_board_state()
+
+                if not state.frame_ok:
+                    iframe_switch_failures += 1
+                    logger.warning(f"[{self.account_email}] Could not probe saved iframe "
+                                   f"(failures: {iframe_switch_failures})")
+                    if iframe_switch_failures > 3:
+                        logger.error(f"[{self.account_email}] Too many iframe switch failures")
+                        break
+                    self.driver.switch_to.default_content()
+                    if not self.switch_to_game_iframe():
+                        CLOCK.sleep(2)
+                    continue
+                iframe_switch_failures = 0
+
+                if state.popup_present:
+                    self.driver.switch_to.default_content()
+                    self.close_popups()
+                    self.driver.switch_to.frame(self.game_iframe)
+                    continue
+
+                board = state.board
                 piece_count = sum(1 for r in board for c in r if c)
-                
+
                 if piece_count == 0:
-                    logger.warning(f"[{self.account_email}] Empty board, quick retry...")
-                    
-                    for retry in range(3):
-                        time.sleep(2)
-                        board = self.read_board_state()
-                        piece_count = sum(1 for r in board for c in r if c)
-                        
-                        if piece_count > 0:
-                            logger.info(f"[{self.account_email}] ✓ Board loaded with {piece_count} pieces")
-                            break
-                    
-                    if piece_count == 0:
-                        logger.warning(f"[{self.account_email}] Board still empty after retries")
-                        continue
-                
-                # Check turn
-                is_my_turn = self.is_my_turn()
-                
-                if is_my_turn:
+                    logger.warning(f"[{self.account_email}] Empty board, waiting for pieces...")
+                    CLOCK.sleep(2)
+                    continue
+
+                if state.my_turn:
                     no_turn_count = 0
+                    self.tracer.turn_detected()
                     logger.info(f"[{self.account_email}] ══════ Move {move_count + 1} ({self.my_color.upper()}) ══════")
                     
                     # Get moves
@@ -1204,30 +1101,39 @@ class CheckersUltraExpertBot:
                     
                     if not all_moves:
                         logger.warning(f"[{self.account_email}] No valid moves available!")
-                        time.sleep(1)
+                        CLOCK.sleep(1)
                         board = self.read_board_state()
                         all_moves = self.get_all_moves_for_player(board, self.my_color)
                         
                         if not all_moves:
                             logger.error(f"[{self.account_email}] Still no moves - game may be over")
-                            time.sleep(3)
+                            CLOCK.sleep(3)
                             break
                     
                     logger.info(f"[{self.account_email}] Found {len(all_moves)} possible moves")
                     
                     # Calculate best move
-                    move = self.calculate_best_move_ultra_expert(board, self.my_color)
+                    with self.tracer.span('engine') as search:
+                        move = self.calculate_best_move_ultra_expert(board, self.my_color)
+                        search.update(self.last_search)
                     
                     if move:
                         logger.info(f"[{self.account_email}] Selected: {move['from']} -> {move['path']} "
                                   f"(type: {move['type']})")
                         
-                        if self.make_move(move):
+                        with self.tracer.span('click'):
+                            moved = self.make_move(move)
+                        if moved:
                             move_count += 1
                             consecutive_failed_moves = 0
+                            self.recorder.move([move['from']] + move['path'], board, search)
                             logger.info(f"[{self.account_email}] ★ Move {move_count} completed ★")
-                            time.sleep(2)
-                        else:
+                            with self.tracer.span('confirm'):
+                                wait_for(self.driver, lambda driver: not self.is_my_turn(), 2, 'game.turn_handover', poll=0.5)
+                            if self.commands:
+                                self.commands.move_done(f"{move['from']} -> {move['path'][-1]}")
+                        self.tracer.move_done(f"{move['from']} -> {move['path'][-1]}", ok=moved)
+                        if not moved:
                             consecutive_failed_moves += 1
                             logger.error(f"[{self.account_email}] ✗ Failed to execute move "
                                        f"(failures: {consecutive_failed_moves})")
@@ -1236,7 +1142,7 @@ class CheckersUltraExpertBot:
                                 logger.error(f"[{self.account_email}] Too many failures, breaking")
                                 break
                             
-                            time.sleep(2)
+                            CLOCK.sleep(2)
                     else:
                         logger.error(f"[{self.account_email}] AI returned no move")
                         consecutive_failed_moves += 1
@@ -1244,12 +1150,12 @@ class CheckersUltraExpertBot:
                         if consecutive_failed_moves >= 3:
                             break
                         
-                        time.sleep(2)
+                        CLOCK.sleep(2)
                 else:
                     no_turn_count += 1
                     if no_turn_count % 5 == 0:
                         logger.info(f"[{self.account_email}] Waiting for turn... ({no_turn_count}s)")
-                    time.sleep(1)
+                    pause(1, 'game.opponent_turn')
                 
                 if no_turn_count > 60:
                     logger.warning(f"[{self.account_email}] Waited 60s, checking game status")
@@ -1260,13 +1166,13 @@ class CheckersUltraExpertBot:
             except StaleElementReferenceException:
                 logger.warning(f"[{self.account_email}] Stale element, refreshing...")
                 self.game_iframe = None
-                time.sleep(2)
+                CLOCK.sleep(2)
                 continue
             except Exception as e:
                 logger.error(f"[{self.account_email}] Error in game loop: {e}")
                 import traceback
                 traceback.print_exc()
-                time.sleep(2)
+                CLOCK.sleep(2)
                 
                 try:
                     self.driver.switch_to.default_content()
@@ -1276,42 +1182,44 @@ class CheckersUltraExpertBot:
                 except:
                     break
         
+        self.recorder.finish(result)
         logger.info(f"[{self.account_email}] Game completed after {move_count} moves")
-        time.sleep(3)
     
     def handle_post_game(self):
         """Return to dashboard"""
+        if self.commands:
+            self.commands.game_done()
         try:
             logger.info(f"[{self.account_email}] Handling post-game")
             self.driver.switch_to.default_content()
-            time.sleep(2)
+            logger.info(f"[{self.account_email}] Popup guard dismissed {self.popup_guard.closed_count()} popup(s) this game")
             
-            try:
-                back_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Back to Home')]"))
-                )
+            back_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Back to Home')]"),
+                                   12, 'post.back_button')
+            if back_button:
                 back_button.click()
-            except:
+            else:
                 self.driver.get(self.dashboard_url)
             
-            time.sleep(3)
+            wait_for(self.driver, url_contains('dashboard'), 5, 'post.dashboard')
             return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Error in post-game: {e}")
             return False
     
     def quit(self):
-        """Close browser"""
+        """Close browser (or hand it back to the pool) and cleanup"""
+        if self.commands:
+            self.commands.uninstall()
+        if self.browser_pool:
+            self.popup_guard.uninstall()
+            self.browser_pool.release(self.driver)
+            logger.info(f"[{self.account_email}] Browser returned to pool")
+            return
         try:
             self.driver.quit()
             logger.info(f"[{self.account_email}] Browser closed")
-            
-            try:
-                import shutil
-                if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
-                    shutil.rmtree(self.user_data_dir, ignore_errors=True)
-            except:
-                pass
+            remove_profile(self.user_data_dir)
         except:
             pass
 
@@ -1353,6 +1261,8 @@ def load_accounts_config(config_path="accounts.json"):
         checkers_config = {
             'accounts': checkers_accounts,
             'settings': {
+                # Shared keys (browser, session_cache, dashboard_url, ...) pass through unchanged
+                **settings,
                 'headless': settings.get('headless', True),
                 'opponent_wait_timeout': settings.get('opponent_wait_timeout', 900),
                 'wait_between_games': settings.get('wait_between_games', 10),
@@ -1396,7 +1306,7 @@ def run_bot_session(account, settings):
     start_delay = account.get('_start_delay', 0)
     if start_delay > 0:
         logger.info(f"[{email}] Waiting {start_delay}s before starting")
-        time.sleep(start_delay)
+        CLOCK.sleep(start_delay)
     
     logger.info(f"[{email}] ╔══════════════════════════════════════╗")
     logger.info(f"[{email}] Starting session - {games_to_play} games")
@@ -1408,7 +1318,15 @@ def run_bot_session(account, settings):
             account_email=email,
             account_password=password,
             bet_increase_clicks=bet_clicks,
-            headless=settings.get('headless', True)
+            headless=settings.get('headless', True),
+            browser_pool=settings.get('_browser_pool'),
+            session_store=settings.get('_session_store'),
+            lean_profile=settings.get('browser', {}).get('lean'),
+            dashboard_url=settings.get('dashboard_url', "https://app.gameonworld.ai/dashboard"),
+            login_url=settings.get('login_url', "https://app.gameonworld.ai/auth/login"),
+            webdriver_metrics=settings.get('webdriver_metrics'),
+            move_trace=settings.get('move_trace'),
+            game_records=settings.get('game_records')
         )
         
         bot.ai_early_depth = early_depth
@@ -1424,18 +1342,24 @@ def run_bot_session(account, settings):
     games_succeeded = 0
     
     try:
+        METRICS.session_started('checkers')
         bot.start()
         
+        bot.recorder.begin()
         if not bot.login(email, password):
             logger.error(f"[{email}] Login failed")
             return {"email": email, "games_played": 0, "games_succeeded": 0, "success": False}
+        bot.recorder.mark('login')
         
         for game_num in range(1, games_to_play + 1):
             logger.info(f"[{email}] ─── Game {game_num}/{games_to_play} ───")
             
             try:
+                bot.recorder.begin()
                 if bot.create_game():
+                    bot.recorder.mark('create_game')
                     if bot.wait_for_opponent(timeout=settings.get('opponent_wait_timeout', 900)):
+                        bot.recorder.mark('wait_for_opponent')
                         if bot.switch_to_game_iframe():
                             bot.play_game()
                             bot.handle_post_game()
@@ -1446,17 +1370,17 @@ def run_bot_session(account, settings):
                             if game_num < games_to_play:
                                 wait_time = settings.get('wait_between_games', 10)
                                 logger.info(f"[{email}] Waiting {wait_time}s before next game")
-                                time.sleep(wait_time)
+                                CLOCK.sleep(wait_time)
                     else:
                         logger.warning(f"[{email}] No opponent for game {game_num}")
                         games_played += 1
                         tracker.game_done(False)
                         bot.driver.get(bot.dashboard_url)
-                        time.sleep(3)
+                        wait_for(bot.driver, document_ready(), 10, 'session.dashboard_reload')
                 else:
                     logger.error(f"[{email}] Failed to create game {game_num}")
                     tracker.game_done(False)
-                    time.sleep(10)
+                    CLOCK.sleep(10)
             except Exception as e:
                 logger.error(f"[{email}] Error in game {game_num}: {e}")
                 games_played += 1
@@ -1477,6 +1401,7 @@ def run_bot_session(account, settings):
     finally:
         if bot:
             bot.quit()
+            METRICS.session_finished('checkers')
 
 
 def main():
@@ -1491,6 +1416,9 @@ def main():
     
     accounts = config.get('accounts', [])
     settings = config.get('settings', {})
+    configure_logging(settings.get('logging'))
+    start_metrics_server(settings)
+    configure_clock(settings)
     
     enabled_accounts = [acc for acc in accounts if acc.get('enabled', True)]
     
@@ -1504,35 +1432,58 @@ def main():
     logger.info(f"Processing {len(enabled_accounts)} accounts with max {max_parallel} parallel")
     logger.info(f"Stagger delay: {stagger_delay}s between account starts")
     
+    # The controller adjusts the active session count to the host's headroom
+    # and spaces session starts itself; without it, stagger them up front
+    controller = create_concurrency_controller(settings, max_parallel)
+    ceiling = controller.max_sessions if controller else max_parallel
     for i, account in enumerate(enabled_accounts):
-        account['_start_delay'] = i * stagger_delay
+        account['_start_delay'] = 0 if controller else i * stagger_delay
     
     results = []
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
-        future_to_account = {
-            executor.submit(run_bot_session, account, settings): account 
-            for account in enabled_accounts
-        }
+    # Restore saved logins instead of replaying the form every run
+    session_settings = settings.get('session_cache', {})
+    if session_settings.get('enabled', True):
+        settings['_session_store'] = SessionStore(
+            directory=session_settings.get('directory'),
+            max_age_hours=session_settings.get('max_age_hours', 72)
+        )
+    
+    # Keep warm Chrome instances (or browser contexts) alive across account sessions
+    browser_pool = create_browser_pool(settings, ceiling)
+    settings['_browser_pool'] = browser_pool
+    
+    session_func = controller.wrap(run_bot_session) if controller else run_bot_session
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ceiling) as executor:
+            future_to_account = {
+                executor.submit(session_func, account, settings): account 
+                for account in enabled_accounts
+            }
         
-        for future in concurrent.futures.as_completed(future_to_account):
-            account = future_to_account[future]
-            try:
-                result = future.result()
-                results.append(result)
+            for future in concurrent.futures.as_completed(future_to_account):
+                account = future_to_account[future]
+                try:
+                    result = future.result()
+                    results.append(result)
                 
-                acc_done, games_done, games_succ = tracker.get_stats()
-                logger.info(f"╠═══ PROGRESS: {acc_done}/{len(enabled_accounts)} accounts, "
-                           f"{games_succ}/{games_done} games succeeded ═══╣")
+                    acc_done, games_done, games_succ = tracker.get_stats()
+                    logger.info(f"╠═══ PROGRESS: {acc_done}/{len(enabled_accounts)} accounts, "
+                               f"{games_succ}/{games_done} games succeeded ═══╣")
                 
-            except Exception as e:
-                logger.error(f"[{account['email']}] Thread exception: {e}")
-                results.append({
-                    "email": account['email'],
-                    "games_played": 0,
-                    "games_succeeded": 0,
-                    "success": False
-                })
+                except Exception as e:
+                    logger.error(f"[{account['email']}] Thread exception: {e}")
+                    results.append({
+                        "email": account['email'],
+                        "games_played": 0,
+                        "games_succeeded": 0,
+                        "success": False
+                    })
+    finally:
+        if controller:
+            controller.stop()
+        if browser_pool:
+            browser_pool.shutdown()
     
     # Summary
     logger.info("\n╔══════════════════════════════════════════════════════════════════╗")
@@ -1556,6 +1507,8 @@ def main():
     logger.info(f"║ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                f"{' ' * 37}║")
     logger.info("╚══════════════════════════════════════════════════════════════════╝")
+    
+    WAIT_STATS.log_report(logger)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,6 @@ Connect 4 Multi-Account PARALLEL Bot
 ULTRA-GODMODE AI with Opponent Prediction & Multi-Move Analysis
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -22,23 +21,35 @@ import threading
 from queue import Queue
 import concurrent.futures
 
+from game_probe import GameProbe
+from popup_guard import PopupGuard
+from webdriver_metrics import create_command_metrics
+from move_trace import MoveTracer
+from connect4_threats import analyze_threats, DEFAULT_DEPTH
+from game_records import GameRecorder
+from metrics_server import METRICS, start_metrics_server
+from virtual_clock import CLOCK, configure_clock
+from browser_pool import create_browser_pool, launch_chrome, remove_profile
+from concurrency_controller import create_concurrency_controller
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible_enabled
+from log_pipeline import setup_logging, configure_logging, LOG_SEARCH
+from session_store import SessionStore
+from wait_utils import (WAIT_STATS, wait_for, pause, element_clickable, element_present,
+                        element_visible, element_gone, url_contains, document_ready,
+                        connect4_column_count, piece_in_column)
+
 # Configure logging
 LOG_DIR = Path("/home/user/Gameon-AI-Bots/logs")
 LOG_DIR.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / f'bot_ultra_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+setup_logging(LOG_DIR / f'bot_ultra_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
 logger = logging.getLogger(__name__)
 
 # Thread-safe counter for tracking progress
 class ProgressTracker:
-    def __init__(self):
+    def __init__(self, game_type):
+        self.game_type = game_type
         self.lock = threading.Lock()
         self.accounts_completed = 0
         self.games_completed = 0
@@ -53,52 +64,32 @@ class ProgressTracker:
             self.games_completed += 1
             if succeeded:
                 self.games_succeeded += 1
+        if not succeeded:
+            METRICS.game_failed(self.game_type)
     
     def get_stats(self):
         with self.lock:
             return self.accounts_completed, self.games_completed, self.games_succeeded
 
-tracker = ProgressTracker()
+tracker = ProgressTracker('connect4')
 
 
 class Connect4HostBot:
     def __init__(self, account_email, account_password, dashboard_url="https://app.gameonworld.ai/dashboard", 
-                 difficulty="ultra_expert", bet_increase_clicks=0, headless=True):
-        
-        # Create unique user data directory for this account to prevent conflicts
-        import hashlib
-        account_hash = hashlib.md5(account_email.encode()).hexdigest()[:8]
-        user_data_dir = f"/tmp/chrome_profile_{account_hash}_{int(time.time())}"
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        
-        # CRITICAL: Each instance gets its own profile to prevent conflicts
-        options.add_argument(f'--user-data-dir={user_data_dir}')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-dev-shm-usage')
-        
-        # Additional isolation
-        options.add_argument('--remote-debugging-port=0')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-        
-        if headless:
-            options.add_argument('--headless=new')
-        
-        # Add random window size for better isolation
-        window_width = 1920 + random.randint(-100, 100)
-        window_height = 1080 + random.randint(-100, 100)
-        options.add_argument(f'--window-size={window_width},{window_height}')
+                 difficulty="ultra_expert", bet_increase_clicks=0, headless=True, browser_pool=None, session_store=None,
+                 lean_profile=None, login_url="https://app.gameonworld.ai/auth/login", webdriver_metrics=None,
+                 move_trace=None, game_records=None, threat_depth=DEFAULT_DEPTH):
         
-        self.driver = webdriver.Chrome(options=options)
+        self.browser_pool = browser_pool
+        if browser_pool:
+            # Warm instance or fresh browser context from the shared pool
+            self.driver = browser_pool.acquire()
+            self.user_data_dir = None
+        else:
+            self.driver, self.user_data_dir = launch_chrome(account_email, headless, lean_profile)
         self.wait = WebDriverWait(self.driver, 20)
         self.dashboard_url = dashboard_url
+        self.login_url = login_url
         self.game_iframe = None
         self.difficulty = difficulty
         self.bet_increase_clicks = bet_increase_clicks
@@ -106,41 +97,36 @@ class Connect4HostBot:
         self.my_player = None
         self.move_timeout = 10
         self.account_email = account_email
-        self.user_data_dir = user_data_dir
+        self.session_store = session_store
+        # WebDriver round trips per calling method, None unless enabled in settings
+        self.commands = create_command_metrics(self.driver, self, account_email, webdriver_metrics)
+        self.tracer = MoveTracer(account_email, 'connect4', move_trace)
+        self.recorder = GameRecorder(account_email, 'connect4', game_records)
+        self.last_search = {}
+        self.threat_depth = threat_depth
+        self.popup_guard = PopupGuard(self.driver, account_email)
+        self.popup_guard.install()
         logger.info(f"[{account_email}] Bot initialized - ULTRA-GODMODE AI with Opponent Prediction")
         
     def start(self):
         """Navigate to login page"""
-        time.sleep(random.uniform(0.5, 2.0))
-        self.driver.get("https://app.gameonworld.ai/auth/login")
-        time.sleep(2)
+        CLOCK.sleep(random.uniform(0.5, 2.0))
+        self.driver.get(self.login_url)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "input[type='email']"), 10, 'login.page_loaded')
         logger.info(f"[{self.account_email}] Login page loaded")
     
     def close_popups(self):
         """Close any popups"""
         try:
-            close_selectors = [
-                "button.absolute.top-3.right-3",
-                "button svg[viewBox='0 0 512 512']//ancestor::button",
-                "button[aria-label='Close']",
-                "button[aria-label='close']",
-                "button.close",
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for button in close_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button.click()
-                            time.sleep(0.5)
-                            return True
-                except:
-                    continue
+            buttons, _ = SELECTORS.find(self.driver, 'popup.close', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                CLOCK.sleep(0.5)
+                return True
             
             try:
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                time.sleep(0.3)
+                CLOCK.sleep(0.3)
             except:
                 pass
             return False
@@ -151,7 +137,13 @@ class Connect4HostBot:
         """Login to platform"""
         try:
             logger.info(f"[{email}] Logging in...")
-            time.sleep(random.uniform(1.0, 3.0))
+            
+            if self.session_store and self.session_store.restore(self.driver, email, self.dashboard_url,
+                                                                 login_url=self.login_url):
+                self.popup_guard.sweep()
+                return True
+            
+            pause(random.uniform(1.0, 3.0), 'login.human_pacing')
             
             email_input = self.wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email'][placeholder='Email']"))
@@ -159,14 +151,14 @@ class Connect4HostBot:
             password_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password'][placeholder='Password']")
             
             email_input.clear()
-            time.sleep(0.3)
+            pause(0.3, 'login.human_pacing')
             email_input.send_keys(email)
-            time.sleep(random.uniform(0.5, 1.0))
+            pause(random.uniform(0.5, 1.0), 'login.human_pacing')
             
             password_input.clear()
-            time.sleep(0.3)
+            pause(0.3, 'login.human_pacing')
             password_input.send_keys(password)
-            time.sleep(random.uniform(0.5, 1.0))
+            pause(random.uniform(0.5, 1.0), 'login.human_pacing')
             
             login_button = self.driver.find_element(By.XPATH, "//button[@type='submit' and contains(text(), 'Login')]")
             login_button.click()
@@ -174,13 +166,13 @@ class Connect4HostBot:
             WebDriverWait(self.driver, 15).until(
                 lambda driver: "login" not in driver.current_url.lower()
             )
-            time.sleep(2)
+            wait_for(self.driver, document_ready(), 5, 'login.dashboard_ready')
             
-            for i in range(5):
-                if self.close_popups():
-                    time.sleep(0.5)
+            self.popup_guard.sweep()
             
             logger.info(f"[{email}] Login successful ✓")
+            if self.session_store:
+                self.session_store.save(self.driver, email)
             return True
         except Exception as e:
             logger.error(f"[{email}] Login error: {e}")
@@ -200,118 +192,47 @@ class Connect4HostBot:
             current_url = self.driver.current_url
             if "dashboard" not in current_url:
                 self.driver.get(self.dashboard_url)
-                time.sleep(3)
+                wait_for(self.driver, document_ready(), 10, 'create.dashboard_loaded')
             
-            self.close_popups()
-            time.sleep(2)
+            self.popup_guard.resume()
+            # The card opens the create-game modal, keep it open until the game starts
+            self.popup_guard.pause()
             
             self.driver.execute_script("window.scrollTo(0, 400);")
-            time.sleep(1)
-            
-            connect4_found = False
-            strategies = [
-                self._find_by_card_structure,
-                self._find_by_image_alt,
-                self._find_by_heading,
-                self._find_by_image_src,
-                self._find_by_javascript
-            ]
-            
-            for strategy in strategies:
-                try:
-                    if strategy():
-                        connect4_found = True
-                        break
-                except:
-                    continue
+            wait_for(self.driver, element_present(By.CSS_SELECTOR, "[data-card='true']"), 5, 'create.cards_loaded')
             
-            if not connect4_found:
+            # All fallback strategies run in the page, last winner first
+            connect4_card, strategy = locate_card(self.driver, 'connect4')
+            if not connect4_card:
                 logger.error(f"[{self.account_email}] Could not find Connect 4 card")
                 return False
+            logger.info(f"[{self.account_email}] Connect 4 card found ({strategy})")
+            connect4_card.click()
             
-            time.sleep(2)
-            
-            play_now_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Play Now')]"))
-            )
+            play_now_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Play Now')]"),
+                                       20, 'create.play_now')
+            if not play_now_button:
+                raise TimeoutException("'Play Now' button never became clickable")
             play_now_button.click()
             logger.info(f"[{self.account_email}] Clicked 'Play Now'")
-            time.sleep(2)
+            
+            play_game_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Play Game')]"),
+                                        20, 'create.play_game')
+            if not play_game_button:
+                raise TimeoutException("'Play Game' button never became clickable")
             
             if self.bet_increase_clicks > 0:
                 self._increase_bet()
             
-            play_game_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Play Game')]"))
-            )
             play_game_button.click()
             logger.info(f"[{self.account_email}] Game created ✓")
-            time.sleep(3)
+            wait_for(self.driver, element_gone(By.XPATH, "//button[contains(., 'Play Game')]"), 5, 'create.modal_closed')
             
             return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Error creating game: {e}")
             return False
     
-    def _find_by_card_structure(self):
-        cards = self.driver.find_elements(By.CSS_SELECTOR, "[data-card='true']")
-        for card in cards:
-            if 'connect 4' in card.text.lower() and card.is_displayed():
-                card.click()
-                time.sleep(2)
-                return True
-        return False
-    
-    def _find_by_image_alt(self):
-        images = self.driver.find_elements(By.XPATH, "//img[@alt='Connect 4']")
-        for img in images:
-            if img.is_displayed():
-                parent = img.find_element(By.XPATH, "./ancestor::div[@data-card='true']")
-                parent.click()
-                time.sleep(2)
-                return True
-        return False
-    
-    def _find_by_heading(self):
-        headings = self.driver.find_elements(By.XPATH, "//h4[contains(text(), 'Connect 4')]")
-        for heading in headings:
-            if heading.is_displayed():
-                card = heading.find_element(By.XPATH, "./ancestor::div[@data-card='true']")
-                card.click()
-                time.sleep(2)
-                return True
-        return False
-    
-    def _find_by_image_src(self):
-        images = self.driver.find_elements(By.TAG_NAME, "img")
-        for img in images:
-            src = img.get_attribute("src") or ""
-            if 'c1.jpg' in src.lower() and img.is_displayed():
-                parent = img.find_element(By.XPATH, "./ancestor::div[@data-card='true']")
-                parent.click()
-                time.sleep(2)
-                return True
-        return False
-    
-    def _find_by_javascript(self):
-        js_script = """
-        let elements = Array.from(document.querySelectorAll('*')).filter(el => 
-            (el.textContent && el.textContent.includes('Connect 4')) ||
-            (el.alt && el.alt.includes('Connect 4'))
-        );
-        for (let el of elements) {
-            if (el.offsetParent !== null) {
-                let clickable = el.closest('[data-card="true"]');
-                if (clickable) {
-                    clickable.click();
-                    return true;
-                }
-            }
-        }
-        return false;
-        """
-        return self.driver.execute_script(js_script)
-    
     def _increase_bet(self):
         logger.info(f"[{self.account_email}] Increasing bet ({self.bet_increase_clicks} clicks)")
         for i in range(self.bet_increase_clicks):
@@ -320,31 +241,31 @@ class Connect4HostBot:
                     "//svg[.//line[@x1='12' and @y1='5']]//ancestor::button")
                 if plus_button.is_displayed():
                     plus_button.click()
-                    time.sleep(0.3)
+                    pause(0.3, 'create.bet_click')
             except:
                 break
     
     def wait_for_opponent(self, timeout=900):
         """Wait for opponent"""
         logger.info(f"[{self.account_email}] Waiting for opponent (max {timeout}s)")
-        start_time = time.time()
+        start_time = CLOCK.time()
         
-        while time.time() - start_time < timeout:
+        while CLOCK.time() - start_time < timeout:
             try:
                 iframes = self.driver.find_elements(By.CSS_SELECTOR, "iframe[src*='connect4']")
                 if iframes:
                     logger.info(f"[{self.account_email}] Opponent joined! ✓")
-                    time.sleep(2)
+                    self.popup_guard.resume()
                     return True
                 
-                elapsed = int(time.time() - start_time)
+                elapsed = int(CLOCK.time() - start_time)
                 if elapsed % 60 == 0:
                     logger.info(f"[{self.account_email}] Still waiting... {elapsed}s elapsed")
                 
-                time.sleep(2)
+                pause(2, 'opponent.poll')
             except Exception as e:
                 logger.error(f"[{self.account_email}] Error while waiting: {e}")
-                time.sleep(2)
+                CLOCK.sleep(2)
         
         logger.warning(f"[{self.account_email}] Timeout - no opponent after {timeout}s")
         return False
@@ -427,6 +348,8 @@ class Connect4HostBot:
         - Time-optimized to stay within 10s limit
         """
         start_time = time.time()
+        # Filled in as the search runs, read by the move tracer
+        search = self.last_search = {'depth': None, 'nodes': 0, 'score': None}
         
         # Transposition table with depth tracking
         transposition_table = {}
@@ -685,6 +608,7 @@ class Connect4HostBot:
         
         def minimax_ultra(b, depth, alpha, beta, maximizing):
             """Ultra-optimized minimax with aggressive pruning"""
+            search['nodes'] += 1
             # Time check - 9s hard limit
             if time.time() - start_time > 9.0:
                 return None, evaluate_position_advanced(b, player)
@@ -825,221 +749,32 @@ class Connect4HostBot:
             logger.info(f"[{self.account_email}] Counter-opening: Column {choice}")
             return choice
         
-        # Immediate win check
-        for col in valid_moves:
-            row = get_next_row(board, col)
-            if row is not None:
-                board[row][col] = player
-                if check_winner(board, player):
-                    board[row][col] = 0
-                    logger.info(f"[{self.account_email}] ★★★ WINNING ★★★: Column {col}")
-                    return col
-                board[row][col] = 0
-        
-        # Block opponent win
-        for col in valid_moves:
-            row = get_next_row(board, col)
-            if row is not None:
-                board[row][col] = 3 - player
-                if check_winner(board, 3 - player):
-                    board[row][col] = 0
-                    logger.info(f"[{self.account_email}] ★★ BLOCKING ★★: Column {col}")
-                    return col
-                board[row][col] = 0
+        # Threat-space search: immediate wins, must-blocks, forced sequences,
+        # and the moves that would hand the opponent one
+        threats = analyze_threats(board, player, self.threat_depth)
+        search['nodes'] += threats['nodes']
+        if threats['win'] is not None:
+            logger.info(f"[{self.account_email}] ★★★ WINNING ★★★: Column {threats['win']}")
+            return threats['win']
         
-        # === TACTICAL ANALYSIS (only after sufficient pieces are on board) ===
-        # Early game: focus on positioning, not tactics
-        # Mid-late game: tactical opportunities become critical
-        
-        use_advanced_tactics = total_pieces >= 10  # Only use tactics after 10+ pieces
-        
-        if use_advanced_tactics:
-            # Check for double threat opportunities (creates 2+ winning threats in one move)
-            logger.info(f"[{self.account_email}] Scanning for double threats...")
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = player
-                    
-                    # Count how many winning threats this move creates
-                    threats_created = 0
-                    winning_positions = []
-                    
-                    # Check all possible next moves for wins
-                    for next_col in range(7):
-                        next_row = get_next_row(board, next_col)
-                        if next_row is not None:
-                            board[next_row][next_col] = player
-                            if check_winner(board, player):
-                                threats_created += 1
-                                winning_positions.append(next_col)
-                            board[next_row][next_col] = 0
-                    
-                    board[row][col] = 0
-                    
-                    # If we create 2+ winning threats, opponent can't block both!
-                    if threats_created >= 2:
-                        logger.info(f"[{self.account_email}] ★★★ DOUBLE THREAT SETUP ★★★: Column {col} creates {threats_created} winning threats at {winning_positions}")
-                        return col
-            
-            # Check if opponent can create double threat (and block it)
-            logger.info(f"[{self.account_email}] Checking opponent double threats...")
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = 3 - player
-                    
-                    # Count opponent's threats after this move
-                    opp_threats = 0
-                    for next_col in range(7):
-                        next_row = get_next_row(board, next_col)
-                        if next_row is not None:
-                            board[next_row][next_col] = 3 - player
-                            if check_winner(board, 3 - player):
-                                opp_threats += 1
-                            board[next_row][next_col] = 0
-                    
-                    board[row][col] = 0
-                    
-                    # Block opponent's double threat setup
-                    if opp_threats >= 2:
-                        logger.info(f"[{self.account_email}] ★★ BLOCKING OPPONENT DOUBLE THREAT ★★: Column {col}")
-                        return col
+        if threats['block'] is not None:
+            logger.info(f"[{self.account_email}] ★★ BLOCKING ★★: Column {threats['block']}")
+            return threats['block']
         
-        # Fork detection - only in mid-late game (16+ pieces)
-        if total_pieces >= 16:
-            # Check for fork opportunities (creating multiple 3-in-a-row threats)
-            logger.info(f"[{self.account_email}] Scanning for fork opportunities...")
-            def count_three_in_row_threats(b, p):
-                """Count positions where player has 3-in-a-row with 1 empty (immediate winning threats)"""
-                threat_count = 0
-                threat_positions = set()
-                
-                # Horizontal
-                for r in range(6):
-                    for c in range(4):
-                        window = [b[r][c+i] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = c + window.index(0)
-                            # Check if this empty position is playable (has support below)
-                            if r == 5 or b[r+1][empty_idx] != 0:
-                                threat_positions.add((r, empty_idx))
-                
-                # Vertical
-                for c in range(7):
-                    for r in range(3):
-                        window = [b[r+i][c] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = r + window.index(0)
-                            if empty_idx == 5 or b[empty_idx+1][c] != 0:
-                                threat_positions.add((empty_idx, c))
-                
-                # Diagonal /
-                for r in range(3):
-                    for c in range(4):
-                        window = [b[r+i][c+i] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = window.index(0)
-                            empty_r, empty_c = r + empty_idx, c + empty_idx
-                            if empty_r == 5 or b[empty_r+1][empty_c] != 0:
-                                threat_positions.add((empty_r, empty_c))
-                
-                # Diagonal \
-                for r in range(3, 6):
-                    for c in range(4):
-                        window = [b[r-i][c+i] for i in range(4)]
-                        if window.count(p) == 3 and window.count(0) == 1:
-                            empty_idx = window.index(0)
-                            empty_r, empty_c = r - empty_idx, c + empty_idx
-                            if empty_r == 5 or b[empty_r+1][empty_c] != 0:
-                                threat_positions.add((empty_r, empty_c))
-                
-                return len(threat_positions), threat_positions
-            
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = player
-                    threat_count, positions = count_three_in_row_threats(board, player)
-                    board[row][col] = 0
-                    
-                    # Fork = creating 2+ immediate winning threats
-                    if threat_count >= 2:
-                        logger.info(f"[{self.account_email}] ★★★ FORK OPPORTUNITY ★★★: Column {col} creates {threat_count} winning threats")
-                        return col
-            
-            # Block opponent forks
-            logger.info(f"[{self.account_email}] Checking opponent fork threats...")
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None:
-                    board[row][col] = 3 - player
-                    threat_count, positions = count_three_in_row_threats(board, 3 - player)
-                    board[row][col] = 0
-                    
-                    if threat_count >= 2:
-                        logger.info(f"[{self.account_email}] ★★ BLOCKING OPPONENT FORK ★★: Column {col}")
-                        return col
+        if threats['forced_win'] is not None:
+            logger.info(f"[{self.account_email}] ★★★ FORCED WIN ★★★: Column {threats['forced_win']} "
+                        f"({threats['nodes']} nodes, {threats['ms']:.1f}ms)")
+            return threats['forced_win']
         
-        # Vertical threat analysis - always important but validate carefully
-        if total_pieces >= 8:  # Only after some pieces are placed
-            logger.info(f"[{self.account_email}] Analyzing vertical threats...")
-            
-            # Advanced: Avoid giving opponent vertical wins
-            dangerous_moves = []
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None and row > 0:  # Must have space above
-                    # Check if opponent has pieces below
-                    opp_pieces_below = 0
-                    for check_row in range(row + 1, 6):
-                        if board[check_row][col] == 3 - player:
-                            opp_pieces_below += 1
-                    
-                    # If opponent has 2+ pieces below, this is dangerous
-                    if opp_pieces_below >= 2:
-                        # Simulate: if we play here, opponent plays above us
-                        board[row][col] = player
-                        board[row-1][col] = 3 - player
-                        if check_winner(board, 3 - player):
-                            dangerous_moves.append(col)
-                            logger.warning(f"[{self.account_email}] ⚠️ DANGEROUS: Column {col} gives opponent vertical win")
-                        board[row][col] = 0
-                        board[row-1][col] = 0
-            
-            # Filter out dangerous moves only if we have alternatives
-            if dangerous_moves and len(valid_moves) > len(dangerous_moves):
-                safe_moves = [col for col in valid_moves if col not in dangerous_moves]
-                if safe_moves:
-                    valid_moves = safe_moves
-                    logger.info(f"[{self.account_email}] Filtered dangerous moves: {dangerous_moves}")
-            
-            # Check for our vertical threat opportunities
-            for col in valid_moves:
-                row = get_next_row(board, col)
-                if row is not None and row >= 2:  # Need at least 3 spaces above
-                    # Check if playing here sets up vertical win potential
-                    pieces_below = 0
-                    for check_row in range(row + 1, 6):
-                        if board[check_row][col] == player:
-                            pieces_below += 1
-                    
-                    # If we have 2 pieces below, this creates a vertical threat
-                    if pieces_below == 2:
-                        board[row][col] = player
-                        # Verify it's actually a winning threat (one more move wins)
-                        if row > 0:
-                            board[row-1][col] = player
-                            is_win = check_winner(board, player)
-                            board[row-1][col] = 0
-                            if is_win:
-                                board[row][col] = 0
-                                logger.info(f"[{self.account_email}] ★★ VERTICAL THREAT ★★: Column {col} sets up vertical win")
-                                return col
-                        board[row][col] = 0
+        # Drop moves that let the opponent force a win, if any move avoids it
+        unsafe = [col for col in valid_moves if col not in threats['safe']]
+        if unsafe and threats['safe']:
+            valid_moves = [col for col in valid_moves if col in threats['safe']]
+            logger.info(f"[{self.account_email}] Filtered moves allowing a forced loss: {unsafe}")
+        logger.info(f"[{self.account_email}] Threat search: {threats['nodes']} nodes, {threats['ms']:.1f}ms", extra=LOG_SEARCH)
         
         # Multi-move sequence analysis for top moves
-        logger.info(f"[{self.account_email}] Analyzing opponent predictions...")
+        logger.info(f"[{self.account_email}] Analyzing opponent predictions...", extra=LOG_SEARCH)
         
         move_evaluations = []
         for col in valid_moves:
@@ -1071,11 +806,12 @@ class Connect4HostBot:
         # Endgame perfect solving
         if empty_cells <= 12:
             depth = min(empty_cells + 5, 18)
-            logger.info(f"[{self.account_email}] ENDGAME MODE: depth {depth}")
+            logger.info(f"[{self.account_email}] ENDGAME MODE: depth {depth}", extra=LOG_SEARCH)
         
-        logger.info(f"[{self.account_email}] ULTRA-GODMODE depth {depth}...")
+        logger.info(f"[{self.account_email}] ULTRA-GODMODE depth {depth}...", extra=LOG_SEARCH)
         
         column, score = minimax_ultra([row[:] for row in board], depth, float('-inf'), float('inf'), True)
+        search.update(depth=depth, score=score)
         
         calc_time = time.time() - start_time
         
@@ -1087,7 +823,7 @@ class Connect4HostBot:
         pred_str = ", ".join([f"Col{c}({p:.2f})" for c, p, _ in opp_preds[:2]])
         
         logger.info(f"[{self.account_email}] ★ ULTRA-GODMODE ★ Column {column}, Time: {calc_time:.2f}s, Score: {score:,}")
-        logger.info(f"[{self.account_email}] Opponent likely: {pred_str}")
+        logger.info(f"[{self.account_email}] Opponent likely: {pred_str}", extra=LOG_SEARCH)
         
         return column
     
@@ -1096,9 +832,10 @@ class Connect4HostBot:
         try:
             cells = self.driver.find_elements(By.CSS_SELECTOR, "table tbody tr:first-child td.board-cell")
             if column < len(cells):
+                discs_before = connect4_column_count(self.driver, column)
                 cells[column].click()
                 logger.info(f"[{self.account_email}] Played column {column}")
-                time.sleep(1)
+                wait_for(self.driver, piece_in_column(column, discs_before), 2, 'move.piece_landed')
                 return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Error making move: {e}")
@@ -1129,73 +866,93 @@ class Connect4HostBot:
         """Main game loop"""
         logger.info(f"[{self.account_email}] Starting game")
         move_count = 0
-        time.sleep(2)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "table tbody tr td.board-cell"), 5, 'game.board_ready')
         
         self.detect_player_number()
-        
+        probe = GameProbe(self.driver, 'connect4', "iframe[src*='connect4']")
+        self.tracer.start_game(self.driver.execute_script("return location.href"))
+        self.recorder.start_game(self.tracer.game_id, self.my_player)
+        result = None
+
         while move_count < 42:
             try:
-                self.driver.switch_to.default_content()
-                self.close_popups()
-                
-                if self.game_iframe:
-                    self.driver.switch_to.frame(self.game_iframe)
-                
-                if self.check_game_over():
-                    logger.info(f"[{self.account_email}] Game finished")
+                state = self.tracer.probe(probe, self.game_iframe)
+
+                if state.game_over:
+                    logger.info(f"[{self.account_email}] Game finished ({state.result or 'iframe closed'})")
+                    result = state.result
                     break
-                
-                if self.is_my_turn():
-                    board = self.read_board_state()
-                    column = self.calculate_best_move(board, self.my_player)
+
+                if state.popup_present:
+                    self.driver.switch_to.default_content()
+                    self.close_popups()
+                    if self.game_iframe:
+                        self.driver.switch_to.frame(self.game_iframe)
+                    continue
+
+                if state.my_turn and state.board:
+                    self.tracer.turn_detected()
+                    with self.tracer.span('engine') as search:
+                        column = self.calculate_best_move(state.board, self.my_player)
+                        search.update(self.last_search)
                     
-                    if column is not None and self.make_move(column):
-                        move_count += 1
-                        time.sleep(1.5)
+                    if column is not None:
+                        with self.tracer.span('click'):
+                            moved = self.make_move(column)
+                        if moved:
+                            move_count += 1
+                            self.recorder.move(column, state.board, search)
+                            with self.tracer.span('confirm'):
+                                wait_for(self.driver, element_gone(By.CSS_SELECTOR, ".turn-timer-bottom"),
+                                         2.5, 'game.turn_handover', poll=0.25)
+                            if self.commands:
+                                self.commands.move_done(f"col {column}")
+                        self.tracer.move_done(f"col {column}", ok=moved)
                 else:
-                    time.sleep(1)
+                    wait_for(self.driver, element_visible(By.CSS_SELECTOR, ".turn-timer-bottom"),
+                             1, 'game.opponent_turn', poll=0.25)
             except Exception as e:
                 logger.error(f"[{self.account_email}] Error in game loop: {e}")
                 break
         
+        self.recorder.finish(result)
         logger.info(f"[{self.account_email}] Game completed after {move_count} moves")
-        time.sleep(3)
     
     def handle_post_game(self):
         """Return to dashboard"""
+        if self.commands:
+            self.commands.game_done()
         try:
             logger.info(f"[{self.account_email}] Handling post-game")
             self.driver.switch_to.default_content()
-            time.sleep(2)
+            logger.info(f"[{self.account_email}] Popup guard dismissed {self.popup_guard.closed_count()} popup(s) this game")
             
-            try:
-                back_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Back to Home')]"))
-                )
+            back_button = wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(., 'Back to Home')]"),
+                                   12, 'post.back_button')
+            if back_button:
                 back_button.click()
-            except:
+            else:
                 self.driver.get(self.dashboard_url)
             
-            time.sleep(3)
+            wait_for(self.driver, url_contains('dashboard'), 5, 'post.dashboard')
             return True
         except Exception as e:
             logger.error(f"[{self.account_email}] Error in post-game: {e}")
             return False
     
     def quit(self):
-        """Close browser and cleanup"""
+        """Close browser (or hand it back to the pool) and cleanup"""
+        if self.commands:
+            self.commands.uninstall()
+        if self.browser_pool:
+            self.popup_guard.uninstall()
+            self.browser_pool.release(self.driver)
+            logger.info(f"[{self.account_email}] Browser returned to pool")
+            return
         try:
             self.driver.quit()
             logger.info(f"[{self.account_email}] Browser closed")
-            
-            # Cleanup temporary profile directory
-            try:
-                import shutil
-                if hasattr(self, 'user_data_dir') and os.path.exists(self.user_data_dir):
-                    shutil.rmtree(self.user_data_dir, ignore_errors=True)
-                    logger.info(f"[{self.account_email}] Cleaned up profile directory")
-            except Exception as e:
-                logger.warning(f"[{self.account_email}] Could not cleanup profile: {e}")
+            remove_profile(self.user_data_dir)
         except:
             pass
 
@@ -1252,7 +1009,7 @@ def run_bot_session(account, settings):
     start_delay = account.get('_start_delay', 0)
     if start_delay > 0:
         logger.info(f"[{email}] Waiting {start_delay}s before starting (stagger delay)")
-        time.sleep(start_delay)
+        CLOCK.sleep(start_delay)
     
     logger.info(f"[{email}] ╔═══════════════════════════════════════╗")
     logger.info(f"[{email}] Starting session - {games_to_play} games")
@@ -1264,7 +1021,16 @@ def run_bot_session(account, settings):
             account_email=email,
             account_password=password,
             bet_increase_clicks=bet_clicks,
-            headless=settings.get('headless', True)
+            headless=settings.get('headless', True),
+            browser_pool=settings.get('_browser_pool'),
+            session_store=settings.get('_session_store'),
+            lean_profile=settings.get('browser', {}).get('lean'),
+            dashboard_url=settings.get('dashboard_url', "https://app.gameonworld.ai/dashboard"),
+            login_url=settings.get('login_url', "https://app.gameonworld.ai/auth/login"),
+            webdriver_metrics=settings.get('webdriver_metrics'),
+            move_trace=settings.get('move_trace'),
+            game_records=settings.get('game_records'),
+            threat_depth=settings.get('connect4', {}).get('threat_depth', DEFAULT_DEPTH)
         )
     except Exception as e:
         logger.error(f"[{email}] Failed to create bot instance: {e}")
@@ -1274,18 +1040,24 @@ def run_bot_session(account, settings):
     games_succeeded = 0
     
     try:
+        METRICS.session_started('connect4')
         bot.start()
         
+        bot.recorder.begin()
         if not bot.login(email, password):
             logger.error(f"[{email}] Login failed")
             return {"email": email, "games_played": 0, "games_succeeded": 0, "success": False}
+        bot.recorder.mark('login')
         
         for game_num in range(1, games_to_play + 1):
             logger.info(f"[{email}] ─── Game {game_num}/{games_to_play} ───")
             
             try:
+                bot.recorder.begin()
                 if bot.create_game():
+                    bot.recorder.mark('create_game')
                     if bot.wait_for_opponent(timeout=settings.get('opponent_wait_timeout', 900)):
+                        bot.recorder.mark('wait_for_opponent')
                         if bot.switch_to_game_iframe():
                             bot.play_game()
                             bot.handle_post_game()
@@ -1296,17 +1068,17 @@ def run_bot_session(account, settings):
                             if game_num < games_to_play:
                                 wait_time = settings.get('wait_between_games', 10)
                                 logger.info(f"[{email}] Waiting {wait_time}s before next game")
-                                time.sleep(wait_time)
+                                CLOCK.sleep(wait_time)
                     else:
                         logger.warning(f"[{email}] No opponent for game {game_num}")
                         games_played += 1
                         tracker.game_done(False)
                         bot.driver.get(bot.dashboard_url)
-                        time.sleep(3)
+                        wait_for(bot.driver, document_ready(), 10, 'session.dashboard_reload')
                 else:
                     logger.error(f"[{email}] Failed to create game {game_num}")
                     tracker.game_done(False)
-                    time.sleep(10)
+                    CLOCK.sleep(10)
             except Exception as e:
                 logger.error(f"[{email}] Error in game {game_num}: {e}")
                 games_played += 1
@@ -1327,6 +1099,7 @@ def run_bot_session(account, settings):
     finally:
         if bot:
             bot.quit()
+            METRICS.session_finished('connect4')
 
 
 def main():
@@ -1341,6 +1114,9 @@ def main():
     
     accounts = config.get('accounts', [])
     settings = config.get('settings', {})
+    configure_logging(settings.get('logging'))
+    start_metrics_server(settings)
+    configure_clock(settings)
     
     enabled_accounts = [acc for acc in accounts if acc.get('enabled', True)]
     
@@ -1354,40 +1130,62 @@ def main():
     logger.info(f"Processing {len(enabled_accounts)} accounts with max {max_parallel} parallel")
     logger.info(f"Stagger delay: {stagger_delay}s between account starts")
     
-    # Add stagger delays to accounts
+    # The controller adjusts the active session count to the host's headroom
+    # and spaces session starts itself; without it, stagger them up front
+    controller = create_concurrency_controller(settings, max_parallel)
+    ceiling = controller.max_sessions if controller else max_parallel
     for i, account in enumerate(enabled_accounts):
-        account['_start_delay'] = i * stagger_delay
+        account['_start_delay'] = 0 if controller else i * stagger_delay
     
     results = []
     
-    # Run accounts in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
-        # Submit all accounts to thread pool
-        future_to_account = {
-            executor.submit(run_bot_session, account, settings): account 
-            for account in enabled_accounts
-        }
+    # Restore saved logins instead of replaying the form every run
+    session_settings = settings.get('session_cache', {})
+    if session_settings.get('enabled', True):
+        settings['_session_store'] = SessionStore(
+            directory=session_settings.get('directory'),
+            max_age_hours=session_settings.get('max_age_hours', 72)
+        )
+    
+    # Keep warm Chrome instances (or browser contexts) alive across account sessions
+    browser_pool = create_browser_pool(settings, ceiling)
+    settings['_browser_pool'] = browser_pool
+    
+    session_func = controller.wrap(run_bot_session) if controller else run_bot_session
+    try:
+        # Run accounts in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ceiling) as executor:
+            # Submit all accounts to thread pool
+            future_to_account = {
+                executor.submit(session_func, account, settings): account 
+                for account in enabled_accounts
+            }
         
-        # Process completed tasks
-        for future in concurrent.futures.as_completed(future_to_account):
-            account = future_to_account[future]
-            try:
-                result = future.result()
-                results.append(result)
+            # Process completed tasks
+            for future in concurrent.futures.as_completed(future_to_account):
+                account = future_to_account[future]
+                try:
+                    result = future.result()
+                    results.append(result)
                 
-                # Progress update
-                acc_done, games_done, games_succ = tracker.get_stats()
-                logger.info(f"╠═══ PROGRESS: {acc_done}/{len(enabled_accounts)} accounts, "
-                           f"{games_succ}/{games_done} games succeeded ═══╣")
+                    # Progress update
+                    acc_done, games_done, games_succ = tracker.get_stats()
+                    logger.info(f"╠═══ PROGRESS: {acc_done}/{len(enabled_accounts)} accounts, "
+                               f"{games_succ}/{games_done} games succeeded ═══╣")
                 
-            except Exception as e:
-                logger.error(f"[{account['email']}] Thread exception: {e}")
-                results.append({
-                    "email": account['email'],
-                    "games_played": 0,
-                    "games_succeeded": 0,
-                    "success": False
-                })
+                except Exception as e:
+                    logger.error(f"[{account['email']}] Thread exception: {e}")
+                    results.append({
+                        "email": account['email'],
+                        "games_played": 0,
+                        "games_succeeded": 0,
+                        "success": False
+                    })
+    finally:
+        if controller:
+            controller.stop()
+        if browser_pool:
+            browser_pool.shutdown()
     
     # Summary
     logger.info("\n╔═══════════════════════════════════════════════════════════════════╗")
@@ -1411,6 +1209,8 @@ def main():
     logger.info(f"║ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                f"{' ' * 37}║")
     logger.info("╚═══════════════════════════════════════════════════════════════════╝")
+    
+    WAIT_STATS.log_report(logger)
 
 
 if __name__ == "__main__":
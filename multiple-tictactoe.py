@@ -4,41 +4,48 @@ Tic Tac Toe Multi-Account PARALLEL Bot - FIXED VERSION
 Correctly handles the 8x8 checkerboard layout with 3x3 tic-tac-toe positions
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-import time
-import random
-import os
 import sys
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 import threading
-from copy import deepcopy
 import concurrent.futures
 
+from game_probe import GameProbe
+from popup_guard import PopupGuard
+from webdriver_metrics import create_command_metrics
+from move_trace import MoveTracer
+from ttt_table import best_move as table_move
+from game_records import GameRecorder
+from metrics_server import METRICS, start_metrics_server
+from virtual_clock import CLOCK, configure_clock
+from browser_pool import create_browser_pool, launch_chrome, remove_profile
+from concurrency_controller import create_concurrency_controller
+from card_locator import locate_card
+from selector_registry import SELECTORS, visible_enabled
+from log_pipeline import setup_logging, configure_logging, log_enabled, LOG_READ, LOG_BOARD
+from session_store import SessionStore
+from wait_utils import (WAIT_STATS, wait_for, pause, element_clickable, element_present,
+                        element_visible, element_gone, url_excludes, document_ready,
+                        square_has_piece)
+
 # Configure logging
 LOG_DIR = Path("/home/user/Gameon-AI-Bots/logs")
 LOG_DIR.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / f'tictactoe_parallel_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+setup_logging(LOG_DIR / f'tictactoe_parallel_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
 logger = logging.getLogger(__name__)
 
 # Thread-safe progress tracker
 class ProgressTracker:
-    def __init__(self):
+    def __init__(self, game_type):
+        self.game_type = game_type
         self.lock = threading.Lock()
         self.accounts_completed = 0
         self.games_completed = 0
@@ -53,214 +60,96 @@ class ProgressTracker:
             self.games_completed += 1
             if succeeded:
                 self.games_succeeded += 1
+        if not succeeded:
+            METRICS.game_failed(self.game_type)
     
     def get_stats(self):
         with self.lock:
             return self.accounts_completed, self.games_completed, self.games_succeeded
 
-tracker = ProgressTracker()
-
-
-# ============================================================================
-# AI LOGIC - Minimax with Alpha-Beta Pruning
-# ============================================================================
-
-def get_lines():
-    """Get all winning lines on the board"""
-    lines = []
-    # Rows
-    for r in range(3):
-        lines.append([(r, 0), (r, 1), (r, 2)])
-    # Columns
-    for c in range(3):
-        lines.append([(0, c), (1, c), (2, c)])
-    # Diagonals
-    lines.append([(0, 0), (1, 1), (2, 2)])
-    lines.append([(0, 2), (1, 1), (2, 0)])
-    return lines
-
-def check_winner(board):
-    """Check if there's a winner. Returns 'X', 'O', or None"""
-    for line in get_lines():
-        values = [board[r][c] for r, c in line]
-        if values[0] == values[1] == values[2] and values[0] is not None:
-            return values[0]
-    return None
-
-def is_board_full(board):
-    """Check if board is full"""
-    return all(board[r][c] is not None for r in range(3) for c in range(3))
-
-def get_valid_moves(board):
-    """Get all valid (empty) positions"""
-    return [(r, c) for r in range(3) for c in range(3) if board[r][c] is None]
-
-def evaluate_board(board, player):
-    """Evaluate board position"""
-    winner = check_winner(board)
-    if winner == player:
-        return 100
-    elif winner is not None:
-        return -100
-    return 0
-
-def minimax(board, depth, is_maximizing, player, alpha, beta, start_time, max_time):
-    """Minimax with alpha-beta pruning and time limit"""
-    # Time check
-    if time.time() - start_time > max_time:
-        return 0
-    
-    opponent = 'O' if player == 'X' else 'X'
-    
-    winner = check_winner(board)
-    if winner == player:
-        return 100 - depth
-    elif winner == opponent:
-        return depth - 100
-    elif is_board_full(board):
-        return 0
-    
-    if depth >= 9:
-        return 0
-    
-    valid_moves = get_valid_moves(board)
-    
-    if is_maximizing:
-        max_eval = float('-inf')
-        for r, c in valid_moves:
-            board[r][c] = player
-            eval_score = minimax(board, depth + 1, False, player, alpha, beta, start_time, max_time)
-            board[r][c] = None
-            max_eval = max(max_eval, eval_score)
-            alpha = max(alpha, eval_score)
-            if beta <= alpha:
-                break
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for r, c in valid_moves:
-            board[r][c] = opponent
-            eval_score = minimax(board, depth + 1, True, player, alpha, beta, start_time, max_time)
-            board[r][c] = None
-            min_eval = min(min_eval, eval_score)
-            beta = min(beta, eval_score)
-            if beta <= alpha:
-                break
-        return min_eval
-
-def get_best_move(board, player, max_time=6):
-    """Get best move using minimax with time limit"""
-    start_time = time.time()
-    valid_moves = get_valid_moves(board)
-    
-    if not valid_moves:
-        return None
-    
-    # Center preference for opening
-    if board[1][1] is None:
-        move_count = sum(1 for r in range(3) for c in range(3) if board[r][c] is not None)
-        if move_count <= 1:
-            return (1, 1)
-    
-    best_move = None
-    best_score = float('-inf')
-    
-    for r, c in valid_moves:
-        if time.time() - start_time > max_time:
-            break
-        
-        board[r][c] = player
-        score = minimax(board, 0, False, player, float('-inf'), float('inf'), start_time, max_time)
-        board[r][c] = None
-        
-        if score > best_score:
-            best_score = score
-            best_move = (r, c)
-    
-    return best_move if best_move else random.choice(valid_moves)
+tracker = ProgressTracker('tictactoe')
 
 
 class TicTacToeBot:
     def __init__(self, account_email, account_password, dashboard_url="https://app.gameonworld.ai/dashboard", 
-                 bet_increase_clicks=0, headless=True, max_time_per_move=6, ai_depth=9):
-        
-        # Create unique user data directory for this account
-        import hashlib
-        account_hash = hashlib.md5(account_email.encode()).hexdigest()[:8]
-        user_data_dir = f"/tmp/chrome_profile_{account_hash}_{int(time.time())}"
+                 bet_increase_clicks=0, headless=True, tiebreak='trap', browser_pool=None, session_store=None,
+                 lean_profile=None, login_url="https://app.gameonworld.ai/auth/login", webdriver_metrics=None,
+                 move_trace=None, game_records=None):
         
-        options = webdriver.ChromeOptions()
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument(f'--user-data-dir={user_data_dir}')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--window-size=1920,1080')
-        
-        if headless:
-            options.add_argument('--headless=new')
-        
-        self.driver = webdriver.Chrome(options=options)
+        self.browser_pool = browser_pool
+        if browser_pool:
+            # Warm instance or fresh browser context from the shared pool
+            self.driver = browser_pool.acquire()
+            self.user_data_dir = None
+        else:
+            self.driver, self.user_data_dir = launch_chrome(account_email, headless, lean_profile)
         self.wait = WebDriverWait(self.driver, 20)
         self.dashboard_url = dashboard_url
+        self.login_url = login_url
         self.account_email = account_email
         self.account_password = account_password
         self.game_iframe = None
         self.bet_increase_clicks = bet_increase_clicks
         self.my_player = None
-        self.max_time_per_move = max_time_per_move
+        self.tiebreak = tiebreak
+        self.session_store = session_store
+        # WebDriver round trips per calling method, None unless enabled in settings
+        self.commands = create_command_metrics(self.driver, self, account_email, webdriver_metrics)
+        self.tracer = MoveTracer(account_email, 'tictactoe', move_trace)
+        self.recorder = GameRecorder(account_email, 'tictactoe', game_records)
+        self.last_search = {}
+        self.popup_guard = PopupGuard(self.driver, account_email)
+        self.popup_guard.install()
         
-        logger.info(f"[{self.account_email}] Bot initialized - Depth {ai_depth}, {max_time_per_move}s/move")
+        logger.info(f"[{self.account_email}] Bot initialized - perfect-play table, {tiebreak} tie-break")
     
     def start(self):
         logger.info(f"[{self.account_email}] Opening login page...")
-        self.driver.get("https://app.gameonworld.ai/auth/login")
-        time.sleep(2)
+        self.driver.get(self.login_url)
+        wait_for(self.driver, element_present(By.CSS_SELECTOR, "input[type='email']"), 10, 'login.page_loaded')
     
     def close_popups(self):
         try:
-            selectors = ["button.absolute.top-3.right-3", "button svg[viewBox='0 0 512 512']//ancestor::button",
-                        "button[aria-label='Close']", "button[aria-label='close']", "button.close"]
-            for sel in selectors:
-                try:
-                    for btn in self.driver.find_elements(By.CSS_SELECTOR, sel):
-                        if btn.is_displayed() and btn.is_enabled():
-                            btn.click()
-                            time.sleep(0.5)
-                            return True
-                except: continue
+            buttons, _ = SELECTORS.find(self.driver, 'popup.close', accept=visible_enabled)
+            if buttons:
+                buttons[0].click()
+                CLOCK.sleep(0.5)
+                return True
             return False
         except: return False
     
     def login(self, email, password):
         try:
             logger.info(f"[{self.account_email}] Logging in...")
+            
+            if self.session_store and self.session_store.restore(self.driver, self.account_email, self.dashboard_url,
+                                                                 login_url=self.login_url):
+                self.popup_guard.sweep()
+                return True
+            
             email_input = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email']")))
             password_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
             
             email_input.clear()
             email_input.send_keys(email)
-            time.sleep(0.5)
+            pause(0.5, 'login.human_pacing')
             password_input.clear()
             password_input.send_keys(password)
-            time.sleep(0.5)
+            pause(0.5, 'login.human_pacing')
             
             login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
             login_button.click()
             
             # Wait for login
-            time.sleep(5)
+            wait_for(self.driver, url_excludes('login'), 15, 'login.redirect')
+            wait_for(self.driver, document_ready(), 5, 'login.dashboard_ready')
             
             # Close popups
-            for _ in range(3):
-                self.close_popups()
-                time.sleep(0.5)
+            self.popup_guard.sweep()
             
             logger.info(f"[{self.account_email}] ✓ Login successful")
+            if self.session_store:
+                self.session_store.save(self.driver, self.account_email)
             return True
             
         except Exception as e:
@@ -274,18 +163,19 @@ class TicTacToeBot:
             
             # Navigate to dashboard
             self.driver.get(self.dashboard_url)
-            time.sleep(3)
-            
-            # Find Tic Tac Toe game card
-            game_cards = self.driver.find_elements(By.CSS_SELECTOR, "div[data-card='true'], div[class*='card']")
-            
-            for card in game_cards:
-                card_text = card.text.lower()
-                if 'tic' in card_text or 'tac' in card_text:
-                    logger.info(f"[{self.account_email}] Found Tic Tac Toe card")
-                    card.click()
-                    time.sleep(2)
-                    break
+            wait_for(self.driver, element_present(By.CSS_SELECTOR, "div[data-card='true'], div[class*='card']"),
+                     10, 'create.cards_loaded')
+            self.popup_guard.sweep()
+            # The card opens the create-game modal, keep it open until the game starts
+            self.popup_guard.pause()
+            
+            # Find Tic Tac Toe game card, all fallback strategies in one call
+            card, strategy = locate_card(self.driver, 'tictactoe')
+            if card:
+                logger.info(f"[{self.account_email}] Found Tic Tac Toe card ({strategy})")
+                card.click()
+                wait_for(self.driver, element_clickable(By.XPATH, "//button[contains(text(), 'Play')]"),
+                         10, 'create.play_now')
             
             # Click "Play Now" button
             play_buttons = self.driver.find_elements(By.XPATH, 
@@ -295,7 +185,9 @@ class TicTacToeBot:
                 if btn.is_displayed():
                     logger.info(f"[{self.account_email}] Clicking Play Now...")
                     btn.click()
-                    time.sleep(2)
+                    wait_for(self.driver, element_clickable(By.XPATH,
+                             "//button[contains(text(), 'Play Game') or contains(text(), 'Start')]"),
+                             10, 'create.play_game')
                     break
             
             # Increase bet if needed
@@ -306,7 +198,7 @@ class TicTacToeBot:
                         plus_btn = self.driver.find_element(By.CSS_SELECTOR, 
                             "button[aria-label='Increase bet'], button.plus, button[class*='plus']")
                         plus_btn.click()
-                        time.sleep(0.3)
+                        pause(0.3, 'create.bet_click')
                     except:
                         break
             
@@ -318,7 +210,8 @@ class TicTacToeBot:
                 if btn.is_displayed():
                     logger.info(f"[{self.account_email}] Clicking Play Game...")
                     btn.click()
-                    time.sleep(2)
+                    wait_for(self.driver, element_gone(By.XPATH, "//button[contains(text(), 'Play Game')]"),
+                             5, 'create.modal_closed')
                     break
             
             logger.info(f"[{self.account_email}] ✓ Game created")
@@ -331,9 +224,9 @@ class TicTacToeBot:
     def wait_for_opponent(self, timeout=900):
         """Wait for opponent to join"""
         logger.info(f"[{self.account_email}] Waiting for opponent...")
-        start_time = time.time()
+        start_time = CLOCK.time()
         
-        while time.time() - start_time < timeout:
+        while CLOCK.time() - start_time < timeout:
             try:
                 iframes = self.driver.find_elements(By.CSS_SELECTOR, "iframe")
                 
@@ -342,12 +235,13 @@ class TicTacToeBot:
                     if "tictac" in src.lower() or "tic-tac" in src.lower():
                         logger.info(f"[{self.account_email}] ✓ Game iframe found")
                         self.game_iframe = iframe
+                        self.popup_guard.resume()
                         return True
                 
-                time.sleep(2)
+                pause(2, 'opponent.poll')
                 
             except Exception as e:
-                time.sleep(2)
+                CLOCK.sleep(2)
         
         logger.warning(f"[{self.account_email}] ✗ Opponent timeout")
         return False
@@ -360,7 +254,7 @@ class TicTacToeBot:
                 return False
             
             self.driver.switch_to.frame(self.game_iframe)
-            time.sleep(3)
+            wait_for(self.driver, element_present(By.CSS_SELECTOR, "div.cell, div[class*='cell']"), 5, 'game.board_ready')
             logger.info(f"[{self.account_email}] ✓ Switched to iframe")
             return True
             
@@ -376,16 +270,16 @@ class TicTacToeBot:
         try:
             board = [[None for _ in range(3)] for _ in range(3)]
             
-            # Get all cells using the correct selector
-            cells = self.driver.find_elements(By.CSS_SELECTOR, "div.cell")
+            # Get all cells, best-performing selector first
+            cells, selector = SELECTORS.find(self.driver, 'tictactoe.cells')
             
-            logger.info(f"[{self.account_email}] Found {len(cells)} cells")
+            logger.info(f"[{self.account_email}] Found {len(cells)} cells ({selector})", extra=LOG_READ)
             
             if len(cells) != 9:
                 logger.warning(f"[{self.account_email}] Expected 9 cells, found {len(cells)}")
-                # Try alternative selector
+                # Try every cell selector at once
                 cells = self.driver.find_elements(By.CSS_SELECTOR, 
-                    "div[class*='aspect-square'], div[class*='cell']")
+                    "div.cell, div[class*='aspect-square'], div[class*='cell']")
                 logger.info(f"[{self.account_email}] Alternative selector found {len(cells)} cells")
                 
                 if len(cells) == 0:
@@ -452,7 +346,8 @@ class TicTacToeBot:
         """Detect if we are X or O"""
         try:
             logger.info(f"[{self.account_email}] Detecting player...")
-            time.sleep(2)
+            wait_for(self.driver, element_visible(By.CSS_SELECTOR, "div.my-turn, div.opponent-turn"),
+                     3, 'game.turn_indicator')
             
             # Method 1: Check turn indicator divs
             turn_divs = self.driver.find_elements(By.CSS_SELECTOR, 
@@ -563,8 +458,10 @@ class TicTacToeBot:
         """Make a move on the board - based on working tictactoe.py"""
         try:
             # Get cells using the correct selector
-            cells = self.driver.find_elements(By.CSS_SELECTOR, 
-                "div.cell, div[class*='aspect-square'], div[class*='cell']")
+            cells, _ = SELECTORS.find(self.driver, 'tictactoe.cells')
+            if not cells:
+                cells = self.driver.find_elements(By.CSS_SELECTOR, 
+                    "div.cell, div[class*='aspect-square'], div[class*='cell']")
             
             logger.info(f"[{self.account_email}] Making move ({row},{col}) - {len(cells)} cells found")
             
@@ -573,8 +470,7 @@ class TicTacToeBot:
                 cell = cells[idx]
                 
                 # Scroll into view
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", cell)
-                time.sleep(0.3)
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", cell)
                 
                 # Try to click
                 try:
@@ -584,6 +480,7 @@ class TicTacToeBot:
                     self.driver.execute_script("arguments[0].click();", cell)
                 
                 logger.info(f"[{self.account_email}] ✓ Moved to ({row},{col})")
+                wait_for(self.driver, square_has_piece(cell), 2, 'move.piece_landed')
                 return True
             else:
                 logger.error(f"[{self.account_email}] Cell index {idx} out of range (have {len(cells)} cells)")
@@ -597,9 +494,9 @@ class TicTacToeBot:
     
     def play_game(self):
         """Play the game"""
+        result = None
         try:
             logger.info(f"[{self.account_email}] ═══ Starting Game ═══")
-            time.sleep(3)
             
             if not self.detect_my_player():
                 logger.error(f"[{self.account_email}] Could not detect player")
@@ -607,62 +504,84 @@ class TicTacToeBot:
             
             move_count = 0
             max_moves = 50
-            
+            probe = GameProbe(self.driver, 'tictactoe', "iframe[src*='tictac' i], iframe[src*='tic-tac' i]")
+            self.tracer.start_game(self.driver.execute_script("return location.href"))
+            self.recorder.start_game(self.tracer.game_id, self.my_player)
+
             while move_count < max_moves:
                 move_count += 1
-                
+
+                state = self.tracer.probe(probe, self.game_iframe)
+
                 # Check if game ended
-                try:
-                    game_over = self.driver.find_elements(By.XPATH,
-                        "//h1[contains(text(), 'Victory') or contains(text(), 'Defeat') or contains(text(), 'Draw')] | " +
-                        "//h2[contains(text(), 'Victory') or contains(text(), 'Defeat') or contains(text(), 'Draw')]")
-                    
-                    if game_over and any(el.is_displayed() for el in game_over):
-                        result = " ".join([el.text for el in game_over if el.is_displayed()])
-                        logger.info(f"[{self.account_email}] ✓ Game ended - {result}")
-                        return True
-                except:
-                    pass
-                
+                if state.game_over:
+                    logger.info(f"[{self.account_email}] ✓ Game ended - {state.result or 'iframe closed'}")
+                    result = state.result
+                    return True
+
+                if state.popup_present:
+                    self.driver.switch_to.default_content()
+                    self.close_popups()
+                    self.driver.switch_to.frame(self.game_iframe)
+                    continue
+
+                board = state.board
+                my_turn = state.my_turn
+                # If X and board is empty, it's our turn
+                if my_turn is None and self.my_player == 'X' and board:
+                    my_turn = all(cell is None for row in board for cell in row)
+
                 # Wait for our turn
-                if not self.is_my_turn():
+                if not my_turn:
                     logger.info(f"[{self.account_email}] Waiting for opponent...")
-                    time.sleep(2)
+                    wait_for(self.driver, element_visible(By.CSS_SELECTOR, "div.my-turn"),
+                             2, 'game.opponent_turn', poll=0.25)
                     continue
-                
+
                 logger.info(f"[{self.account_email}] Our turn! Move #{move_count}")
-                
-                # Read board
-                board = self.read_board_state()
+                self.tracer.turn_detected()
+
                 if board is None:
                     logger.error(f"[{self.account_email}] Could not read board")
-                    time.sleep(2)
+                    CLOCK.sleep(2)
                     continue
-                
+
                 # Log board
-                logger.info(f"[{self.account_email}] Board:")
-                for i, row in enumerate(board):
-                    row_str = " | ".join([cell if cell else "." for cell in row])
-                    logger.info(f"[{self.account_email}]   {row_str}")
+                if log_enabled(LOG_BOARD):
+                    logger.info(f"[{self.account_email}] Board:", extra=LOG_BOARD)
+                    for i, row in enumerate(board):
+                        row_str = " | ".join([cell if cell else "." for cell in row])
+                        logger.info(f"[{self.account_email}]   {row_str}", extra=LOG_BOARD)
                 
                 # Calculate best move
-                best_move = get_best_move(board, self.my_player, self.max_time_per_move)
+                with self.tracer.span('engine') as search:
+                    self.last_search = {'depth': None, 'nodes': 0, 'score': None}
+                    best_move = table_move(board, self.my_player, self.tiebreak, self.last_search)
+                    search.update(self.last_search)
                 
                 if best_move is None:
                     logger.warning(f"[{self.account_email}] No valid moves")
-                    time.sleep(2)
+                    CLOCK.sleep(2)
                     continue
                 
                 row, col = best_move
                 logger.info(f"[{self.account_email}] Best move: ({row},{col})")
                 
                 # Make the move
-                if self.make_move(row, col):
+                with self.tracer.span('click'):
+                    moved = self.make_move(row, col)
+                if moved:
                     logger.info(f"[{self.account_email}] ✓ Move successful")
-                    time.sleep(2)
-                else:
+                    self.recorder.move([row, col], board, search)
+                    with self.tracer.span('confirm'):
+                        wait_for(self.driver, element_visible(By.CSS_SELECTOR, "div.opponent-turn"),
+                                 2, 'game.turn_handover', poll=0.25)
+                    if self.commands:
+                        self.commands.move_done(f"({row},{col})")
+                self.tracer.move_done(f"({row},{col})", ok=moved)
+                if not moved:
                     logger.warning(f"[{self.account_email}] ✗ Move failed")
-                    time.sleep(1)
+                    CLOCK.sleep(1)
             
             logger.info(f"[{self.account_email}] ✓ Game complete")
             return True
@@ -670,24 +589,36 @@ class TicTacToeBot:
         except Exception as e:
             logger.error(f"[{self.account_email}] Game error: {e}")
             return False
+        finally:
+            self.recorder.finish(result)
     
     def handle_post_game(self):
         """Handle post-game"""
+        if self.commands:
+            self.commands.game_done()
         try:
             logger.info(f"[{self.account_email}] Post-game...")
             self.driver.switch_to.default_content()
-            time.sleep(2)
+            logger.info(f"[{self.account_email}] Popup guard dismissed {self.popup_guard.closed_count()} popup(s) this game")
             self.driver.get(self.dashboard_url)
-            time.sleep(3)
+            wait_for(self.driver, document_ready(), 10, 'post.dashboard')
             logger.info(f"[{self.account_email}] ✓ Post-game handled")
         except Exception as e:
             logger.error(f"[{self.account_email}] Post-game error: {e}")
     
     def quit(self):
-        """Clean up"""
+        """Close browser (or hand it back to the pool) and cleanup"""
+        if self.commands:
+            self.commands.uninstall()
+        if self.browser_pool:
+            self.popup_guard.uninstall()
+            self.browser_pool.release(self.driver)
+            logger.info(f"[{self.account_email}] Browser returned to pool")
+            return
         try:
             self.driver.quit()
             logger.info(f"[{self.account_email}] Browser closed")
+            remove_profile(self.user_data_dir)
         except:
             pass
 
@@ -722,8 +653,7 @@ def load_accounts_config(config_path='accounts.json'):
             'settings': {
                 **full_config.get('settings', {}),
                 'ai_settings': {
-                    'max_time_per_move': tictactoe_settings.get('max_time_per_move', 6),
-                    'ai_depth': tictactoe_settings.get('ai_depth', 9)
+                    'tiebreak': full_config.get('settings', {}).get('tictactoe', {}).get('tiebreak', 'trap')
                 }
             }
         }
@@ -744,8 +674,7 @@ def run_bot_session(account, settings):
     bet_clicks = account.get('bet_increase_clicks', 0)
     
     ai_settings = settings.get('ai_settings', {})
-    max_time = ai_settings.get('max_time_per_move', 6)
-    ai_depth = ai_settings.get('ai_depth', 9)
+    tiebreak = ai_settings.get('tiebreak', 'trap')
     
     logger.info(f"[{email}] Starting - {games_to_play} games, bet={bet_clicks}")
     
@@ -756,8 +685,15 @@ def run_bot_session(account, settings):
             account_password=password,
             bet_increase_clicks=bet_clicks,
             headless=settings.get('headless', True),
-            max_time_per_move=max_time,
-            ai_depth=ai_depth
+            browser_pool=settings.get('_browser_pool'),
+            session_store=settings.get('_session_store'),
+            lean_profile=settings.get('browser', {}).get('lean'),
+            dashboard_url=settings.get('dashboard_url', "https://app.gameonworld.ai/dashboard"),
+            login_url=settings.get('login_url', "https://app.gameonworld.ai/auth/login"),
+            webdriver_metrics=settings.get('webdriver_metrics'),
+            move_trace=settings.get('move_trace'),
+            game_records=settings.get('game_records'),
+            tiebreak=tiebreak
         )
     except Exception as e:
         logger.error(f"[{email}] Bot creation failed: {e}")
@@ -767,18 +703,24 @@ def run_bot_session(account, settings):
     games_succeeded = 0
     
     try:
+        METRICS.session_started('tictactoe')
         bot.start()
         
+        bot.recorder.begin()
         if not bot.login(email, password):
             logger.error(f"[{email}] Login failed")
             return {"email": email, "games_played": 0, "games_succeeded": 0, "success": False}
+        bot.recorder.mark('login')
         
         for game_num in range(1, games_to_play + 1):
             logger.info(f"[{email}] ─── Game {game_num}/{games_to_play} ───")
             
             try:
+                bot.recorder.begin()
                 if bot.create_game():
+                    bot.recorder.mark('create_game')
                     if bot.wait_for_opponent(timeout=settings.get('opponent_wait_timeout', 900)):
+                        bot.recorder.mark('wait_for_opponent')
                         if bot.switch_to_game_iframe():
                             if bot.play_game():
                                 games_succeeded += 1
@@ -792,7 +734,7 @@ def run_bot_session(account, settings):
                 else:
                     logger.error(f"[{email}] Game creation failed")
                 
-                time.sleep(settings.get('wait_between_games', 10))
+                CLOCK.sleep(settings.get('wait_between_games', 10))
                 
             except Exception as e:
                 logger.error(f"[{email}] Game {game_num} error: {e}")
@@ -807,6 +749,7 @@ def run_bot_session(account, settings):
     finally:
         if bot:
             bot.quit()
+            METRICS.session_finished('tictactoe')
 
 
 def main():
@@ -814,6 +757,9 @@ def main():
     config = load_accounts_config()
     accounts = config['accounts']
     settings = config['settings']
+    configure_logging(settings.get('logging'))
+    start_metrics_server(settings)
+    configure_clock(settings)
     
     logger.info("=" * 70)
     logger.info("TIC TAC TOE BOT - PARALLEL MULTI-ACCOUNT")
@@ -824,14 +770,38 @@ def main():
     
     max_workers = settings.get('max_parallel_accounts', 3)
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = []
-        for i, account in enumerate(accounts):
-            account['_start_delay'] = i * settings.get('stagger_delay', 10)
-            future = executor.submit(run_bot_session, account, settings)
-            futures.append(future)
+    # The controller adjusts the active session count to the host's headroom
+    # and spaces session starts itself
+    controller = create_concurrency_controller(settings, max_workers)
+    ceiling = controller.max_sessions if controller else max_workers
+    
+    # Restore saved logins instead of replaying the form every run
+    session_settings = settings.get('session_cache', {})
+    if session_settings.get('enabled', True):
+        settings['_session_store'] = SessionStore(
+            directory=session_settings.get('directory'),
+            max_age_hours=session_settings.get('max_age_hours', 72)
+        )
+    
+    # Keep warm Chrome instances (or browser contexts) alive across account sessions
+    browser_pool = create_browser_pool(settings, ceiling)
+    settings['_browser_pool'] = browser_pool
+    
+    session_func = controller.wrap(run_bot_session) if controller else run_bot_session
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=ceiling) as executor:
+            futures = []
+            for i, account in enumerate(accounts):
+                account['_start_delay'] = 0 if controller else i * settings.get('stagger_delay', 10)
+                future = executor.submit(session_func, account, settings)
+                futures.append(future)
         
-        results = [f.result() for f in concurrent.futures.as_completed(futures)]
+            results = [f.result() for f in concurrent.futures.as_completed(futures)]
+    finally:
+        if controller:
+            controller.stop()
+        if browser_pool:
+            browser_pool.shutdown()
     
     # Print results
     logger.info("\n" + "=" * 70)
@@ -840,6 +810,8 @@ def main():
     for result in results:
         logger.info(f"{result['email']}: {result['games_succeeded']}/{result['games_played']} games")
     logger.info("=" * 70)
+    
+    WAIT_STATS.log_report(logger)
 
 
 if __name__ == "__main__":
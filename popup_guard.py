@@ -0,0 +1,201 @@
+"""
+Page-level Popup Guard
+Installs a script into every top-level document that dismisses known
+modal patterns on its own and counts what it closed
+"""
+
+import json
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Known close-button patterns, same family as the bots' close_popups() lists.
+# Called with {paused}: the pause flag lives in Python and is pushed into each
+# document, and `closed` only holds what was closed since Python last drained it
+POPUP_GUARD_JS = r"""
+(function (init) {
+    if (window.top !== window) return;
+    if (window.__popupGuard) { window.__popupGuard.paused = init.paused; return; }
+
+    const guard = window.__popupGuard = {closed: 0, paused: init.paused, last: null};
+    const SELECTORS = [
+        "button.absolute.top-3.right-3",
+        "button svg[viewBox='0 0 512 512']",
+        "button[aria-label='Close']",
+        "button[aria-label='close']",
+        "button.close",
+        ".close-button",
+    ];
+    const clicks = new WeakMap();
+
+    function visible(el) {
+        if (!el.getClientRects().length) return false;
+        const s = getComputedStyle(el);
+        return s.visibility !== 'hidden' && s.display !== 'none' && s.opacity !== '0';
+    }
+
+    function usable(btn) {
+        // Never hammer a button that does not go away when clicked
+        return btn && !btn.disabled && visible(btn) && (clicks.get(btn) || 0) < 3;
+    }
+
+    function findClose() {
+        for (const sel of SELECTORS) {
+            for (const el of document.querySelectorAll(sel)) {
+                const btn = el.closest('button') || el;
+                if (usable(btn)) return [sel, btn];
+            }
+        }
+        for (const btn of document.querySelectorAll('button')) {
+            const text = (btn.innerText || '').trim();
+            if ((text === 'Close' || text === '×') && usable(btn)) return ['text', btn];
+        }
+        return null;
+    }
+
+    guard.sweep = function () {
+        if (guard.paused) return 0;
+        let closed = 0;
+        for (let i = 0; i < 5; i++) {
+            const hit = findClose();
+            if (!hit) break;
+            clicks.set(hit[1], (clicks.get(hit[1]) || 0) + 1);
+            hit[1].click();
+            guard.closed++;
+            guard.last = hit[0];
+            closed++;
+        }
+        return closed;
+    };
+
+    guard.drain = function () {
+        const closed = guard.closed;
+        guard.closed = 0;
+        return closed;
+    };
+
+    let pending = false;
+    function schedule() {
+        if (pending || guard.paused) return;
+        pending = true;
+        setTimeout(function () { pending = false; guard.sweep(); }, 150);
+    }
+
+    function observe() {
+        new MutationObserver(schedule).observe(document.documentElement, {childList: true, subtree: true});
+        guard.sweep();
+    }
+
+    if (document.documentElement) observe();
+    else document.addEventListener('DOMContentLoaded', observe);
+})"""
+
+
+class PopupGuard:
+    """
+    Keeps popups dismissed without polling from Python.
+
+    The script is registered with Page.addScriptToEvaluateOnNewDocument so it
+    survives navigations, and is also run once on the current document.
+    The pause flag and the dismissal count are kept here, not in the page:
+    a navigation starts a fresh document, so each injection is handed the
+    current pause state and every call drains the page's count into ours.
+    All methods must be called from the top-level browsing context.
+    """
+
+    def __init__(self, driver, account_email=""):
+        self.driver = driver
+        self.account_email = account_email
+        self.persistent = False
+        self.script_id = None
+        self.paused = False
+        self.closed = 0
+
+    def _source(self):
+        return f"{POPUP_GUARD_JS}({json.dumps({'paused': self.paused})});"
+
+    def _register(self):
+        """(Re-)register the new-document script with the current pause state"""
+        self.uninstall()
+        try:
+            result = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self._source()})
+            self.script_id = result.get('identifier')
+            self.persistent = True
+        except (WebDriverException, AttributeError) as e:
+            logger.warning(f"[{self.account_email}] Popup guard not persistent, will re-inject: {e}")
+
+    def install(self):
+        """Register the guard for future documents and start it on the current one"""
+        self._register()
+        self._inject()
+
+    def uninstall(self):
+        """Drop the new-document registration, e.g. before a pooled browser is reused"""
+        if self.script_id is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': self.script_id})
+        except WebDriverException as e:
+            logger.debug(f"[{self.account_email}] Could not remove popup guard: {e}")
+        self.script_id = None
+        self.persistent = False
+
+    def _inject(self):
+        try:
+            self.driver.execute_script(self._source())
+        except WebDriverException as e:
+            logger.debug(f"[{self.account_email}] Could not inject popup guard: {e}")
+
+    def _call(self, expression):
+        """
+        Evaluate against the guard, injecting it first if this document lacks one
+
+        Every call also pushes the pause flag and collects the page's dismissals.
+        """
+        script = ("const guard = window.__popupGuard;"
+                  "if (!guard) return null;"
+                  "guard.paused = arguments[0];"
+                  f"const result = {expression};"
+                  "return [result, guard.drain()];")
+        try:
+            found = self.driver.execute_script(script, self.paused)
+            if found is None:
+                # A document from before install(), or any document when not persistent
+                self._inject()
+                found = self.driver.execute_script(script, self.paused)
+        except WebDriverException as e:
+            logger.debug(f"[{self.account_email}] Popup guard call failed: {e}")
+            return None
+        if found is None:
+            return None
+        result, closed = found
+        self.closed += closed or 0
+        return result
+
+    def _set_paused(self, paused):
+        if paused != self.paused:
+            self.paused = paused
+            if self.persistent:
+                self._register()
+
+    def sweep(self):
+        """Run one immediate dismissal pass, returns how many popups were closed"""
+        return self._call("guard.sweep()") or 0
+
+    def pause(self):
+        """Stop auto-dismissal, e.g. while a create/join modal is intentionally open; holds across navigations"""
+        self._set_paused(True)
+        self._call("true")
+
+    def resume(self):
+        """Re-enable auto-dismissal and sweep whatever is open right now"""
+        self._set_paused(False)
+        return self.sweep()
+
+    def closed_count(self):
+        """Popups dismissed since the last closed_count() call, across documents; read once per game"""
+        self._call("null")
+        closed, self.closed = self.closed, 0
+        return closed
@@ -0,0 +1,309 @@
+#!/home/ubuntu/venvs/bots/bin/python3
+"""
+Unified Game Scheduler
+Expands accounts.json into (account, game type, game number) jobs and runs
+them for every game type on one shared worker pool, admitting each job only
+when the host has the memory and CPU headroom for another browser
+
+Usage:
+    python scheduler.py                          # all enabled games from accounts.json
+    python scheduler.py --games connect4,tictactoe --workers 4
+    python scheduler.py --dry-run                # print the job plan only
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+import importlib.util
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from job_queue import JobQueue
+from log_pipeline import setup_logging, configure_logging
+from metrics_server import start_metrics_server
+from virtual_clock import CLOCK, configure_clock
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = Path(os.getenv('LOG_DIR', os.path.join(BASE_DIR, 'logs')))
+
+logger = logging.getLogger(__name__)
+
+# Runner script per game type, loaded by path (the file names are not importable)
+GAME_RUNNERS = {
+    'connect4': 'multiple-connect4.py',
+    'checkers': 'multiple-checkers.py',
+    'tictactoe': 'multiple-tictactoe.py',
+}
+GAME_ORDER = ['connect4', 'checkers', 'tictactoe']
+
+
+def load_runner(game):
+    """Import a runner script as a module"""
+    spec = importlib.util.spec_from_file_location(f"runner_{game}", os.path.join(BASE_DIR, GAME_RUNNERS[game]))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def game_settings(game, settings):
+    """Shared settings plus the ai_settings block each runner's run_bot_session expects"""
+    game_config = settings.get(game, {})
+    if game == 'checkers':
+        return {**settings, 'ai_settings': {
+            'early_game_depth': game_config.get('early_game_depth', 4),
+            'mid_game_depth': game_config.get('mid_game_depth', 5),
+            'end_game_depth': game_config.get('end_game_depth', 7),
+            'max_time_per_move': game_config.get('max_time_per_move', 7),
+        }}
+    if game == 'tictactoe':
+        return {**settings, 'ai_settings': {
+            'tiebreak': game_config.get('tiebreak', 'trap'),
+        }}
+    return dict(settings)
+
+
+def expand_jobs(config, games=None):
+    """
+    One job per game to play, interleaved so every account and game type
+    gets its first game before anyone gets a second
+
+    Returns:
+        List of job dicts (id, game, number, total, priority, account)
+    """
+    games = games or GAME_ORDER
+    jobs = []
+    for index, account in enumerate(config.get('accounts', [])):
+        if not account.get('enabled', True):
+            continue
+        for game in games:
+            game_config = account.get('games', {}).get(game, {})
+            if not game_config.get('enabled', False):
+                continue
+            total = game_config.get('games_per_run', 1)
+            for number in range(1, total + 1):
+                jobs.append({
+                    'id': f"{game}#{number}/{total} {account['email']}",
+                    'game': game,
+                    'number': number,
+                    'total': total,
+                    'priority': game_config.get('priority', account.get('priority', 0)),
+                    'order': (number, index, GAME_ORDER.index(game)),
+                    'account': {
+                        'email': account['email'],
+                        'password': account['password'],
+                        'games_per_run': 1,
+                        'bet_increase_clicks': game_config.get('bet_increase_clicks', 0),
+                    },
+                })
+    jobs.sort(key=lambda job: (-job['priority'], job['order']))
+    return jobs
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class Scheduler:
+    """
+    Shared worker pool over a JobQueue of single games.
+
+    Idle workers take the highest-priority runnable job whatever its game
+    type; failed jobs are retried with backoff by the queue, so a long
+    matchmaking wait only holds up that one job.
+    """
+
+    def __init__(self, jobs, runners, settings, workers, controller=None):
+        scheduler_settings = settings.get('scheduler', {})
+        self.queue = JobQueue(
+            jobs,
+            cooldown=settings.get('wait_between_games', 10),
+            max_retries=scheduler_settings.get('max_retries', 2),
+            retry_backoff=scheduler_settings.get('retry_backoff', 60),
+        )
+        self.runners = runners
+        self.settings = settings
+        self.workers = max(1, workers)
+        self.controller = controller
+        # Give up on matchmaking sooner than a standalone runner would, the queue retries later
+        self.opponent_wait = scheduler_settings.get('opponent_wait_timeout')
+        self.lock = threading.Lock()
+        self.results = []
+
+    def _finish(self, job, result):
+        if self.queue.done(job, result['succeeded']):
+            return
+        with self.lock:
+            self.results.append(result)
+            done = len(self.results)
+            ok = sum(1 for r in self.results if r['succeeded'])
+        left = len(self.queue) + len(self.queue.running())
+        logger.info(f"╠═══ PROGRESS: {done} jobs done ({ok} succeeded), {left} remaining ═══╣")
+
+    def _run_job(self, job):
+        module = self.runners[job['game']]
+        settings = game_settings(job['game'], self.settings)
+        if self.opponent_wait:
+            settings['opponent_wait_timeout'] = self.opponent_wait
+        started = CLOCK.time()
+        try:
+            outcome = module.run_bot_session(dict(job['account']), settings) or {}
+        except Exception as e:
+            logger.error(f"[{job['account']['email']}] {job['id']} crashed: {e}")
+            outcome = {}
+        return {
+            'job': job['id'],
+            'game': job['game'],
+            'email': job['account']['email'],
+            'succeeded': outcome.get('games_succeeded', 0) > 0,
+            'played': outcome.get('games_played', 0),
+            'attempts': job['attempt'],
+            'duration': CLOCK.time() - started,
+        }
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            if self.controller:
+                self.controller.acquire(job['id'])
+            try:
+                logger.info(f"▶ {job['id']}" + (f" (attempt {job['attempt']})" if job['attempt'] > 1 else ""))
+                result = self._run_job(job)
+            finally:
+                if self.controller:
+                    self.controller.release(job['id'])
+            self._finish(job, result)
+
+    def stop(self):
+        """Let running games finish but start no new jobs"""
+        self.queue.stop()
+
+    def progress(self):
+        with self.lock:
+            done = len(self.results)
+            succeeded = sum(1 for r in self.results if r['succeeded'])
+        return {
+            'queued': len(self.queue),
+            'running': self.queue.running(),
+            'done': done,
+            'succeeded': succeeded,
+            'retries': self.queue.retries,
+        }
+
+    def run(self):
+        threads = [threading.Thread(target=self._worker, name=f"worker-{i + 1}", daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted - finishing running games, no new jobs")
+            self.stop()
+            for thread in threads:
+                thread.join()
+        return self.results
+
+
+def log_summary(results, started):
+    logger.info("╔═══════════════════════════════════════════════════════════════════╗")
+    logger.info("║                      SCHEDULER SUMMARY                            ║")
+    logger.info("╠═══════════════════════════════════════════════════════════════════╣")
+    for game in GAME_ORDER:
+        items = [r for r in results if r['game'] == game]
+        if items:
+            ok = sum(1 for r in items if r['succeeded'])
+            busy = sum(r['duration'] for r in items)
+            logger.info(f"║ {game:<10} {ok:>3}/{len(items):<3} games   {busy / 60:>6.1f} worker-minutes")
+    wall = CLOCK.time() - started
+    busy = sum(r['duration'] for r in results)
+    retried = sum(1 for r in results if r.get('attempts', 1) > 1)
+    logger.info("╠═══════════════════════════════════════════════════════════════════╣")
+    logger.info(f"║ Wall clock {wall / 60:.1f}m, {busy / 60:.1f} worker-minutes "
+                f"({busy / wall if wall else 0:.1f} games in flight on average)")
+    if retried:
+        logger.info(f"║ {retried} games needed a retry")
+    logger.info("╚═══════════════════════════════════════════════════════════════════╝")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every enabled game type on one shared worker pool")
+    parser.add_argument('--config', default=os.getenv('CONFIG_PATH', 'accounts.json'))
+    parser.add_argument('--games', help='Comma-separated game types (default: all)')
+    parser.add_argument('--workers', type=int, help='Concurrent games to start with (default: max_parallel_accounts)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the job plan and exit')
+    args = parser.parse_args()
+
+    # Configure logging before the runners import, their basicConfig then becomes a no-op
+    LOG_DIR.mkdir(exist_ok=True)
+    setup_logging(LOG_DIR / f'scheduler_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+
+    try:
+        with open(args.config) as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load {args.config}: {e}")
+        sys.exit(1)
+
+    games = args.games.split(',') if args.games else GAME_ORDER
+    unknown = [g for g in games if g not in GAME_RUNNERS]
+    if unknown:
+        logger.error(f"Unknown game types: {', '.join(unknown)}")
+        sys.exit(1)
+
+    settings = config.get('settings', {})
+    configure_logging(settings.get('logging'))
+    start_metrics_server(settings)
+    configure_clock(settings)
+    workers = args.workers or settings.get('max_parallel_accounts', 3)
+    jobs = expand_jobs(config, games)
+
+    logger.info(f"Scheduler: {len(jobs)} games across {len({j['account']['email'] for j in jobs})} accounts, "
+                f"{workers} concurrent to start")
+    if args.dry_run or not jobs:
+        for job in jobs:
+            print(job['id'])
+        return
+
+    from browser_pool import create_browser_pool
+    from concurrency_controller import create_concurrency_controller
+    from session_store import SessionStore
+    from wait_utils import WAIT_STATS
+
+    runners = {game: load_runner(game) for game in sorted({job['game'] for job in jobs})}
+
+    session_settings = settings.get('session_cache', {})
+    if session_settings.get('enabled', True):
+        settings['_session_store'] = SessionStore(
+            directory=session_settings.get('directory'),
+            max_age_hours=session_settings.get('max_age_hours', 72)
+        )
+    # The controller moves the live session count between its limits; workers
+    # and the browser pool are sized for the ceiling
+    controller = create_concurrency_controller(settings, workers)
+    ceiling = controller.max_sessions if controller else workers
+    browser_pool = create_browser_pool(settings, ceiling)
+    settings['_browser_pool'] = browser_pool
+
+    started = CLOCK.time()
+    try:
+        results = Scheduler(jobs, runners, settings, ceiling, controller).run()
+    finally:
+        if controller:
+            controller.stop()
+        if browser_pool:
+            browser_pool.shutdown()
+
+    log_summary(results, started)
+    WAIT_STATS.log_report(logger)
+    sys.exit(0 if results and any(r['succeeded'] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
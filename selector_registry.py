@@ -0,0 +1,174 @@
+"""
+Adaptive Selector Registry
+Fallback selector lists live in selectors.json; every lookup records which
+selector hit, and the fallbacks are tried in order of their success rate,
+with the statistics persisted between runs
+
+Usage:
+    python selector_registry.py                 # per-selector hit rates, in the order they are tried
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SELECTOR_FILE = os.path.join(BASE_DIR, 'selectors.json')
+DEFAULT_STATS_FILE = os.path.join(BASE_DIR, '.selector_stats.json')
+
+SAVE_INTERVAL = 60
+
+
+def _parse(selector, default_by):
+    """'xpath://...' / 'css:...' prefixes override the entry's default locator type"""
+    for prefix, by in (('xpath:', By.XPATH), ('css:', By.CSS_SELECTOR)):
+        if selector.startswith(prefix):
+            return by, selector[len(prefix):]
+    return (By.XPATH if default_by == 'xpath' else By.CSS_SELECTOR), selector
+
+
+def visible(elements):
+    """find() filter: only displayed elements count as a hit"""
+    return [el for el in elements if el.is_displayed()]
+
+
+def visible_enabled(elements):
+    """find() filter for buttons: displayed and enabled"""
+    return [el for el in elements if el.is_displayed() and el.is_enabled()]
+
+
+class SelectorRegistry:
+    """
+    Named fallback lists with hit/miss counts per selector.
+
+    Selectors are ordered by (hits + 1) / (tries + 2), ties keeping the file
+    order, so a selector that keeps matching moves to the front and a dead
+    one sinks. Counts are merged into the stats file, so several bot
+    processes can share it.
+    """
+
+    def __init__(self, selector_file=DEFAULT_SELECTOR_FILE, stats_file=DEFAULT_STATS_FILE):
+        self.selector_file = selector_file
+        self.stats_file = stats_file
+        self.lock = threading.Lock()
+        self.entries = None
+        self.stats = {}
+        self.pending = {}
+        self.last_save = time.time()
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        with open(self.selector_file) as f:
+            self.entries = {name: entry for name, entry in json.load(f).items() if not name.startswith('_')}
+        self.stats = self._read_stats()
+        atexit.register(self.save)
+
+    def _read_stats(self):
+        try:
+            with open(self.stats_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def ordered(self, name):
+        """The entry's selectors, best success rate first"""
+        with self.lock:
+            self._load()
+            selectors = self.entries[name]['selectors']
+            stats = self.stats.get(name, {})
+
+            def rate(item):
+                index, selector = item
+                hits, tries = stats.get(selector, (0, 0))
+                return (-(hits + 1) / (tries + 2), index)
+
+            return [selector for _, selector in sorted(enumerate(selectors), key=rate)]
+
+    def record(self, name, selector, hit):
+        with self.lock:
+            for counts in (self.stats, self.pending):
+                hits, tries = counts.setdefault(name, {}).get(selector, (0, 0))
+                counts[name][selector] = (hits + (1 if hit else 0), tries + 1)
+            due = time.time() - self.last_save > SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def find(self, root, name, accept=None):
+        """
+        Try the entry's selectors on a driver or element, best first
+
+        Args:
+            root: WebDriver or WebElement to search from
+            name: Entry in selectors.json
+            accept: Optional callable(elements) returning the usable result (falsy = miss);
+                    defaults to the entry's "expect" count, else any non-empty match
+
+        Returns:
+            (result, selector), or ([], None) when nothing matched
+        """
+        with self.lock:
+            self._load()
+            entry = self.entries[name]
+        if accept is None:
+            expect = entry.get('expect')
+            accept = (lambda els: els if len(els) == expect else None) if expect else (lambda els: els)
+
+        for selector in self.ordered(name):
+            by, value = _parse(selector, entry.get('by', 'css'))
+            try:
+                result = accept(root.find_elements(by, value))
+            except WebDriverException:
+                result = None
+            self.record(name, selector, bool(result))
+            if result:
+                return result, selector
+        return [], None
+
+    def save(self):
+        """Merge the counts recorded since the last save into the stats file"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_save = time.time()
+            if not pending:
+                return
+            merged = self._read_stats()
+            for name, selectors in pending.items():
+                for selector, (hits, tries) in selectors.items():
+                    old_hits, old_tries = merged.setdefault(name, {}).get(selector, (0, 0))
+                    merged[name][selector] = (old_hits + hits, old_tries + tries)
+            self.stats = merged
+            try:
+                tmp = f"{self.stats_file}.{os.getpid()}.tmp"
+                with open(tmp, 'w') as f:
+                    json.dump(merged, f, indent=1)
+                os.replace(tmp, self.stats_file)
+            except OSError as e:
+                logger.warning(f"Could not save selector stats: {e}")
+
+
+SELECTORS = SelectorRegistry()
+
+
+def main():
+    registry = SelectorRegistry()
+    registry._load()
+    for name in registry.entries:
+        stats = registry.stats.get(name, {})
+        print(f"\n{name}")
+        for selector in registry.ordered(name):
+            hits, tries = stats.get(selector, (0, 0))
+            rate = f"{hits / tries * 100:5.1f}%" if tries else "    -"
+            print(f"  {rate} {hits:>6}/{tries:<6} {selector}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Encrypted Session Cache
+Keeps each account's cookies and localStorage on disk (Fernet-encrypted) so a
+run can restore an authenticated session instead of replaying the login form
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from selenium.webdriver.common.by import By
+
+from wait_utils import wait_for, element_present
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTO_AVAILABLE = True
+except ImportError:
+    Fernet = None
+    InvalidToken = Exception
+    CRYPTO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+KEY_ENV = 'GAMEON_SESSION_KEY'
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sessions')
+
+# Cookie fields add_cookie() accepts
+COOKIE_FIELDS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+READ_LOCAL_STORAGE_JS = """
+const items = {};
+for (let i = 0; i < localStorage.length; i++) {
+    const key = localStorage.key(i);
+    items[key] = localStorage.getItem(key);
+}
+return items;
+"""
+
+WRITE_LOCAL_STORAGE_JS = """
+const items = arguments[0];
+for (const key in items) localStorage.setItem(key, items[key]);
+"""
+
+
+def _write_private(path, data):
+    """Write bytes readable by the owner only"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+
+
+def _session_state(dashboard_marker):
+    """'ok' once the dashboard renders, 'login' if the app bounced us to the login form"""
+    def _check(driver):
+        if 'login' in driver.current_url.lower():
+            return 'login'
+        if driver.find_elements(By.CSS_SELECTOR, "input[type='email']"):
+            return 'login'
+        if driver.find_elements(By.CSS_SELECTOR, dashboard_marker):
+            return 'ok'
+        return False
+    return _check
+
+
+class SessionStore:
+    """
+    Per-account session cache, one encrypted file per account.
+
+    The key comes from $GAMEON_SESSION_KEY, or from a 0600 key file that is
+    generated next to the sessions on first use. Without the `cryptography`
+    package the cache stays disabled rather than writing plaintext cookies.
+    """
+
+    def __init__(self, directory=None, max_age_hours=72, key=None):
+        self.directory = directory or DEFAULT_DIRECTORY
+        self.max_age = max_age_hours * 3600
+        self.lock = threading.Lock()
+        self.fernet = None
+        self.restored = 0
+        self.expired = 0
+
+        if not CRYPTO_AVAILABLE:
+            logger.warning("cryptography not installed - session cache disabled, using form login")
+            return
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self.fernet = Fernet(key or os.getenv(KEY_ENV) or self._load_or_create_key())
+
+    @property
+    def enabled(self):
+        return self.fernet is not None
+
+    def _load_or_create_key(self):
+        key_path = os.path.join(self.directory, '.key')
+        with self.lock:
+            if os.path.exists(key_path):
+                with open(key_path, 'rb') as f:
+                    return f.read().strip()
+            key = Fernet.generate_key()
+            _write_private(key_path, key)
+            logger.info(f"Created session cache key at {key_path}")
+            return key
+
+    def _path(self, email):
+        account_hash = hashlib.sha256(email.lower().encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{account_hash}.session")
+
+    def load(self, email):
+        """
+        Read a cached session
+
+        Returns:
+            Dict with cookies/local_storage/saved_at, or None if missing, stale or unreadable
+        """
+        if not self.enabled:
+            return None
+        path = self._path(email)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                session = json.loads(self.fernet.decrypt(f.read()))
+        except (InvalidToken, ValueError, OSError) as e:
+            logger.warning(f"[{email}] Discarding unreadable session cache: {e}")
+            self.invalidate(email)
+            return None
+        if time.time() - session.get('saved_at', 0) > self.max_age:
+            logger.info(f"[{email}] Cached session older than {self.max_age // 3600}h, ignoring")
+            self.invalidate(email)
+            return None
+        return session
+
+    def save(self, driver, email):
+        """Snapshot cookies and localStorage of the current (logged-in) page"""
+        if not self.enabled:
+            return False
+        try:
+            session = {
+                'saved_at': time.time(),
+                'origin': driver.execute_script("return window.location.origin"),
+                'cookies': driver.get_cookies(),
+                'local_storage': driver.execute_script(READ_LOCAL_STORAGE_JS),
+            }
+            _write_private(self._path(email), self.fernet.encrypt(json.dumps(session).encode()))
+            logger.info(f"[{email}] Session cached ({len(session['cookies'])} cookies, "
+                        f"{len(session['local_storage'])} storage keys)")
+            return True
+        except Exception as e:
+            logger.warning(f"[{email}] Could not cache session: {e}")
+            return False
+
+    def invalidate(self, email):
+        try:
+            os.remove(self._path(email))
+        except OSError:
+            pass
+
+    def restore(self, driver, email, dashboard_url, login_url="https://app.gameonworld.ai/auth/login",
+                dashboard_marker="[data-card='true']", timeout=8):
+        """
+        Load a cached session into the browser and check it is still signed in
+
+        The driver must already be on a page of the platform origin (the login
+        page from start() is fine), otherwise cookies cannot be set.
+
+        Returns:
+            True if the dashboard loaded authenticated, False to fall back to form login
+            (the driver is left on the login page in that case)
+        """
+        session = self.load(email)
+        if not session:
+            return False
+
+        try:
+            for cookie in session['cookies']:
+                cookie = {k: v for k, v in cookie.items() if k in COOKIE_FIELDS}
+                if 'expiry' in cookie:
+                    cookie['expiry'] = int(cookie['expiry'])
+                if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                    cookie.pop('sameSite', None)
+                driver.add_cookie(cookie)
+            driver.execute_script(WRITE_LOCAL_STORAGE_JS, session.get('local_storage', {}))
+
+            # Cheap check: the dashboard either renders or bounces back to /auth/login
+            driver.get(dashboard_url)
+            state = wait_for(driver, _session_state(dashboard_marker), timeout, 'login.session_check', poll=0.25)
+        except Exception as e:
+            logger.warning(f"[{email}] Session restore failed: {e}")
+            state = False
+
+        if state == 'ok':
+            with self.lock:
+                self.restored += 1
+            logger.info(f"[{email}] Restored cached session ✓")
+            return True
+
+        with self.lock:
+            self.expired += 1
+        logger.info(f"[{email}] Cached session expired, using form login")
+        self.invalidate(email)
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("localStorage.clear();")
+            driver.get(login_url)
+            wait_for(driver, element_present(By.CSS_SELECTOR, "input[type='email']"), 10, 'login.page_loaded')
+        except Exception:
+            pass
+        return False
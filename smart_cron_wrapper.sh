@@ -114,6 +114,74 @@ cleanup_chrome() {
     log_color "${GREEN}✓ Cleanup complete${NC}"
 }
 
+# ============================================================================
+# DAEMON MODE
+# ============================================================================
+
+# bot_daemon.py stays resident with warm browsers and plays rounds on its own
+# timer, so a tick only health-checks it and (re)starts it when needed.
+# USE_DAEMON=0 falls back to a cold run per tick
+USE_DAEMON=${USE_DAEMON:-1}
+DAEMON_PYTHON="/home/ubuntu/venvs/bots/bin/python3"
+DAEMON_LOG="$SCRIPT_DIR/logs/daemon_stdout.log"
+
+daemon_status() {
+    set +e
+    "$DAEMON_PYTHON" bot_daemon.py --config "$CONFIG_FILE" --status > /dev/null 2>&1
+    local status=$?
+    set -e
+    echo "$status"
+}
+
+if [ "$USE_DAEMON" -eq 1 ] && [ -f "$SCRIPT_DIR/bot_daemon.py" ]; then
+    log_color "${BLUE}➤ Checking bot daemon...${NC}"
+    
+    DAEMON_STATUS=$(daemon_status)
+    if [ "$DAEMON_STATUS" -eq 0 ]; then
+        log_color "${GREEN}✓ Daemon healthy - nothing to do${NC}"
+        log_color "${BLUE}───────────────────────────────────────────────────────────────${NC}"
+        exit 0
+    fi
+    
+    if pgrep -f "bot_daemon.py --config" > /dev/null; then
+        if [ "$DAEMON_STATUS" -eq 2 ]; then
+            log_color "${RED}⚠ Daemon round stuck - restarting${NC}"
+        else
+            log_color "${RED}⚠ Daemon not answering on its status socket - restarting${NC}"
+        fi
+        # SIGTERM lets running games finish; a wedged process gets SIGKILL
+        pkill -TERM -f "bot_daemon.py --config" 2>/dev/null || true
+        for _ in $(seq 1 30); do
+            pgrep -f "bot_daemon.py --config" > /dev/null || break
+            sleep 2
+        done
+        pkill -9 -f "bot_daemon.py --config" 2>/dev/null || true
+        cleanup_chrome
+    else
+        log_color "${YELLOW}⚠ Daemon not running - starting it${NC}"
+    fi
+    
+    if ! pgrep -x "Xvfb" > /dev/null; then
+        Xvfb :99 -screen 0 1920x1080x24 > /dev/null 2>&1 &
+        sleep 2
+    fi
+    export DISPLAY=:99
+    
+    nohup "$DAEMON_PYTHON" bot_daemon.py --config "$CONFIG_FILE" >> "$DAEMON_LOG" 2>&1 &
+    DAEMON_PID=$!
+    sleep 10
+    
+    if [ "$(daemon_status)" -eq 0 ]; then
+        log_color "${GREEN}✓ Daemon started (PID: $DAEMON_PID)${NC}"
+    else
+        log_color "${RED}✗ Daemon did not come up - see $DAEMON_LOG${NC}"
+        log_color "${BLUE}───────────────────────────────────────────────────────────────${NC}"
+        exit 1
+    fi
+    log_color "${BLUE}───────────────────────────────────────────────────────────────${NC}"
+    exit 0
+fi
+
 # ============================================================================
 # PRE-FLIGHT CHECKS
 # ============================================================================
@@ -136,6 +204,7 @@ if [ -f "$LOCK_FILE" ]; then
                 pkill -9 -f "multiple-connect4.py" 2>/dev/null || true
                 pkill -9 -f "multiple-checkers.py" 2>/dev/null || true
                 pkill -9 -f "multiple-tictactoe.py" 2>/dev/null || true
+                pkill -9 -f "scheduler.py" 2>/dev/null || true
                 cleanup_chrome
                 rm -f "$LOCK_FILE" "$PID_FILE"
                 log_color "${GREEN}✓ Cleaned up stuck process${NC}"
@@ -163,7 +232,7 @@ CHROME_COUNT=$(ps aux | grep -c "[c]hrome" || echo "0")
 if [ "$CHROME_COUNT" -gt 15 ]; then
     log_color "${YELLOW}⚠ Found $CHROME_COUNT Chrome processes${NC}"
     
-    if pgrep -f "multiple-connect4.py\|multiple-checkers.py\|multiple-tictactoe.py" > /dev/null; then
+    if pgrep -f "multiple-connect4.py\|multiple-checkers.py\|multiple-tictactoe.py\|scheduler.py" > /dev/null; then
         log_color "${YELLOW}⊘ SKIPPING - Bot processes active${NC}"
         log_color "${BLUE}───────────────────────────────────────────────────────────────${NC}"
         exit 0
@@ -430,7 +499,28 @@ run_tictactoe() {
 # MAIN EXECUTION
 # ============================================================================
 
-if [ $RUN_PARALLEL -eq 1 ]; then
+# scheduler.py runs all game types on one worker pool with its own memory/CPU
+# admission control; USE_SCHEDULER=0 falls back to one process per game
+USE_SCHEDULER=${USE_SCHEDULER:-1}
+
+if [ "$USE_SCHEDULER" -eq 1 ] && [ -f "$SCRIPT_DIR/scheduler.py" ]; then
+    log_color "${MAGENTA}⚡⚡⚡ STARTING UNIFIED SCHEDULER ⚡⚡⚡${NC}"
+    
+    set +e
+    python scheduler.py --config "$CONFIG_FILE"
+    SCHED_EXIT=$?
+    set -e
+    
+    if [ $SCHED_EXIT -eq 0 ]; then
+        [ "$CONNECT4_ENABLED" -gt 0 ] && CONNECT4_SUCCESS=1
+        [ "$CHECKERS_ENABLED" -gt 0 ] && CHECKERS_SUCCESS=1
+        [ "$TICTACTOE_ENABLED" -gt 0 ] && TICTACTOE_SUCCESS=1
+        log_color "${GREEN}✓ Scheduler completed${NC}"
+    else
+        log_color "${RED}✗ Scheduler failed (exit code: $SCHED_EXIT)${NC}"
+    fi
+
+elif [ $RUN_PARALLEL -eq 1 ]; then
     # ========================================================================
     # PARALLEL MODE - All games run simultaneously
     # ========================================================================
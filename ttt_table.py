@@ -0,0 +1,206 @@
+"""
+Tic-Tac-Toe Perfect-Play Table
+Every reachable 3x3 position is solved once at import, stored under its
+symmetry-canonical base-3 index, and moves are answered by table lookup
+
+Positions are kept from the side to move's point of view (1 = mover,
+2 = opponent), so one table serves both seats and any board notation:
+'X'/'O' boards from the runners and 1/2 boards from enhanced_tictactoe_ai.
+
+    from ttt_table import best_move
+    row, col = best_move(board, 'X')
+"""
+
+import random
+from array import array
+
+SIZE = 9
+UNSOLVED = -128
+
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),    # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),    # columns
+    (0, 4, 8), (2, 4, 6),               # diagonals
+)
+
+CENTER, CORNERS = 4, (0, 2, 6, 8)
+
+TIEBREAKS = ('trap', 'center', 'first', 'random')
+
+POWERS = [3 ** i for i in range(SIZE)]
+
+
+def _symmetries():
+    """The 8 rotations/reflections as cell permutations: transformed[perm[i]] = cells[i]"""
+    maps = (
+        lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c), lambda r, c: (2 - c, r),
+        lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c), lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r),
+    )
+    perms = []
+    for transform in maps:
+        perm = []
+        for i in range(SIZE):
+            r, c = transform(i // 3, i % 3)
+            perm.append(r * 3 + c)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+SYMMETRIES = _symmetries()
+INVERSES = tuple(tuple(perm.index(i) for i in range(SIZE)) for perm in SYMMETRIES)
+
+# Per canonical index: game value for the mover, and a 9-bit mask of the optimal moves
+_VALUE = array('b', [UNSOLVED]) * (3 ** SIZE)
+_MOVES = array('H', [0]) * (3 ** SIZE)
+
+
+def _canonical(cells):
+    """(smallest base-3 index over the 8 symmetries, symmetry that produced it)"""
+    best_index, best_sym = None, 0
+    for sym, perm in enumerate(SYMMETRIES):
+        index = 0
+        for i in range(SIZE):
+            if cells[i]:
+                index += cells[i] * POWERS[perm[i]]
+        if best_index is None or index < best_index:
+            best_index, best_sym = index, sym
+    return best_index, best_sym
+
+
+def _wins(cells, mark):
+    return any(cells[a] == mark and cells[b] == mark and cells[c] == mark for a, b, c in LINES)
+
+
+def _solve(cells):
+    """
+    Negamax over mover-relative cells (no line completed yet), memoized by canonical index
+
+    Returns:
+        The mover's value: positive = forced win (larger is sooner), 0 = draw, negative = forced loss
+    """
+    index, sym = _canonical(cells)
+    if _VALUE[index] != UNSOLVED:
+        return _VALUE[index]
+
+    perm = SYMMETRIES[sym]
+    empties = cells.count(0)
+    best, mask = None, 0
+    for i in range(SIZE):
+        if cells[i]:
+            continue
+        cells[i] = 1
+        if _wins(cells, 1):
+            score = empties
+        elif empties == 1:
+            score = 0
+        else:
+            score = -_solve([3 - v if v else 0 for v in cells])
+        cells[i] = 0
+        if best is None or score > best:
+            best, mask = score, 1 << perm[i]
+        elif score == best:
+            mask |= 1 << perm[i]
+
+    _VALUE[index] = best
+    _MOVES[index] = mask
+    return best
+
+
+_solve([0] * SIZE)
+POSITIONS = sum(1 for value in _VALUE if value != UNSOLVED)
+
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+def normalize(board, player):
+    """
+    Mover-relative cells of a 3x3 board
+
+    Args:
+        board: 3x3 rows; empty cells are None / '' / 0, marks 'X'/'O' or 1/2
+        player: The side to move, in the board's notation
+    """
+    return [0 if not cell else (1 if cell == player else 2) for row in board for cell in row]
+
+
+def _lookup(cells):
+    """(value, optimal cell indices) for the mover; (None, []) when the game is over"""
+    if _wins(cells, 1) or _wins(cells, 2) or 0 not in cells:
+        return None, []
+    value = _solve(cells)
+    index, sym = _canonical(cells)
+    mask = _MOVES[index]
+    inverse = INVERSES[sym]
+    return value, sorted(inverse[m] for m in range(SIZE) if mask >> m & 1)
+
+
+def _trap_count(cells, move):
+    """Opponent replies after our move that lose for them"""
+    cells = list(cells)
+    cells[move] = 1
+    if _wins(cells, 1) or 0 not in cells:
+        return 0
+    losing = 0
+    for reply in range(SIZE):
+        if cells[reply]:
+            continue
+        cells[reply] = 2
+        if not _wins(cells, 2) and 0 in cells and _solve(cells) > 0:
+            losing += 1
+        cells[reply] = 0
+    return losing
+
+
+def _shape_rank(i):
+    return 0 if i == CENTER else (1 if i in CORNERS else 2)
+
+
+def best_moves(board, player):
+    """All optimal moves as (row, col), in board order"""
+    _, moves = _lookup(normalize(board, player))
+    return [(i // 3, i % 3) for i in moves]
+
+
+def evaluate(board, player):
+    """Game value for `player` under perfect play (see _solve), or None when the game is over"""
+    value, _ = _lookup(normalize(board, player))
+    return value
+
+
+def best_move(board, player, tiebreak='trap', search=None, rng=random):
+    """
+    Optimal move by table lookup
+
+    Args:
+        board: 3x3 rows in 'X'/'O' or 1/2 notation
+        player: The side to move
+        tiebreak: Choice among equally valued moves:
+                  'trap'   most opponent replies that lose, then center/corner/edge
+                  'center' center, then corners, then edges
+                  'first'  first in board order
+                  'random' uniformly at random
+        search: Optional dict, receives depth (empty cells) / nodes / score
+
+    Returns:
+        Tuple (row, col), or None when the game is already over
+    """
+    cells = normalize(board, player)
+    value, moves = _lookup(cells)
+    if search is not None:
+        search.update(depth=cells.count(0), nodes=0, score=value)
+    if not moves:
+        return None
+
+    if tiebreak == 'random':
+        move = rng.choice(moves)
+    elif tiebreak == 'first':
+        move = moves[0]
+    elif tiebreak == 'center':
+        move = min(moves, key=_shape_rank)
+    elif tiebreak == 'trap':
+        move = min(moves, key=lambda i: (-_trap_count(cells, i), _shape_rank(i)))
+    else:
+        raise ValueError(f"Unknown tiebreak {tiebreak!r}, expected one of {TIEBREAKS}")
+    return move // 3, move % 3
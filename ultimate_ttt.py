@@ -0,0 +1,262 @@
+"""
+Ultimate (Super) Tic-Tac-Toe Engine
+9x9 board of nine 3x3 sub-boards: a move's cell picks the sub-board the
+opponent must play in next (any open one when that sub-board is closed);
+winning three sub-boards in a line wins the game
+
+State is nine 9-bit masks per player plus the two macro masks of won
+sub-boards; the search is Monte Carlo tree search that runs until its
+deadline and keeps the subtree of the moves actually played between turns
+
+    engine = UltimateEngine()
+    state = UltimateState.from_board(board, 'X', active=4)
+    sub, cell = divmod(engine.search(state, seconds=3, search=stats), 9)
+"""
+
+import math
+import time
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+FULL = 0x1FF
+DRAW = -1
+
+WIN_MASKS = (0b000000111, 0b000111000, 0b111000000,    # rows
+             0b001001001, 0b010010010, 0b100100100,    # columns
+             0b100010001, 0b001010100)                 # diagonals
+
+WON = tuple(any(mask & line == line for line in WIN_MASKS) for mask in range(512))
+CELLS = tuple(tuple(i for i in range(9) if mask >> i & 1) for mask in range(512))
+
+CHECK_EVERY = 16
+
+
+class UltimateState:
+    """
+    Position with player 0 = the side to move at the root.
+
+    Moves are sub * 9 + cell, both 0..8 in row-major order.
+    """
+
+    __slots__ = ('boards', 'macro', 'closed', 'active', 'to_move', 'winner')
+
+    def __init__(self):
+        self.boards = ([0] * 9, [0] * 9)
+        self.macro = [0, 0]
+        self.closed = 0
+        self.active = -1
+        self.to_move = 0
+        self.winner = None
+
+    @classmethod
+    def from_board(cls, board, player, active=-1):
+        """
+        Args:
+            board: 9 sub-boards of 9 cells each ('X'/'O' or 1/2, empty is None / '' / 0)
+            player: The mark to move
+            active: Sub-board the mover is sent to, or -1 for any
+        """
+        state = cls()
+        for sub in range(9):
+            for cell in range(9):
+                mark = board[sub][cell]
+                if mark:
+                    state.boards[0 if mark == player else 1][sub] |= 1 << cell
+        for sub in range(9):
+            state._close(sub)
+        for p in (0, 1):
+            if WON[state.macro[p]]:
+                state.winner = p
+        if state.winner is None and state.closed == FULL:
+            state.winner = DRAW
+        state.active = active if 0 <= active < 9 and not state.closed >> active & 1 else -1
+        return state
+
+    def copy(self):
+        other = UltimateState.__new__(UltimateState)
+        other.boards = (self.boards[0][:], self.boards[1][:])
+        other.macro = self.macro[:]
+        other.closed = self.closed
+        other.active = self.active
+        other.to_move = self.to_move
+        other.winner = self.winner
+        return other
+
+    def key(self):
+        return (tuple(self.boards[0]), tuple(self.boards[1]), self.active, self.to_move)
+
+    def _close(self, sub):
+        for p in (0, 1):
+            if WON[self.boards[p][sub]]:
+                self.macro[p] |= 1 << sub
+                self.closed |= 1 << sub
+                return
+        if self.boards[0][sub] | self.boards[1][sub] == FULL:
+            self.closed |= 1 << sub
+
+    def legal_moves(self):
+        if self.winner is not None:
+            return []
+        subs = (self.active,) if self.active >= 0 else CELLS[FULL & ~self.closed]
+        moves = []
+        for sub in subs:
+            for cell in CELLS[FULL & ~(self.boards[0][sub] | self.boards[1][sub])]:
+                moves.append(sub * 9 + cell)
+        return moves
+
+    def play(self, move):
+        sub, cell = divmod(move, 9)
+        p = self.to_move
+        self.boards[p][sub] |= 1 << cell
+        self._close(sub)
+        if WON[self.macro[p]]:
+            self.winner = p
+        elif self.closed == FULL:
+            self.winner = DRAW
+        self.active = -1 if self.closed >> cell & 1 else cell
+        self.to_move = 1 - p
+
+
+class _Node:
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'score')
+
+    def __init__(self, move=None, parent=None):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.score = 0.0    # for the player who made `move`
+
+
+class UltimateEngine:
+    """
+    Anytime UCT search with random playouts.
+
+    The tree survives between calls: search() keeps the subtree under the
+    move it returns, and the next call re-roots on the opponent's reply when
+    that reply is already in the tree.
+    """
+
+    def __init__(self, exploration=1.4, rng=None):
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.root = None
+        self.root_state = None
+
+    def _reroot(self, state):
+        """Reuse the subtree for `state` if it is the current root or one or two plies below it"""
+        key = state.key()
+        if self.root is not None:
+            frontier = [(self.root, self.root_state)]
+            for _ in range(3):
+                for node, node_state in frontier:
+                    if node_state.key() == key:
+                        node.parent = None
+                        self.root, self.root_state = node, node_state
+                        return node.visits
+                next_frontier = []
+                for node, node_state in frontier:
+                    for child in node.children:
+                        child_state = node_state.copy()
+                        child_state.play(child.move)
+                        next_frontier.append((child, child_state))
+                frontier = next_frontier
+        self.root, self.root_state = _Node(), state.copy()
+        return 0
+
+    def _select(self, node):
+        log_visits = math.log(node.visits)
+        c = self.exploration
+        return max(node.children,
+                   key=lambda ch: ch.score / ch.visits + c * math.sqrt(log_visits / ch.visits))
+
+    def _playout(self, state):
+        choice = self.rng.choice
+        while state.winner is None:
+            state.play(choice(state.legal_moves()))
+        return state.winner
+
+    def _iterate(self):
+        node, state = self.root, self.root_state.copy()
+        path = []    # (node, player who moved into it)
+        # Selection
+        while node.untried == [] and node.children:
+            node = self._select(node)
+            path.append((node, state.to_move))
+            state.play(node.move)
+        # Expansion
+        if state.winner is None:
+            if node.untried is None:
+                node.untried = state.legal_moves()
+            if node.untried:
+                child = _Node(node.untried.pop(self.rng.randrange(len(node.untried))), node)
+                node.children.append(child)
+                path.append((child, state.to_move))
+                state.play(child.move)
+                node = child
+        # Simulation and backpropagation
+        winner = self._playout(state)
+        self.root.visits += 1
+        for node, mover in path:
+            node.visits += 1
+            node.score += 0.5 if winner == DRAW else (1.0 if winner == mover else 0.0)
+        return len(path)
+
+    def search(self, state, seconds, search=None):
+        """
+        Best move within a time budget
+
+        Args:
+            state: Position to move from
+            seconds: Thinking time in real seconds (not scaled by a simulated clock);
+                     keep it under the platform's move timer
+            search: Optional dict, receives playouts / playouts_per_s / depth / visits / score / reused;
+                    visits counts playouts through the root, reused those kept from earlier searches
+
+        Returns:
+            Move as sub * 9 + cell, or None when the game is over
+        """
+        moves = state.legal_moves()
+        if not moves:
+            return None
+        reused = self._reroot(state)
+        start = time.time()
+        deadline = start + seconds
+        playouts = 0
+        max_depth = 0
+        if len(moves) > 1:
+            while True:
+                for _ in range(CHECK_EVERY):
+                    max_depth = max(max_depth, self._iterate())
+                playouts += CHECK_EVERY
+                if time.time() >= deadline:
+                    break
+        elapsed = time.time() - start
+
+        children = self.root.children
+        if children:
+            best = max(children, key=lambda ch: ch.visits)
+            move, score = best.move, best.score / best.visits
+        else:
+            best, move, score = None, moves[0], None
+
+        if search is not None:
+            search.update(playouts=playouts, playouts_per_s=round(playouts / elapsed) if elapsed > 0 else 0,
+                          depth=max_depth, visits=self.root.visits, score=score, reused=reused)
+
+        # Keep the subtree of our move for the next turn
+        if best is not None:
+            next_state = self.root_state.copy()
+            next_state.play(move)
+            best.parent = None
+            self.root, self.root_state = best, next_state
+        else:
+            self.root = self.root_state = None
+        return move
+
+    def reset(self):
+        """Drop the tree, e.g. between games"""
+        self.root = self.root_state = None
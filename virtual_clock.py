@@ -0,0 +1,136 @@
+"""
+Virtual Clock
+One injectable source of time for the bots' idle waits, so a full session
+can run on simulated time against the mock platform
+
+    from virtual_clock import CLOCK
+    deadline = CLOCK.time() + timeout
+    CLOCK.sleep(2)
+
+Settings ("clock" in accounts.json):
+    speedup     simulated seconds per real second (default 1 = real time)
+
+With speedup N every idle wait - opponent and challenge polling, lobby
+refreshes, stagger, cooldown and between-game delays, pacing pauses - takes
+1/N of the real time, and elapsed-time readings taken around them are N
+times larger. Run the mock platform with the same --time-scale so its
+opponent and challenge delays shrink with them.
+
+Work that lasts as long as the machine needs stays on real time and uses
+the time module directly: engine search budgets (a shorter budget is a
+weaker engine), wait_for() ceilings on page conditions (pages do not load
+faster), the daemon's round scheduling, the browser pool and session cache,
+and the standalone checkers.py / checkgame.py / checktictactoe.py scripts.
+"""
+
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RealClock:
+    speedup = 1.0
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def real_seconds(self, seconds):
+        return seconds
+
+
+class SimulatedClock:
+    """
+    Time that runs `speedup` times faster than the wall clock.
+
+    Simulated time is derived from real elapsed time, so it stays consistent
+    across threads: a deadline set by one bot thread expires at the same
+    moment for the job queue or the lobby scanner. Only idle waits go
+    through it; engine budgets and page waits stay in real seconds.
+    """
+
+    def __init__(self, speedup, start=None):
+        if speedup <= 0:
+            raise ValueError(f"speedup must be positive, got {speedup}")
+        self.speedup = float(speedup)
+        self.real_start = time.monotonic()
+        self.start = time.time() if start is None else start
+
+    def monotonic(self):
+        return (time.monotonic() - self.real_start) * self.speedup
+
+    def time(self):
+        return self.start + self.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds / self.speedup)
+
+    def real_seconds(self, seconds):
+        """Simulated seconds as a real timeout for Condition/Event waits"""
+        return None if seconds is None else seconds / self.speedup
+
+
+class Clock:
+    """
+    Process-wide proxy for the active clock.
+
+    Modules keep the CLOCK reference they imported; use() swaps what is
+    behind it, so switching to simulated time needs no re-imports.
+    """
+
+    def __init__(self, source=None):
+        self.lock = threading.Lock()
+        self.source = source or RealClock()
+
+    def use(self, source):
+        """Install a clock; returns the previous one"""
+        with self.lock:
+            previous, self.source = self.source, source
+        return previous
+
+    @property
+    def speedup(self):
+        return self.source.speedup
+
+    @property
+    def simulated(self):
+        return self.source.speedup != 1
+
+    def time(self):
+        return self.source.time()
+
+    def monotonic(self):
+        return self.source.monotonic()
+
+    def sleep(self, seconds):
+        self.source.sleep(seconds)
+
+    def real_seconds(self, seconds):
+        return self.source.real_seconds(seconds)
+
+
+CLOCK = Clock()
+
+
+def configure_clock(settings):
+    """
+    Apply the "clock" settings section; once per process, from main()
+
+    Returns:
+        The speedup now in effect
+    """
+    speedup = float(settings.get('clock', {}).get('speedup', 1) or 1)
+    if speedup != CLOCK.speedup:
+        CLOCK.use(RealClock() if speedup == 1 else SimulatedClock(speedup))
+        if speedup != 1:
+            logger.warning(f"Simulated clock: {speedup:g}x real time - for mock platform runs only")
+    return speedup
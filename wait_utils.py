@@ -0,0 +1,215 @@
+"""
+Condition-based Wait Utilities
+Predicate polling with per-call ceilings and a record of where the time went
+"""
+
+import time
+import threading
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+from virtual_clock import CLOCK
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL = 0.1
+
+
+class WaitStats:
+    """Thread-safe aggregate of every wait: time spent versus its ceiling"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}
+
+    def record(self, name, spent, ceiling, satisfied):
+        with self.lock:
+            rec = self.records.setdefault(name, {
+                'count': 0, 'spent': 0.0, 'ceiling': 0.0, 'max': 0.0, 'timeouts': 0
+            })
+            rec['count'] += 1
+            rec['spent'] += spent
+            rec['ceiling'] += ceiling
+            rec['max'] = max(rec['max'], spent)
+            if not satisfied:
+                rec['timeouts'] += 1
+
+    def reset(self):
+        with self.lock:
+            self.records = {}
+
+    def snapshot(self):
+        with self.lock:
+            return {name: dict(rec) for name, rec in self.records.items()}
+
+    def report_lines(self):
+        """Per-wait breakdown sorted by total wall-clock time spent"""
+        records = self.snapshot()
+        if not records:
+            return ["No waits recorded"]
+
+        total = sum(rec['spent'] for rec in records.values())
+        lines = [
+            f"{'WAIT':<32} {'CALLS':>6} {'SPENT':>9} {'CEILING':>9} {'AVG':>7} {'MAX':>7} {'TIMEOUTS':>8} {'SHARE':>6}"
+        ]
+        for name, rec in sorted(records.items(), key=lambda item: item[1]['spent'], reverse=True):
+            share = (rec['spent'] / total * 100) if total else 0
+            lines.append(
+                f"{name:<32} {rec['count']:>6} {rec['spent']:>8.1f}s {rec['ceiling']:>8.1f}s "
+                f"{rec['spent'] / rec['count']:>6.2f}s {rec['max']:>6.2f}s {rec['timeouts']:>8} {share:>5.1f}%"
+            )
+        lines.append(f"{'TOTAL':<32} {sum(r['count'] for r in records.values()):>6} {total:>8.1f}s")
+        return lines
+
+    def log_report(self, log=None):
+        log = log or logger
+        log.info("═" * 60)
+        log.info("WAIT LATENCY BUDGET")
+        log.info("═" * 60)
+        for line in self.report_lines():
+            log.info(line)
+
+
+# Shared across all bot threads in the process
+WAIT_STATS = WaitStats()
+
+
+def wait_for(driver, predicate, timeout, name, poll=DEFAULT_POLL):
+    """
+    Poll a predicate until it returns a truthy value or the ceiling is hit
+
+    Args:
+        driver: WebDriver passed to the predicate
+        predicate: Callable taking the driver; exceptions count as "not yet"
+        timeout: Ceiling in real seconds; a simulated clock does not make pages load faster
+        name: Label used in the latency report
+        poll: Seconds between checks
+
+    Returns:
+        The predicate's truthy value, or False on timeout
+    """
+    start = time.time()
+    deadline = start + timeout
+    result = False
+    while True:
+        try:
+            result = predicate(driver)
+        except WebDriverException:
+            result = False
+        if result or time.time() >= deadline:
+            break
+        time.sleep(min(poll, max(0, deadline - time.time())))
+
+    WAIT_STATS.record(name, time.time() - start, timeout, bool(result))
+    return result if result else False
+
+
+def pause(seconds, name):
+    """Deliberate fixed delay (human pacing); follows the clock's speedup, reported in real seconds"""
+    CLOCK.sleep(seconds)
+    real = CLOCK.real_seconds(seconds)
+    WAIT_STATS.record(name, real, real, True)
+
+
+# ============================================================================
+# PREDICATES - each returns a callable taking the driver
+# ============================================================================
+
+def element_clickable(by, selector):
+    """First displayed and enabled match"""
+    def _check(driver):
+        for el in driver.find_elements(by, selector):
+            if el.is_displayed() and el.is_enabled():
+                return el
+        return False
+    return _check
+
+
+def element_present(by, selector):
+    def _check(driver):
+        found = driver.find_elements(by, selector)
+        return found[0] if found else False
+    return _check
+
+
+def element_visible(by, selector):
+    def _check(driver):
+        for el in driver.find_elements(by, selector):
+            if el.is_displayed():
+                return el
+        return False
+    return _check
+
+
+def element_gone(by, selector):
+    def _check(driver):
+        return not any(el.is_displayed() for el in driver.find_elements(by, selector))
+    return _check
+
+
+def url_changed(old_url):
+    def _check(driver):
+        return driver.current_url != old_url
+    return _check
+
+
+def url_contains(fragment):
+    def _check(driver):
+        return fragment in driver.current_url.lower()
+    return _check
+
+
+def url_excludes(fragment):
+    def _check(driver):
+        return fragment not in driver.current_url.lower()
+    return _check
+
+
+def document_ready():
+    def _check(driver):
+        return driver.execute_script("return document.readyState") == 'complete'
+    return _check
+
+
+def connect4_column_count(driver, column):
+    """Number of discs currently in a connect4 column (driver inside the game iframe)"""
+    return driver.execute_script("""
+        let count = 0;
+        for (const row of document.querySelectorAll('table tbody tr')) {
+            const cell = row.querySelectorAll('td.board-cell')[arguments[0]];
+            if (cell && cell.querySelector("img[src*='red'], img[src*='yellow']")) count++;
+        }
+        return count;
+    """, column)
+
+
+def piece_in_column(column, before_count):
+    """A new disc landed in the connect4 column"""
+    def _check(driver):
+        return connect4_column_count(driver, column) > before_count
+    return _check
+
+
+def square_highlighted(square, before_class):
+    """A checkers square reacted to selection (its class changed or it is marked selected)"""
+    def _check(driver):
+        cls = square.get_attribute('class') or ''
+        return cls != before_class or any(word in cls for word in ('highlight', 'select', 'ring'))
+    return _check
+
+
+def square_has_piece(square, expected=True):
+    """A board square gained (or lost) a visible piece image"""
+    def _check(driver):
+        has_piece = any(img.is_displayed() for img in square.find_elements(By.TAG_NAME, 'img'))
+        return has_piece == expected
+    return _check
+
+
+def state_changed(read_state, before):
+    """Generic: a reader callable returns something different from `before`"""
+    def _check(driver):
+        return read_state() != before
+    return _check
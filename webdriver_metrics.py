@@ -0,0 +1,205 @@
+"""
+WebDriver Command Accounting
+Counts and times every WebDriver round trip of one bot, grouped by the bot
+method that caused it, with per-move and per-game summaries
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import logging
+
+from metrics_server import METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'webdriver_metrics.jsonl')
+
+_SELENIUM_DIR = os.sep + 'selenium' + os.sep
+_THIS_FILE = os.path.abspath(__file__)
+_file_lock = threading.Lock()
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def _summarize(samples):
+    """{group: [ms, ...]} -> {group: {calls, total_ms, p50_ms, p95_ms}} sorted by total time"""
+    summary = {}
+    for group, values in sorted(samples.items(), key=lambda item: sum(item[1]), reverse=True):
+        summary[group] = {
+            'calls': len(values),
+            'total_ms': round(sum(values), 1),
+            'p50_ms': round(_percentile(values, 50), 1),
+            'p95_ms': round(_percentile(values, 95), 1),
+        }
+    return summary
+
+
+class CommandMetrics:
+    """
+    Transparent accounting for one bot's driver.
+
+    install() shadows driver.execute on the instance, which every WebDriver
+    call goes through - driver methods, switch_to and WebElement methods
+    alike - so the bot code keeps using self.driver unchanged. Each command
+    is attributed to the nearest calling method on the bot; calls made by
+    helpers such as GameProbe or PopupGuard are reported as Class.method.
+    """
+
+    def __init__(self, driver, owner, account_email="", metrics_file=None):
+        self.driver = driver
+        self.owner = owner
+        self.account_email = account_email
+        self.metrics_file = metrics_file or DEFAULT_METRICS_FILE
+        self.lock = threading.Lock()
+        self.installed = False
+        self.games = 0
+        self._reset_game()
+
+    def _reset_game(self):
+        self.game_started = time.time()
+        self.by_method = {}
+        self.by_command = {}
+        self.moves = []
+        self.move_calls = 0
+        self.move_ms = 0.0
+        self.move_methods = {}
+
+    def install(self):
+        if self.installed:
+            return
+        original = self.driver.execute
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                self._record(driver_command, (time.perf_counter() - start) * 1000, sys._getframe(1))
+
+        self.driver.execute = execute
+        self.installed = True
+
+    def uninstall(self):
+        """Remove the instance hook, e.g. before a pooled driver is handed to another account"""
+        if self.installed:
+            del self.driver.execute
+            self.installed = False
+
+    def _caller(self, frame):
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if _SELENIUM_DIR not in filename and filename != _THIS_FILE:
+                instance = frame.f_locals.get('self')
+                name = frame.f_code.co_name
+                if instance is self.owner:
+                    return name
+                # Skip private helpers and closures so the public entry point gets the cost
+                if instance is not None and not name.startswith('_'):
+                    return f"{type(instance).__name__}.{name}"
+            frame = frame.f_back
+        return 'other'
+
+    def _record(self, command, ms, frame):
+        method = self._caller(frame)
+        METRICS.webdriver_command(command, ms / 1000)
+        with self.lock:
+            self.by_method.setdefault(method, []).append(ms)
+            self.by_command.setdefault(command, []).append(ms)
+            self.move_calls += 1
+            self.move_ms += ms
+            self.move_methods[method] = self.move_methods.get(method, 0) + ms
+
+    def move_done(self, label=None):
+        """Close the current move: log what it cost and start counting the next one"""
+        with self.lock:
+            move = {
+                'move': len(self.moves) + 1,
+                'label': label,
+                'calls': self.move_calls,
+                'total_ms': round(self.move_ms, 1),
+            }
+            top = sorted(self.move_methods.items(), key=lambda item: item[1], reverse=True)[:3]
+            self.moves.append(move)
+            self.move_calls, self.move_ms, self.move_methods = 0, 0.0, {}
+
+        breakdown = ", ".join(f"{name} {ms:.0f}ms" for name, ms in top)
+        logger.info(f"[{self.account_email}] WebDriver move {move['move']}: {move['calls']} commands, "
+                    f"{move['total_ms']:.0f}ms ({breakdown})")
+
+    def game_done(self, result=None):
+        """Log the per-method table for the game, append it to the metrics file and reset"""
+        with self.lock:
+            by_method = {k: list(v) for k, v in self.by_method.items()}
+            by_command = {k: list(v) for k, v in self.by_command.items()}
+            moves = list(self.moves)
+            duration = time.time() - self.game_started
+            self.games += 1
+            game = self.games
+            self._reset_game()
+
+        if not by_method:
+            return None
+
+        methods = _summarize(by_method)
+        move_calls = [m['calls'] for m in moves]
+        move_ms = [m['total_ms'] for m in moves]
+        record = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'account': self.account_email,
+            'bot': type(self.owner).__name__,
+            'game': game,
+            'result': result,
+            'duration_s': round(duration, 1),
+            'commands': sum(m['calls'] for m in methods.values()),
+            'commands_ms': round(sum(m['total_ms'] for m in methods.values()), 1),
+            'moves': len(moves),
+            'per_move': {
+                'calls_p50': _percentile(move_calls, 50) if moves else None,
+                'calls_p95': _percentile(move_calls, 95) if moves else None,
+                'ms_p50': _percentile(move_ms, 50) if moves else None,
+                'ms_p95': _percentile(move_ms, 95) if moves else None,
+            },
+            'by_method': methods,
+            'by_command': _summarize(by_command),
+        }
+
+        logger.info(f"[{self.account_email}] WebDriver game {game}: {record['commands']} commands, "
+                    f"{record['commands_ms'] / 1000:.1f}s of {record['duration_s']}s, {len(moves)} moves "
+                    f"(p50 {record['per_move']['calls_p50']} cmds / {record['per_move']['ms_p50']}ms per move)")
+        logger.info(f"[{self.account_email}] {'METHOD':<36} {'CALLS':>6} {'TOTAL':>9} {'P50':>7} {'P95':>7}")
+        for name, stats in list(methods.items())[:12]:
+            logger.info(f"[{self.account_email}] {name:<36} {stats['calls']:>6} {stats['total_ms']:>7.0f}ms "
+                        f"{stats['p50_ms']:>5.0f}ms {stats['p95_ms']:>5.0f}ms")
+
+        self._write(record)
+        return record
+
+    def _write(self, record):
+        try:
+            os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
+            with _file_lock:
+                with open(self.metrics_file, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            logger.warning(f"[{self.account_email}] Could not write WebDriver metrics: {e}")
+
+
+def create_command_metrics(driver, owner, account_email, settings):
+    """
+    Build and install accounting from settings['webdriver_metrics']
+
+    Returns:
+        An installed CommandMetrics, or None when disabled
+    """
+    settings = settings or {}
+    if not settings.get('enabled', False):
+        return None
+    metrics = CommandMetrics(driver, owner, account_email, settings.get('file'))
+    metrics.install()
+    return metrics